@@ -6,8 +6,10 @@ Complete backend API for CAPEX/OPEX budget request and approval management syste
 Supports multi-database switching via environment configuration.
 """
 
+import logging
 import sys
 import os
+import time
 from dotenv import load_dotenv
 
 # Load environment variables from the .env file in the project root
@@ -16,8 +18,9 @@ load_dotenv(dotenv_path=dotenv_path)
 
 sys.path.insert(0, os.path.dirname(__file__))
 
-from flask import Flask
+from flask import Flask, g, request
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from src.config.settings import config
 from src.routes.health import health_bp
 from src.routes.auth import auth_bp
@@ -25,24 +28,102 @@ from src.routes.users import users_bp
 from src.routes.requests import requests_bp
 from src.routes.approvals import approvals_bp
 from src.routes.admin import admin_bp
+from src.routes.jobs import jobs_bp
+from src.routes.metrics import metrics_bp
+from src.routes.reports import reports_bp
+from src.cli import rollups_cli, audit_logs_cli
+from src.utils.http_cache import cache_policy, NO_STORE, PRIVATE_REVALIDATE
+from src.services.job_service import job_service
+from src.utils.notify_utils import notification_listener
+from src.utils import instrumentation
+from src.utils.db_utils import db_client
+from src.utils.metrics import metrics
+
+logging.basicConfig(
+    level=config.LOG_LEVEL,
+    format='%(asctime)s %(levelname)s %(name)s %(message)s'
+)
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = config.SECRET_KEY
 
+# Behind a load balancer remote_addr is the proxy; take the client address
+# (used by the per-IP login limit) and scheme from its X-Forwarded-* headers.
+if config.TRUSTED_PROXY_HOPS:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=config.TRUSTED_PROXY_HOPS, x_proto=config.TRUSTED_PROXY_HOPS)
+
 CORS(app, resources={
     r"/*": {
         "origins": config.CORS_ORIGINS,
         "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
+        "allow_headers": ["Content-Type", "Authorization"],
+        "expose_headers": ["X-Next-Cursor", "Server-Timing", "ETag"]
     }
 })
 
+# Cache-Control per blueprint: API data may be cached by the browser but is
+# revalidated (ETag / If-None-Match) on every use; tokens and probes never are.
+for blueprint, policy in ((health_bp, NO_STORE), (auth_bp, NO_STORE), (metrics_bp, NO_STORE),
+                          (users_bp, PRIVATE_REVALIDATE), (requests_bp, PRIVATE_REVALIDATE),
+                          (approvals_bp, PRIVATE_REVALIDATE), (admin_bp, PRIVATE_REVALIDATE),
+                          (jobs_bp, PRIVATE_REVALIDATE), (reports_bp, PRIVATE_REVALIDATE)):
+    cache_policy(blueprint, policy)
+
 app.register_blueprint(health_bp)
 app.register_blueprint(auth_bp)
 app.register_blueprint(users_bp)
 app.register_blueprint(requests_bp)
 app.register_blueprint(approvals_bp)
 app.register_blueprint(admin_bp)
+app.register_blueprint(jobs_bp)
+app.register_blueprint(metrics_bp)
+app.register_blueprint(reports_bp)
+
+app.cli.add_command(rollups_cli)
+app.cli.add_command(audit_logs_cli)
+
+@app.before_request
+def start_background_workers():
+    job_service.ensure_started()
+    notification_listener.ensure_started()
+
+@app.before_request
+def start_request_instrumentation():
+    g.request_started = time.perf_counter()
+    instrumentation.begin_request()
+    db_client.begin_request()
+
+@app.after_request
+def finish_request_instrumentation(response):
+    stats = instrumentation.end_request()
+    if stats is not None:
+        total = time.perf_counter() - g.request_started
+        response.headers['Server-Timing'] = instrumentation.server_timing(stats, total)
+        instrumentation.log_request(request.method, request.path, response.status_code, stats, total)
+    return response
+
+@app.teardown_request
+def clear_request_instrumentation(exc):
+    instrumentation.end_request()
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_started = time.perf_counter()
+    metrics.add_gauge('http_requests_in_flight', 1)
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    labels = {'blueprint': request.blueprint or '', 'endpoint': endpoint, 'method': request.method}
+    metrics.observe('http_request_duration_seconds', time.perf_counter() - g.metrics_started, labels)
+    metrics.inc('http_requests_total', dict(labels, status=response.status_code))
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    if 'metrics_started' in g:
+        metrics.add_gauge('http_requests_in_flight', -1)
+        metrics.maybe_flush()
 
 @app.route('/')
 def index():
@@ -56,7 +137,10 @@ def index():
             'users': '/admin/users/*',
             'requests': '/requests/*',
             'approvals': '/approvals/*',
-            'admin': '/admin/*'
+            'admin': '/admin/*',
+            'jobs': '/jobs/*',
+            'reports': '/reports/*',
+            'metrics': '/metrics'
         }
     }
 
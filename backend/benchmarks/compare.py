@@ -0,0 +1,84 @@
+"""
+Compare two ``run.py`` result files and flag regressions.
+
+    python benchmarks/compare.py results/baseline.json results/candidate.json --threshold 0.15
+
+Exits with status 1 when any scenario's latency percentiles, throughput or
+queries per request got worse by more than ``--threshold`` (a fraction).
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# (label, path into a scenario result, True if higher is worse)
+CHECKS = [
+    ('p50 ms', ('latency_ms', 'p50'), True),
+    ('p95 ms', ('latency_ms', 'p95'), True),
+    ('p99 ms', ('latency_ms', 'p99'), True),
+    ('rps', ('throughput_rps',), False),
+    ('queries/req', ('queries_per_request', 'mean'), True),
+]
+
+# Differences smaller than this are noise whatever the relative change (e.g. 0.3 queries per request).
+MIN_ABSOLUTE_CHANGE = {'queries/req': 0.5, 'p50 ms': 1.0, 'p95 ms': 1.0, 'p99 ms': 1.0}
+
+def _lookup(result: Dict, path: Tuple[str, ...]) -> Optional[float]:
+    value = result
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+def compare(baseline: Dict, candidate: Dict, threshold: float) -> Tuple[List[Tuple], List[str]]:
+    rows = []
+    regressions = []
+    for name, result in candidate['scenarios'].items():
+        base = baseline['scenarios'].get(name)
+        if base is None:
+            continue
+        for label, path, higher_is_worse in CHECKS:
+            before, after = _lookup(base, path), _lookup(result, path)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else 0.0
+            worse = change > threshold if higher_is_worse else change < -threshold
+            if worse and abs(after - before) < MIN_ABSOLUTE_CHANGE.get(label, 0):
+                worse = False
+            rows.append((name, label, before, after, change, worse))
+            if worse:
+                regressions.append(f'{name} {label}: {before} -> {after} ({change:+.1%})')
+    return rows, regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files.')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Allowed relative change before a metric counts as a regression')
+    args = parser.parse_args()
+
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    with open(args.candidate) as handle:
+        candidate = json.load(handle)
+
+    rows, regressions = compare(baseline, candidate, args.threshold)
+
+    print(f"baseline  {baseline['meta'].get('git_commit')} {baseline['meta'].get('started_at')}")
+    print(f"candidate {candidate['meta'].get('git_commit')} {candidate['meta'].get('started_at')}")
+    print(f"{'scenario':<18} {'metric':<12} {'baseline':>10} {'candidate':>10} {'change':>8}")
+    for name, label, before, after, change, worse in rows:
+        print(f"{name:<18} {label:<12} {before:>10} {after:>10} {change:>+8.1%}{'  REGRESSION' if worse else ''}")
+
+    if regressions:
+        print(f'\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:')
+        for regression in regressions:
+            print(f'  {regression}')
+        sys.exit(1)
+    print(f'\nNo regressions beyond {args.threshold:.0%}.')
+
+if __name__ == '__main__':
+    main()
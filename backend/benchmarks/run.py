@@ -0,0 +1,292 @@
+"""
+Drive the core API flows against a seeded database and record latency,
+throughput and SQL statements per request.
+
+    python benchmarks/seed.py --reset
+    python benchmarks/run.py --iterations 500 --concurrency 8
+
+By default a gunicorn server is started on ``--port`` with the offline Gemini
+backend (GEMINI_BACKEND=fake) and login rate limits disabled, and stopped at
+the end; pass ``--base-url`` to benchmark a server you started yourself.
+Queries per request come from the ``Server-Timing`` header, so the server must
+run with SQL_INSTRUMENTATION=True. Results are written as JSON for
+``compare.py``.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import requests
+
+from scenarios import SCENARIOS, Client
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, 'results')
+
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries')
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of ``values``."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct * len(ordered) / 100), 1)
+    return ordered[rank - 1]
+
+def _distribution(values: List[float], digits: int = 2) -> Dict:
+    if not values:
+        return {}
+    return {
+        'min': round(min(values), digits),
+        'mean': round(sum(values) / len(values), digits),
+        'p50': round(percentile(values, 50), digits),
+        'p95': round(percentile(values, 95), digits),
+        'p99': round(percentile(values, 99), digits),
+        'max': round(max(values), digits)
+    }
+
+class Recorder:
+    def __init__(self, expected_statuses=None):
+        self._lock = threading.Lock()
+        self.expected_statuses = expected_statuses
+        self.unexpected = 0
+        self.latencies = []
+        self.queries = []
+        self.db_ms = []
+        self.status_codes = {}
+        self.errors = 0
+        self.failures = []
+
+    def add(self, latency: float, response: Optional[requests.Response], error: str = None) -> None:
+        with self._lock:
+            if response is None:
+                self.errors += 1
+                self.status_codes['error'] = self.status_codes.get('error', 0) + 1
+                if len(self.failures) < 5:
+                    self.failures.append(error)
+                return
+
+            self.latencies.append(latency * 1000)
+            code = str(response.status_code)
+            self.status_codes[code] = self.status_codes.get(code, 0) + 1
+            if self.expected_statuses is not None and response.status_code not in self.expected_statuses:
+                self.unexpected += 1
+            if response.status_code >= 400:
+                self.errors += 1
+                if len(self.failures) < 5:
+                    self.failures.append(f'{response.status_code} {response.text[:200]}')
+
+            match = SERVER_TIMING_DB.search(response.headers.get('Server-Timing', ''))
+            if match:
+                self.db_ms.append(float(match.group(1)))
+                self.queries.append(int(match.group(2)))
+
+class _Counter:
+    def __init__(self, start: int = 0):
+        self._value = start
+        self._lock = threading.Lock()
+
+    def __next__(self) -> int:
+        with self._lock:
+            value = self._value
+            self._value += 1
+            return value
+
+def _worker(client: Client, scenario, counter, limit: int, recorder: Optional[Recorder]) -> None:
+    session = requests.Session()
+    while True:
+        iteration = next(counter)
+        if iteration >= limit:
+            return
+        call = scenario.call(iteration)
+        if call is None:
+            return
+        method, path, kwargs = call
+        started = time.perf_counter()
+        try:
+            response = session.request(method, client.url(path), timeout=120, **kwargs)
+        except requests.RequestException as e:
+            if recorder:
+                recorder.add(time.perf_counter() - started, None, str(e))
+            continue
+        if recorder:
+            recorder.add(time.perf_counter() - started, response)
+
+def _drive(client: Client, scenario, iterations: int, concurrency: int, recorder: Optional[Recorder]) -> float:
+    counter = _Counter()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(_worker, client, scenario, counter, iterations, recorder)
+                   for _ in range(concurrency)]
+        for future in futures:
+            future.result()
+    return time.perf_counter() - started
+
+def run_scenario(client: Client, name: str, options) -> Dict:
+    scenario = SCENARIOS[name](options)
+    scenario.prepare(client)
+
+    if options.warmup and scenario.warmup:
+        _drive(client, scenario, options.warmup, options.concurrency, None)
+
+    recorder = Recorder(scenario.expected_statuses)
+    elapsed = _drive(client, scenario, options.iterations, options.concurrency, recorder)
+    completed = len(recorder.latencies)
+
+    result = {
+        'requests': completed,
+        'errors': recorder.errors,
+        'status_codes': recorder.status_codes,
+        'duration_s': round(elapsed, 3),
+        'throughput_rps': round(completed / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': _distribution(recorder.latencies),
+        'queries_per_request': _distribution(recorder.queries),
+        'db_ms': _distribution(recorder.db_ms),
+        'sample_failures': recorder.failures
+    }
+    if scenario.expected_statuses is not None:
+        result['unexpected_statuses'] = recorder.unexpected
+    return result
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def start_server(options) -> subprocess.Popen:
+    env = dict(os.environ,
+               PORT=str(options.port),
+               GEMINI_BACKEND='fake',
+               FAKE_GEMINI_LATENCY_MS=str(options.gemini_latency_ms),
+               LOGIN_RATE_LIMIT_PER_EMAIL='0',
+               LOGIN_RATE_LIMIT_PER_IP='0',
+               SQL_INSTRUMENTATION='True',
+               REQUEST_LOG='False',
+               FLASK_DEBUG='False',
+               WEB_CONCURRENCY=str(options.workers),
+               GUNICORN_THREADS=str(options.threads))
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    log = open(os.path.join(RESULTS_DIR, 'server.log'), 'w')
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+                              cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f'Server exited with {server.returncode}; see {log.name}')
+        try:
+            if requests.get(f'http://127.0.0.1:{options.port}/health', timeout=2).status_code == 200:
+                return server
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    stop_server(server)
+    raise SystemExit(f'Server did not become healthy within 60s; see {log.name}')
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+def _print_table(results: Dict) -> None:
+    print(f"{'scenario':<18} {'reqs':>6} {'err':>5} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'q/req':>6}")
+    for name, result in results.items():
+        latency = result['latency_ms']
+        queries = result['queries_per_request']
+        print(f"{name:<18} {result['requests']:>6} {result['errors']:>5} {result['throughput_rps']:>8} "
+              f"{latency.get('p50', '-'):>9} {latency.get('p95', '-'):>9} {latency.get('p99', '-'):>9} "
+              f"{queries.get('mean', '-'):>6}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the core API flows.')
+    parser.add_argument('--base-url', help='Benchmark an already running server instead of starting one')
+    parser.add_argument('--manifest', default=os.path.join(RESULTS_DIR, 'seed.json'), help='Written by seed.py')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument('--iterations', type=int, default=200, help='Timed requests per scenario')
+    parser.add_argument('--warmup', type=int, default=20, help='Untimed requests per scenario before timing')
+    parser.add_argument('--concurrency', type=int, default=8, help='Client threads')
+    parser.add_argument('--page-size', type=int, default=50, help='limit= for the request list')
+    parser.add_argument('--import-rows', type=int, default=500, help='Rows in the uploaded workbook')
+    parser.add_argument('--import-unmapped', type=float, default=0.05,
+                        help='Share of upload rows the column mapper cannot read (sent to the fake model)')
+    parser.add_argument('--batch-size', type=int, default=10, help='Requests per batch in approve_contended')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--workers', type=int, default=2, help='WEB_CONCURRENCY of the started server')
+    parser.add_argument('--threads', type=int, default=4, help='GUNICORN_THREADS of the started server')
+    parser.add_argument('--gemini-latency-ms', type=float, default=200, help='Delay of the fake Gemini backend')
+    parser.add_argument('--output', help='Results file (default: results/<timestamp>.json)')
+    options = parser.parse_args()
+
+    names = [name.strip() for name in options.scenarios.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+
+    if not os.path.exists(options.manifest):
+        raise SystemExit(f'{options.manifest} not found; run benchmarks/seed.py first')
+    with open(options.manifest) as handle:
+        manifest = json.load(handle)
+
+    server = None if options.base_url else start_server(options)
+    base_url = options.base_url or f'http://127.0.0.1:{options.port}'
+    started_at = datetime.now(timezone.utc)
+    results = {}
+    try:
+        client = Client(requests.Session(), base_url, manifest)
+        for name in names:
+            print(f'Running {name}...', flush=True)
+            results[name] = run_scenario(client, name, options)
+    finally:
+        if server is not None:
+            stop_server(server)
+
+    report = {
+        'meta': {
+            'started_at': started_at.isoformat(),
+            'git_commit': _git_commit(),
+            'base_url': base_url,
+            'server': 'external' if options.base_url else
+                      f'gunicorn workers={options.workers} threads={options.threads} gemini=fake',
+            'python': platform.python_version(),
+            'options': {key: value for key, value in vars(options).items() if key not in ('base_url', 'output')},
+            'dataset': {'params': manifest.get('params'), 'counts': manifest.get('counts')}
+        },
+        'scenarios': results
+    }
+
+    output = options.output or os.path.join(RESULTS_DIR, f"{started_at.strftime('%Y%m%dT%H%M%SZ')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as handle:
+        json.dump(report, handle, indent=2)
+
+    _print_table(results)
+    print(f'Results written to {output}')
+
+    unexpected = {name: result['unexpected_statuses'] for name, result in results.items()
+                  if result.get('unexpected_statuses')}
+    if unexpected:
+        for name, count in unexpected.items():
+            print(f'{name}: {count} responses with an unexpected status; see sample_failures', file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+"""
+Benchmark scenarios: one core API flow each.
+
+A scenario's ``prepare`` runs once before timing starts (logins, picking
+request ids, building the upload) and ``call`` returns the HTTP call for one
+iteration as ``(method, path, kwargs)``, or ``None`` once its input is used up.
+"""
+
+import io
+import itertools
+import random
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import openpyxl
+
+Call = Tuple[str, str, Dict]
+
+class Client:
+    """Tokens for the seeded users, logged in lazily and shared by all scenarios."""
+
+    def __init__(self, session, base_url: str, manifest: Dict):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.manifest = manifest
+        self._tokens = {}
+
+    def url(self, path: str) -> str:
+        return f'{self.base_url}{path}'
+
+    def emails(self, role: str) -> List[str]:
+        return self.manifest['users'].get(role, [])
+
+    def token(self, email: str) -> str:
+        if email not in self._tokens:
+            response = self.session.post(self.url('/auth/login'),
+                                         json={'email': email, 'password': self.manifest['password']})
+            if response.status_code != 200:
+                raise RuntimeError(f'Login failed for {email}: {response.status_code} {response.text[:200]}')
+            self._tokens[email] = response.json()['token']
+        return self._tokens[email]
+
+    def headers(self, email: str) -> Dict[str, str]:
+        return {'Authorization': f'Bearer {self.token(email)}'}
+
+    def get(self, path: str, email: str):
+        response = self.session.get(self.url(path), headers=self.headers(email))
+        response.raise_for_status()
+        return response
+
+class Scenario:
+    name = None
+    # Scenarios that use up their input skip the untimed warmup.
+    warmup = True
+    # Statuses the scenario may legitimately get; anything else is counted as unexpected.
+    expected_statuses = None
+
+    def __init__(self, options):
+        self.options = options
+
+    def prepare(self, client: Client) -> None:
+        pass
+
+    def call(self, iteration: int) -> Optional[Call]:
+        raise NotImplementedError
+
+class _Rotating(Scenario):
+    """Cycles through pre-authenticated users, one per iteration."""
+
+    roles = ()
+
+    def prepare(self, client: Client) -> None:
+        self.users = [(email, client.headers(email)) for role in self.roles for email in client.emails(role)]
+        if not self.users:
+            raise RuntimeError(f'{self.name}: the manifest has no users with roles {", ".join(self.roles)}')
+
+    def user(self, iteration: int) -> Tuple[str, Dict]:
+        return self.users[iteration % len(self.users)]
+
+class Login(Scenario):
+    name = 'login'
+
+    def prepare(self, client: Client) -> None:
+        self.emails = [email for emails in client.manifest['users'].values() for email in emails]
+        self.password = client.manifest['password']
+
+    def call(self, iteration: int) -> Call:
+        email = self.emails[iteration % len(self.emails)]
+        return 'POST', '/auth/login', {'json': {'email': email, 'password': self.password}}
+
+class ListRequests(_Rotating):
+    name = 'list_requests'
+    roles = ('REQUESTOR', 'TECH_LEAD', 'DEPT_HEAD', 'SUPER_ADMIN')
+
+    def call(self, iteration: int) -> Call:
+        _, headers = self.user(iteration)
+        return 'GET', f'/requests?limit={self.options.page_size}', {'headers': headers}
+
+class PendingApprovals(_Rotating):
+    name = 'pending_approvals'
+
+    def prepare(self, client: Client) -> None:
+        self.roles = tuple(client.manifest['hierarchy'])
+        super().prepare(client)
+
+    def call(self, iteration: int) -> Call:
+        _, headers = self.user(iteration)
+        return 'GET', '/approvals/pending', {'headers': headers}
+
+class Approve(Scenario):
+    """Approves requests waiting at each stage, interleaving the stages.
+
+    Each request is approved once, so the number of iterations is capped by
+    the pending requests in the dataset; it runs last by default because it
+    changes the data the other scenarios read. Reseed between runs.
+    """
+
+    name = 'approve'
+    warmup = False
+
+    def prepare(self, client: Client) -> None:
+        queues = []
+        for role in client.manifest['hierarchy']:
+            emails = client.emails(role)
+            if not emails:
+                continue
+            pending = client.get('/approvals/pending', emails[0]).json()
+            headers = [client.headers(email) for email in emails]
+            queues.append([(item['id'], item.get('version'), headers[index % len(headers)])
+                           for index, item in enumerate(pending)])
+        interleaved = itertools.chain.from_iterable(itertools.zip_longest(*queues))
+        self.queue = deque(item for item in interleaved if item is not None)
+        self._lock = threading.Lock()
+
+    def call(self, iteration: int) -> Optional[Call]:
+        with self._lock:
+            if not self.queue:
+                return None
+            request_id, version, headers = self.queue.popleft()
+        body = {'comments': 'Approved by benchmark'}
+        if version is not None:
+            body['version'] = version
+        return 'POST', f'/requests/{request_id}/approve', {'headers': headers, 'json': body}
+
+class ApproveContended(Scenario):
+    """Batch and single approvals racing for the same requests.
+
+    Requests waiting at each stage are split into batches of
+    ``--batch-size``. Each batch goes to ``POST /approvals/batch`` right
+    before every request in it is also approved on its own, in reverse
+    order, by another approver of that stage, so the concurrent client
+    threads lock the same rows from both paths. One decision per request
+    wins; the others get a per-item error (batch, 200) or 400/409 (single).
+    Any other status, such as a 500 from a deadlock, fails the run.
+    """
+
+    name = 'approve_contended'
+    warmup = False
+    expected_statuses = (200, 400, 409)
+
+    def prepare(self, client: Client) -> None:
+        size = max(self.options.batch_size, 1)
+        calls = []
+        for role in client.manifest['hierarchy']:
+            emails = client.emails(role)
+            if not emails:
+                continue
+            pending = [item['id'] for item in client.get('/approvals/pending', emails[0]).json()]
+            batch_headers = client.headers(emails[0])
+            single_headers = client.headers(emails[-1])
+            for start in range(0, len(pending), size):
+                ids = pending[start:start + size]
+                items = [{'request_id': request_id, 'decision': 'APPROVED', 'comments': 'Batch benchmark'}
+                         for request_id in ids]
+                calls.append(('POST', '/approvals/batch', {'headers': batch_headers, 'json': {'items': items}}))
+                calls.extend(('POST', f'/requests/{request_id}/approve',
+                              {'headers': single_headers, 'json': {'comments': 'Single benchmark'}})
+                             for request_id in reversed(ids))
+        self.queue = deque(calls)
+        self._lock = threading.Lock()
+
+    def call(self, iteration: int) -> Optional[Call]:
+        with self._lock:
+            return self.queue.popleft() if self.queue else None
+
+class Timeline(_Rotating):
+    name = 'timeline'
+    roles = ('SUPER_ADMIN',)
+
+    def prepare(self, client: Client) -> None:
+        super().prepare(client)
+        email = self.users[0][0]
+        response = client.get('/requests?limit=100', email)
+        self.request_ids = [item['id'] for item in response.json()]
+        if not self.request_ids:
+            raise RuntimeError('timeline: no requests found; seed the database first')
+        random.Random(self.options.seed).shuffle(self.request_ids)
+
+    def call(self, iteration: int) -> Call:
+        _, headers = self.user(iteration)
+        return 'GET', f'/timeline/{self.request_ids[iteration % len(self.request_ids)]}', {'headers': headers}
+
+class Stats(_Rotating):
+    name = 'stats'
+    roles = ('SUPER_ADMIN',)
+
+    def call(self, iteration: int) -> Call:
+        _, headers = self.user(iteration)
+        return 'GET', '/admin/stats', {'headers': headers}
+
+def build_workbook(rows: int, unmapped_share: float, seed: int) -> bytes:
+    """An .xlsx upload; ``unmapped_share`` of the rows lack a usable amount and go to the (fake) model."""
+    rng = random.Random(seed)
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Budget')
+    sheet.append(['Category', 'Description', 'Type', 'Amount'])
+    for index in range(rows):
+        amount = round(rng.uniform(100, 250000), 2)
+        if rng.random() < unmapped_share:
+            amount = 'to be confirmed'
+        sheet.append([rng.choice(['Hardware', 'Software', 'Travel', 'Training', 'Consulting']),
+                      f'Line item {index + 1}', rng.choice(['CAPEX', 'OPEX']), amount])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+class ExcelImport(_Rotating):
+    name = 'excel_import'
+    roles = ('REQUESTOR',)
+
+    def prepare(self, client: Client) -> None:
+        super().prepare(client)
+        self.workbook = build_workbook(self.options.import_rows, self.options.import_unmapped, self.options.seed)
+
+    def call(self, iteration: int) -> Call:
+        _, headers = self.user(iteration)
+        files = {'file': ('benchmark.xlsx', self.workbook,
+                          'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')}
+        return 'POST', '/requests/import/excel', {'headers': headers, 'files': files}
+
+SCENARIOS = {scenario.name: scenario for scenario in (
+    Login, ListRequests, PendingApprovals, Timeline, Stats, ExcelImport, Approve, ApproveContended
+)}
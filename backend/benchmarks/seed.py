@@ -0,0 +1,234 @@
+"""
+Seed a synthetic benchmark dataset into the database named by DATABASE_URL.
+
+    python benchmarks/seed.py --requests 5000 --audit-logs 50000 --reset
+
+Every row carries a ``bench-`` id prefix (users also get ``@bench.budgetx.local``
+emails) so a dataset can be replaced with ``--reset`` without touching real
+data. The same ``--seed`` always produces the same dataset. A manifest with the
+login credentials per role is written for ``run.py``.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(os.path.dirname(BACKEND_DIR), '.env'))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault('HIERARCHY_LISTEN', 'False')
+
+from psycopg2.extras import Json
+from src.utils.db_utils import db_client
+from src.utils.auth_utils import hash_password
+from src.services.hierarchy_service import hierarchy_service
+
+ID_PREFIX = 'bench-'
+EMAIL_DOMAIN = 'bench.budgetx.local'
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'seed.json')
+
+CATEGORIES = ['Hardware', 'Software Licenses', 'Cloud Services', 'Consulting', 'Training', 'Travel',
+              'Facilities', 'Marketing', 'Security', 'Networking', 'Office Supplies', 'Research']
+
+# Share of requests left in each status; PENDING requests are spread across every stage.
+STATUS_WEIGHTS = {'DRAFT': 0.10, 'PENDING': 0.45, 'REWORK': 0.10, 'REJECTED': 0.10, 'FINAL_APPROVED': 0.25}
+
+AUDIT_ACTIONS = {'LOGIN': 0.40, 'REQUEST_CREATED': 0.15, 'REQUEST_SUBMITTED': 0.12, 'REQUEST_UPDATED': 0.08,
+                 'APPROVAL_ACTION': 0.22, 'REQUEST_DELETED': 0.03}
+
+def _bench_id(kind: str, index: int) -> str:
+    return f'{ID_PREFIX}{kind}-{index:08d}'
+
+def _insert(query: str, rows: list, template: str = None) -> None:
+    with db_client.transaction() as tx:
+        db_client.execute_values(query, rows, template=template, fetch=False)
+    if not tx.committed:
+        raise SystemExit(f'Seeding failed while running: {query.split("(")[0].strip()} (see the log above)')
+
+def _execute(query: str, params=None) -> None:
+    with db_client.transaction() as tx:
+        db_client.execute_query(query, params, fetch=False)
+    if not tx.committed:
+        raise SystemExit(f'Seeding failed while running: {query.strip().splitlines()[0]} (see the log above)')
+
+def reset() -> None:
+    """Delete every benchmark row, including rows created by benchmark runs."""
+    users = "(SELECT id FROM users WHERE id LIKE %(prefix)s)"
+    for query in (
+        f"DELETE FROM audit_logs WHERE user_id IN {users}",
+        f"DELETE FROM jobs WHERE user_id IN {users}",
+        f"DELETE FROM approval_records WHERE approver_id IN {users}",
+        f"DELETE FROM budget_requests WHERE requester_id IN {users} OR department_id LIKE %(prefix)s",
+        "DELETE FROM users WHERE id LIKE %(prefix)s",
+        "DELETE FROM departments WHERE id LIKE %(prefix)s",
+    ):
+        _execute(query, {'prefix': f'{ID_PREFIX}%'})
+
+def _weighted(rng: random.Random, weights: dict) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+def build_users(rng: random.Random, roles: list, per_role: int, departments: list, password_hash: str,
+                now: datetime) -> dict:
+    users = {}
+    rows = []
+    index = 0
+    for role in roles:
+        users[role] = []
+        for number in range(per_role):
+            user_id = _bench_id('user', index)
+            email = f'{role.lower()}.{number + 1}@{EMAIL_DOMAIN}'
+            department_id = departments[index % len(departments)] if role != 'SUPER_ADMIN' else None
+            rows.append((user_id, f'Bench {role.title().replace("_", " ")} {number + 1}', email, password_hash,
+                         role, department_id, now, now))
+            users[role].append({'id': user_id, 'email': email, 'department_id': department_id})
+            index += 1
+
+    _insert("""
+        INSERT INTO users (id, name, email, password_hash, role, department_id, created_at, updated_at)
+        VALUES %s
+    """, rows)
+    return users
+
+def build_requests(rng: random.Random, count: int, hierarchy: list, users: dict, days: int,
+                   now: datetime, batch_size: int = 5000) -> dict:
+    """Insert requests with approval histories consistent with their status and stage."""
+    requesters = users['REQUESTOR']
+    statuses = dict.fromkeys(STATUS_WEIGHTS, 0)
+    pending_by_stage = dict.fromkeys(hierarchy, 0)
+    records_total = 0
+
+    for start in range(0, count, batch_size):
+        request_rows = []
+        record_rows = []
+        for index in range(start, min(start + batch_size, count)):
+            request_id = _bench_id('req', index)
+            requester = rng.choice(requesters)
+            created_at = now - timedelta(days=rng.uniform(0, days))
+            status = _weighted(rng, STATUS_WEIGHTS)
+            statuses[status] += 1
+
+            # Number of stages that approved before the request reached its status.
+            if status == 'DRAFT':
+                approved = 0
+            elif status == 'FINAL_APPROVED':
+                approved = len(hierarchy)
+            else:
+                approved = rng.randrange(len(hierarchy))
+
+            decisions = [('APPROVED', hierarchy[stage]) for stage in range(approved)]
+            if status in ('REJECTED', 'REWORK'):
+                decisions.append((status, hierarchy[approved]))
+
+            timestamp = created_at
+            for decision, role in decisions:
+                timestamp += timedelta(hours=rng.uniform(1, 72))
+                record_rows.append((_bench_id('rec', records_total), request_id, rng.choice(users[role])['id'],
+                                    role, decision, None if decision == 'APPROVED' else 'Benchmark decision',
+                                    min(timestamp, now)))
+                records_total += 1
+
+            current_stage = hierarchy[approved] if status == 'PENDING' else None
+            if current_stage:
+                pending_by_stage[current_stage] += 1
+            # One bump for the submit and one per decision, as the application does.
+            version = 1 if status == 'DRAFT' else 2 + len(decisions)
+            request_rows.append((
+                request_id, rng.choice(['CAPEX', 'OPEX']), round(rng.lognormvariate(10, 1.2), 2),
+                rng.choice(CATEGORIES), f'Synthetic benchmark request {index}', requester['department_id'],
+                requester['id'], status, current_stage, version, created_at, min(timestamp, now)
+            ))
+
+        _insert("""
+            INSERT INTO budget_requests (id, type, amount, category, justification, department_id, requester_id,
+                                         status, current_stage, version, created_at, updated_at)
+            VALUES %s
+        """, request_rows)
+        if record_rows:
+            _insert("""
+                INSERT INTO approval_records (id, request_id, approver_id, role, decision, comments, timestamp)
+                VALUES %s
+            """, record_rows)
+
+    return {'statuses': statuses, 'pending_by_stage': pending_by_stage, 'approval_records': records_total}
+
+def build_audit_logs(rng: random.Random, count: int, users: dict, request_count: int, days: int,
+                     now: datetime, batch_size: int = 10000) -> None:
+    everyone = [user for role_users in users.values() for user in role_users]
+    for start in range(0, count, batch_size):
+        rows = []
+        for index in range(start, min(start + batch_size, count)):
+            user = rng.choice(everyone)
+            action = _weighted(rng, AUDIT_ACTIONS)
+            if action == 'LOGIN':
+                metadata = {'email': user['email']}
+            else:
+                metadata = {'request_id': _bench_id('req', rng.randrange(max(request_count, 1)))}
+                if action == 'APPROVAL_ACTION':
+                    metadata['decision'] = rng.choice(['APPROVED', 'APPROVED', 'APPROVED', 'REJECTED', 'REWORK'])
+            rows.append((_bench_id('audit', index), user['id'], action, Json(metadata),
+                         now - timedelta(days=rng.uniform(0, days))))
+        _insert("INSERT INTO audit_logs (id, user_id, action, metadata, timestamp) VALUES %s", rows)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Seed a synthetic dataset for the API benchmarks.')
+    parser.add_argument('--users-per-role', type=int, default=5)
+    parser.add_argument('--departments', type=int, default=10)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--audit-logs', type=int, default=50000)
+    parser.add_argument('--days', type=int, default=365, help='Spread created_at / timestamps over this many days')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed gives the same dataset')
+    parser.add_argument('--password', default='benchmark', help='Password of every seeded user')
+    parser.add_argument('--reset', action='store_true', help='Delete existing benchmark rows first')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST)
+    args = parser.parse_args()
+
+    if not db_client.connection_string:
+        raise SystemExit('DATABASE_URL is not set')
+
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    hierarchy = hierarchy_service.roles()
+    roles = ['REQUESTOR', *hierarchy, 'SUPER_ADMIN']
+    started = time.perf_counter()
+
+    if args.reset:
+        reset()
+    elif db_client.execute_one("SELECT 1 FROM users WHERE id LIKE %s LIMIT 1", (f'{ID_PREFIX}%',)):
+        raise SystemExit('Benchmark data already exists; pass --reset to replace it')
+
+    departments = [_bench_id('dept', index) for index in range(args.departments)]
+    _insert("INSERT INTO departments (id, name, created_at) VALUES %s",
+            [(dept_id, f'Bench Department {index + 1}', now) for index, dept_id in enumerate(departments)])
+
+    # One hash for everyone: bcrypt per user would dominate seeding time.
+    users = build_users(rng, roles, args.users_per_role, departments, hash_password(args.password), now)
+    request_counts = build_requests(rng, args.requests, hierarchy, users, args.days, now)
+    build_audit_logs(rng, args.audit_logs, users, args.requests, args.days, now)
+
+    for table in ('departments', 'users', 'budget_requests', 'approval_records', 'audit_logs'):
+        _execute(f'ANALYZE {table}')
+
+    manifest = {
+        'params': {key: value for key, value in vars(args).items() if key not in ('password', 'manifest', 'reset')},
+        'password': args.password,
+        'hierarchy': hierarchy,
+        'users': {role: [user['email'] for user in role_users] for role, role_users in users.items()},
+        'counts': dict(request_counts, departments=len(departments), requests=args.requests,
+                       audit_logs=args.audit_logs),
+        'seeded_at': now.isoformat(),
+        'seconds': round(time.perf_counter() - started, 2)
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.manifest)), exist_ok=True)
+    with open(args.manifest, 'w') as handle:
+        json.dump(manifest, handle, indent=2)
+
+    print(f"Seeded {args.requests} requests, {request_counts['approval_records']} approval records and "
+          f"{args.audit_logs} audit logs in {manifest['seconds']}s; manifest written to {args.manifest}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Gunicorn configuration for the IPruBudEx backend.
+
+    gunicorn -c gunicorn.conf.py app:app
+
+Workers and timeouts come from the environment (see .env.example). The app
+is preloaded in the master so workers share its memory copy-on-write; each
+worker then builds its own database pool and background threads after fork
+and drains them on shutdown.
+"""
+
+import os
+import sys
+import tempfile
+from dotenv import load_dotenv
+
+dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
+load_dotenv(dotenv_path=dotenv_path)
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Every worker must publish metrics to a shared directory for /metrics to
+# cover the whole server; default to a private temp dir.
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), f'budgetx-metrics-{os.getpid()}'))
+
+from src.config.settings import config as app_config
+
+bind = f"0.0.0.0:{app_config.PORT}"
+workers = app_config.WEB_CONCURRENCY
+# Threads rather than gevent: psycopg2 and bcrypt block in C and are not
+# cooperative without extra patching.
+worker_class = 'gthread'
+threads = app_config.GUNICORN_THREADS
+timeout = app_config.GUNICORN_TIMEOUT
+graceful_timeout = app_config.GUNICORN_GRACEFUL_TIMEOUT
+keepalive = app_config.GUNICORN_KEEPALIVE
+max_requests = app_config.GUNICORN_MAX_REQUESTS
+max_requests_jitter = app_config.GUNICORN_MAX_REQUESTS_JITTER
+preload_app = True
+accesslog = '-'
+errorlog = '-'
+loglevel = app_config.LOG_LEVEL.lower()
+
+def on_starting(server):
+    from src.utils.db_utils import db_client
+    from src.utils.metrics import metrics
+    from src.services.audit_partition_service import audit_partition_service
+    from src.utils.http_cache import compact_versions
+
+    metrics.clear_directory()
+    # Audit rows past the last monthly partition land in the default one;
+    # keep a few months ready. Fold the ETag counters left by old backends.
+    # The master's connections are not for workers.
+    audit_partition_service.ensure_partitions()
+    compact_versions()
+    db_client.close()
+
+def post_fork(server, worker):
+    from src.utils.db_utils import db_client
+    from src.utils.metrics import metrics
+    from src.services.job_service import job_service
+
+    db_client.reset_after_fork()
+    metrics.reset()
+    job_service.ensure_started()
+
+def worker_exit(server, worker):
+    from src.utils.db_utils import db_client
+    from src.utils.metrics import metrics
+    from src.services.audit_service import audit_writer
+    from src.services.job_service import job_service
+
+    job_service.shutdown(timeout=app_config.GUNICORN_GRACEFUL_TIMEOUT)
+    audit_writer.shutdown()
+    metrics.flush()
+    db_client.close()
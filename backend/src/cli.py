@@ -0,0 +1,69 @@
+import sys
+import click
+from flask.cli import AppGroup
+from .services.rollup_service import rollup_service
+from .services.audit_partition_service import audit_partition_service
+from .utils.http_cache import compact_versions
+
+rollups_cli = AppGroup('rollups', help='Maintain the budget_rollups reporting table.')
+
+@rollups_cli.command('rebuild')
+@click.option('--check', is_flag=True, help='Only report drift; exit 1 if the table is out of date.')
+def rebuild_rollups(check):
+    """Recompute budget_rollups from budget_requests."""
+    result = rollup_service.rebuild(dry_run=check)
+    if 'error' in result:
+        click.echo(result['error'], err=True)
+        sys.exit(2)
+
+    drifted = result['stale'] + result['missing'] + result['different']
+    click.echo(f"{result['groups']} groups; {result['missing']} missing, {result['stale']} stale, "
+               f"{result['different']} with different totals")
+    if check:
+        sys.exit(1 if drifted else 0)
+    click.echo('budget_rollups rebuilt')
+
+audit_logs_cli = AppGroup('audit-logs', help='Maintain the monthly audit_logs partitions.')
+
+@audit_logs_cli.command('partitions')
+def list_audit_partitions():
+    """List the audit_logs partitions."""
+    partitions = audit_partition_service.list_partitions()
+    if partitions is None:
+        click.echo('Failed to list audit log partitions', err=True)
+        sys.exit(2)
+    for partition in partitions:
+        click.echo(f"{partition['name']:<22} {partition['month'] or 'default':<8} "
+                   f"~{partition['estimated_rows']} rows {partition['bytes']} bytes")
+
+@audit_logs_cli.command('maintain')
+@click.option('--months-ahead', type=int, default=None, help='Default: AUDIT_PARTITION_MONTHS_AHEAD.')
+@click.option('--retention-months', type=int, default=None,
+              help='Archive partitions older than this many full months; 0 keeps everything. '
+                   'Default: AUDIT_RETENTION_MONTHS.')
+@click.option('--archive-dir', default=None, help='Default: AUDIT_ARCHIVE_DIR.')
+@click.option('--dry-run', is_flag=True, help='Only list the partitions that would be archived.')
+def maintain_audit_partitions(months_ahead, retention_months, archive_dir, dry_run):
+    """Create upcoming partitions, archive and drop expired ones, then fold the ETag version counters."""
+    result = audit_partition_service.maintain(months_ahead, retention_months, archive_dir, dry_run)
+    if 'error' in result:
+        click.echo(result['error'], err=True)
+        sys.exit(2)
+
+    click.echo(f"Created partitions: {', '.join(result['created']) or 'none'}")
+    if dry_run:
+        click.echo(f"Would archive: {', '.join(result['expired']) or 'nothing'}")
+        return
+    for archived in result['archived']:
+        click.echo(f"Archived {archived['partition']}: {archived['rows']} rows to {archived['file']}")
+    for error in result['errors']:
+        click.echo(error, err=True)
+
+    # Every backend that writes adds table_versions rows; gunicorn only folds them at start.
+    folded = compact_versions()
+    if folded is None:
+        click.echo('Failed to compact table_versions', err=True)
+    else:
+        click.echo(f"Compacted {folded} table version counters")
+    if result['errors'] or folded is None:
+        sys.exit(1)
@@ -8,8 +8,74 @@ class Config:
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'dev-jwt-secret')
     DATABASE_URL = os.getenv('DATABASE_URL')
     DB_PROVIDER = os.getenv('DB_PROVIDER', 'postgresql')
+    DB_POOL_ENABLED = os.getenv('DB_POOL_ENABLED', 'True') == 'True'
+    DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 1))
+    DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+    DB_POOL_MAX_IDLE = float(os.getenv('DB_POOL_MAX_IDLE', 300))
+    DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', 1800))
+    DB_POOL_CHECK_AFTER = float(os.getenv('DB_POOL_CHECK_AFTER', 30))
+    DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    DB_REPLICA_EJECT_SECONDS = float(os.getenv('DB_REPLICA_EJECT_SECONDS', 30))
+    DB_REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', 10))
+    DB_REPLICA_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_CHECK_INTERVAL', 5))
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    SQL_INSTRUMENTATION = os.getenv('SQL_INSTRUMENTATION', 'True') == 'True'
+    SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 200))
+    N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', 10))
+    REQUEST_LOG = os.getenv('REQUEST_LOG', 'True') == 'True'
+    WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 2))
+    GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', 4))
+    GUNICORN_TIMEOUT = int(os.getenv('GUNICORN_TIMEOUT', 60))
+    GUNICORN_GRACEFUL_TIMEOUT = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+    GUNICORN_KEEPALIVE = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+    GUNICORN_MAX_REQUESTS = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+    GUNICORN_MAX_REQUESTS_JITTER = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 0))
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    METRICS_DIR = os.getenv('METRICS_DIR')
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    BULK_CREATE_MAX_ROWS = int(os.getenv('BULK_CREATE_MAX_ROWS', 1000))
+    APPROVAL_BATCH_MAX_ITEMS = int(os.getenv('APPROVAL_BATCH_MAX_ITEMS', 500))
+    AUDIT_ASYNC = os.getenv('AUDIT_ASYNC', 'True') == 'True'
+    AUDIT_QUEUE_SIZE = int(os.getenv('AUDIT_QUEUE_SIZE', 10000))
+    AUDIT_BATCH_SIZE = int(os.getenv('AUDIT_BATCH_SIZE', 500))
+    AUDIT_FLUSH_INTERVAL = float(os.getenv('AUDIT_FLUSH_INTERVAL', 1.0))
+    AUDIT_PARTITION_MONTHS_AHEAD = int(os.getenv('AUDIT_PARTITION_MONTHS_AHEAD', 3))
+    AUDIT_RETENTION_MONTHS = int(os.getenv('AUDIT_RETENTION_MONTHS', 0))
+    AUDIT_ARCHIVE_DIR = os.getenv('AUDIT_ARCHIVE_DIR', 'archive/audit_logs')
+    HIERARCHY_LISTEN = os.getenv('HIERARCHY_LISTEN', 'True') == 'True'
+    STATS_CACHE_TTL = float(os.getenv('STATS_CACHE_TTL', 30))
+    HTTP_ETAGS_ENABLED = os.getenv('HTTP_ETAGS_ENABLED', 'True') == 'True'
+    HTTP_CACHE_SALT = os.getenv('HTTP_CACHE_SALT', os.getenv('RENDER_GIT_COMMIT', ''))
+    TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 10000))
+    USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', 60))
+    USER_CACHE_LISTEN = os.getenv('USER_CACHE_LISTEN', 'True') == 'True'
+    AUTH_CHECK_USER_STATUS = os.getenv('AUTH_CHECK_USER_STATUS', 'True') == 'True'
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    GEMINI_BACKEND = os.getenv('GEMINI_BACKEND', 'gemini')
+    GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-pro')
+    FAKE_GEMINI_LATENCY_MS = float(os.getenv('FAKE_GEMINI_LATENCY_MS', 0))
+    AI_CACHE_ENABLED = os.getenv('AI_CACHE_ENABLED', 'True') == 'True'
+    AI_CACHE_SIZE = int(os.getenv('AI_CACHE_SIZE', 1024))
+    AI_CACHE_TTL = float(os.getenv('AI_CACHE_TTL', 604800))
+    EXCEL_IMPORT_MAX_ROWS = int(os.getenv('EXCEL_IMPORT_MAX_ROWS', 50000))
+    EXCEL_IMPORT_CHUNK_ROWS = int(os.getenv('EXCEL_IMPORT_CHUNK_ROWS', 200))
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 2))
+    JOB_LEASE_SECONDS = float(os.getenv('JOB_LEASE_SECONDS', 300))
+    JOB_RETRY_BACKOFF = float(os.getenv('JOB_RETRY_BACKOFF', 5))
     MAX_LOGIN_ATTEMPTS = int(os.getenv('MAX_LOGIN_ATTEMPTS', 3))
+    LOGIN_RATE_LIMIT_WINDOW = float(os.getenv('LOGIN_RATE_LIMIT_WINDOW', 60))
+    LOGIN_RATE_LIMIT_PER_EMAIL = int(os.getenv('LOGIN_RATE_LIMIT_PER_EMAIL', 5))
+    LOGIN_RATE_LIMIT_PER_IP = int(os.getenv('LOGIN_RATE_LIMIT_PER_IP', 30))
+    TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', 0))
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+    BCRYPT_WORKERS = int(os.getenv('BCRYPT_WORKERS', 2))
+    BCRYPT_MAX_PENDING = int(os.getenv('BCRYPT_MAX_PENDING', 32))
+    BCRYPT_TIMEOUT = float(os.getenv('BCRYPT_TIMEOUT', 10))
     JWT_EXPIRATION_MINUTES = int(os.getenv('JWT_EXPIRATION_MINUTES', 480))
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(',')
     PORT = int(os.getenv('PORT', 5000))
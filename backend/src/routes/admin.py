@@ -1,14 +1,24 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
+from ..config.settings import config
 from ..services.department_service import department_service
-from ..services.audit_service import audit_service
-from ..utils.db_utils import db_client
+from ..services.audit_service import audit_service, AUDIT_EXPORT_COLUMNS
+from ..services.hierarchy_service import hierarchy_service
+from ..services.stats_service import stats_service
+from ..utils.db_utils import transactional
+from ..utils.http_cache import conditional
 from ..utils.auth_utils import token_required, role_required
+from ..utils.export_utils import EXPORT_FORMATS, export_chunks
+from ..utils.pagination import clamp_limit
+from datetime import datetime
 import json
 
 admin_bp = Blueprint('admin', __name__)
 
+AUDIT_LOG_PAGE_SIZE = 100
+
 @admin_bp.route('/admin/departments', methods=['GET'])
 @token_required
+@conditional('departments')
 def get_departments():
     departments = department_service.get_all_departments()
     return jsonify(departments), 200
@@ -16,6 +26,7 @@ def get_departments():
 @admin_bp.route('/admin/departments', methods=['POST'])
 @token_required
 @role_required('SUPER_ADMIN')
+@transactional
 def create_department():
     data = request.get_json()
 
@@ -37,6 +48,7 @@ def create_department():
 @admin_bp.route('/admin/departments/<dept_id>', methods=['PATCH'])
 @token_required
 @role_required('SUPER_ADMIN')
+@transactional
 def update_department(dept_id):
     data = request.get_json()
 
@@ -58,6 +70,7 @@ def update_department(dept_id):
 @admin_bp.route('/admin/departments/<dept_id>', methods=['DELETE'])
 @token_required
 @role_required('SUPER_ADMIN')
+@transactional
 def delete_department(dept_id):
     department_service.delete_department(dept_id)
 
@@ -71,27 +84,24 @@ def delete_department(dept_id):
 @token_required
 @role_required('SUPER_ADMIN')
 def get_hierarchy():
-    config = db_client.execute_one("SELECT value FROM system_config WHERE key = 'approval_hierarchy'")
-
-    if not config:
-        return jsonify({'error': 'Hierarchy not found'}), 404
-
-    hierarchy = json.loads(config['value'])
-    return jsonify({'hierarchy': hierarchy}), 200
+    return jsonify({'hierarchy': hierarchy_service.roles()}), 200
 
 @admin_bp.route('/admin/hierarchy', methods=['PATCH'])
 @token_required
 @role_required('SUPER_ADMIN')
+@transactional
 def update_hierarchy():
-    data = request.get_json()
+    data = request.get_json(silent=True)
 
-    if not data.get('hierarchy') or not isinstance(data['hierarchy'], list):
+    if not isinstance(data, dict) or not data.get('hierarchy') or not isinstance(data['hierarchy'], list):
         return jsonify({'error': 'Valid hierarchy array is required'}), 400
 
-    hierarchy_json = json.dumps(data['hierarchy'])
+    if not all(isinstance(role, str) and role for role in data['hierarchy']):
+        return jsonify({'error': 'Hierarchy entries must be role names'}), 400
 
-    query = "UPDATE system_config SET value = %s, updated_at = NOW() WHERE key = 'approval_hierarchy'"
-    db_client.execute_query(query, (hierarchy_json,), fetch=False)
+    result = hierarchy_service.save(data['hierarchy'])
+    if 'error' in result:
+        return jsonify({'error': result['error']}), 400 if result.get('reason') == 'invalid' else 500
 
     audit_service.log_action(request.user_id, 'HIERARCHY_UPDATED', {
         'hierarchy': data['hierarchy']
@@ -99,33 +109,89 @@ def update_hierarchy():
 
     return jsonify({'message': 'Hierarchy updated successfully', 'hierarchy': data['hierarchy']}), 200
 
+def _parse_audit_filters(args) -> dict:
+    filters = {}
+
+    if args.get('user_id'):
+        filters['user_id'] = args['user_id']
+    if args.get('action'):
+        filters['action'] = [action.strip() for action in args['action'].split(',') if action.strip()]
+    for key, arg in (('start', 'from'), ('end', 'to')):
+        if args.get(arg):
+            filters[key] = datetime.fromisoformat(args[arg])
+
+    metadata = {}
+    if args.get('metadata'):
+        metadata = json.loads(args['metadata'])
+        if not isinstance(metadata, dict):
+            raise ValueError('metadata must be a JSON object')
+    for arg, value in args.items():
+        if arg.startswith('metadata.') and len(arg) > len('metadata.'):
+            metadata[arg[len('metadata.'):]] = value
+    if metadata:
+        filters['metadata'] = metadata
+
+    return filters
+
+def _audit_log_page(filters: dict):
+    page = audit_service.list_logs(
+        filters,
+        clamp_limit(request.args.get('limit', type=int), default=AUDIT_LOG_PAGE_SIZE),
+        cursor=request.args.get('cursor')
+    )
+    response = jsonify(page['items'])
+    if page['next_cursor']:
+        response.headers['X-Next-Cursor'] = page['next_cursor']
+    return response, 200
+
 @admin_bp.route('/admin/audit-logs', methods=['GET'])
 @token_required
 @role_required('SUPER_ADMIN')
 def get_audit_logs():
-    limit = request.args.get('limit', 100, type=int)
-    logs = audit_service.get_all_logs(limit)
-    return jsonify(logs), 200
+    try:
+        return _audit_log_page(_parse_audit_filters(request.args))
+    except ValueError as e:
+        return jsonify({'error': f'Invalid query parameter: {str(e)}'}), 400
+
+@admin_bp.route('/admin/audit-logs/export', methods=['GET'])
+@token_required
+@role_required('SUPER_ADMIN')
+def export_audit_logs():
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unsupported export format. Use one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    try:
+        filters = _parse_audit_filters(request.args)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid query parameter: {str(e)}'}), 400
+
+    batches = audit_service.stream_logs(filters, config.EXPORT_BATCH_SIZE)
+
+    return Response(
+        export_chunks(batches, export_format, AUDIT_EXPORT_COLUMNS),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename=audit_logs.{export_format}'}
+    )
 
 @admin_bp.route('/admin/audit-logs/<user_id>', methods=['GET'])
 @token_required
 @role_required('SUPER_ADMIN')
 def get_user_audit_logs(user_id):
-    limit = request.args.get('limit', 100, type=int)
-    logs = audit_service.get_user_logs(user_id, limit)
-    return jsonify(logs), 200
+    try:
+        filters = _parse_audit_filters(request.args)
+        filters['user_id'] = user_id
+        return _audit_log_page(filters)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid query parameter: {str(e)}'}), 400
 
 @admin_bp.route('/admin/stats', methods=['GET'])
 @token_required
 @role_required('SUPER_ADMIN')
 def get_stats():
-    stats = {}
-
-    stats['total_users'] = db_client.execute_one("SELECT COUNT(*) as count FROM users")['count']
-    stats['total_departments'] = db_client.execute_one("SELECT COUNT(*) as count FROM departments")['count']
-    stats['total_requests'] = db_client.execute_one("SELECT COUNT(*) as count FROM budget_requests")['count']
-    stats['pending_requests'] = db_client.execute_one("SELECT COUNT(*) as count FROM budget_requests WHERE status = 'PENDING'")['count']
-    stats['approved_requests'] = db_client.execute_one("SELECT COUNT(*) as count FROM budget_requests WHERE status = 'FINAL_APPROVED'")['count']
-    stats['rejected_requests'] = db_client.execute_one("SELECT COUNT(*) as count FROM budget_requests WHERE status = 'REJECTED'")['count']
+    stats = stats_service.get_stats()
+
+    if not stats:
+        return jsonify({'error': 'Failed to load stats'}), 500
 
     return jsonify(stats), 200
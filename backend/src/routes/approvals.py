@@ -1,21 +1,61 @@
 from flask import Blueprint, request, jsonify
-from ..services.approval_service import approval_service
+from ..config.settings import config
+from ..services.approval_service import approval_service, BATCH_DECISIONS
 from ..services.request_service import request_service
 from ..utils.auth_utils import token_required, role_required
+from ..utils.db_utils import transactional
+from ..utils.http_cache import conditional
 
 approvals_bp = Blueprint('approvals', __name__)
 
 APPROVER_ROLES = ['TECH_LEAD', 'DEPT_HEAD', 'FINANCE_ADMIN', 'FPNA', 'PRINCIPAL_FINANCE', 'CFO', 'SUPER_ADMIN']
 
+# Request ids are UUIDs (seeded data may use other text ids); anything longer is not an id.
+MAX_REQUEST_ID_LENGTH = 64
+
 @approvals_bp.route('/approvals/pending', methods=['GET'])
 @token_required
 @role_required(*APPROVER_ROLES)
+@conditional('budget_requests', 'users', 'departments')
 def get_pending_approvals():
     pending = approval_service.get_pending_approvals_for_user(request.user_id, request.user_role)
     return jsonify(pending), 200
 
+@approvals_bp.route('/approvals/batch', methods=['POST'])
+@token_required
+@role_required(*APPROVER_ROLES)
+def decide_batch():
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else None
+
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'items must be a non-empty list'}), 400
+
+    if len(items) > config.APPROVAL_BATCH_MAX_ITEMS:
+        return jsonify({'error': f'At most {config.APPROVAL_BATCH_MAX_ITEMS} items per batch'}), 413
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get('request_id'):
+            return jsonify({'error': f'Item {index}: request_id is required'}), 400
+        if not isinstance(item['request_id'], str) or len(item['request_id']) > MAX_REQUEST_ID_LENGTH:
+            return jsonify({'error': f'Item {index}: request_id must be a string id'}), 400
+        if item.get('comments') is not None and not isinstance(item['comments'], str):
+            return jsonify({'error': f'Item {index}: comments must be a string'}), 400
+        if item.get('decision') not in BATCH_DECISIONS:
+            return jsonify({'error': f"Item {index}: decision must be one of {', '.join(BATCH_DECISIONS)}"}), 400
+        if item['decision'] != 'APPROVED' and not item.get('comments'):
+            return jsonify({'error': f'Item {index}: comments are required for rejection and rework'}), 400
+
+    result = approval_service.decide_batch(items, request.user_id, request.user_role)
+
+    if 'error' in result:
+        return jsonify(result), 500
+
+    return jsonify(result), 200
+
 @approvals_bp.route('/timeline/<request_id>', methods=['GET'])
 @token_required
+@conditional('budget_requests', 'approval_records', 'users', 'departments')
 def get_timeline(request_id):
     budget_request = request_service.get_request_by_id(request_id)
 
@@ -29,77 +69,91 @@ def get_timeline(request_id):
         'timeline': timeline
     }), 200
 
+TRANSITION_ERROR_STATUS = {
+    'not_found': 404,
+    'not_pending': 400,
+    'conflict': 409
+}
+
+def _expected_version(data: dict):
+    version = data.get('version')
+    if version is None:
+        return None
+    return int(version)
+
+def _transition_response(result: dict):
+    if 'error' in result:
+        return jsonify(result), TRANSITION_ERROR_STATUS.get(result.get('reason'), 500)
+    return jsonify(result), 200
+
 @approvals_bp.route('/requests/<request_id>/approve', methods=['POST'])
 @token_required
 @role_required(*APPROVER_ROLES)
+@transactional
 def approve_request(request_id):
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
 
-    budget_request = request_service.get_request_by_id(request_id)
-
-    if not budget_request:
-        return jsonify({'error': 'Request not found'}), 404
-
-    if budget_request['status'] != 'PENDING':
-        return jsonify({'error': 'Request is not in pending status'}), 400
+    try:
+        expected_version = _expected_version(data)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'version must be an integer'}), 400
 
     result = approval_service.approve_request(
         request_id,
         request.user_id,
         request.user_role,
-        data.get('comments')
+        data.get('comments'),
+        expected_version
     )
 
-    return jsonify(result), 200
+    return _transition_response(result)
 
 @approvals_bp.route('/requests/<request_id>/reject', methods=['POST'])
 @token_required
 @role_required(*APPROVER_ROLES)
+@transactional
 def reject_request(request_id):
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
 
     if not data.get('comments'):
         return jsonify({'error': 'Comments are required for rejection'}), 400
 
-    budget_request = request_service.get_request_by_id(request_id)
-
-    if not budget_request:
-        return jsonify({'error': 'Request not found'}), 404
-
-    if budget_request['status'] != 'PENDING':
-        return jsonify({'error': 'Request is not in pending status'}), 400
+    try:
+        expected_version = _expected_version(data)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'version must be an integer'}), 400
 
     result = approval_service.reject_request(
         request_id,
         request.user_id,
         request.user_role,
-        data['comments']
+        data['comments'],
+        expected_version
     )
 
-    return jsonify(result), 200
+    return _transition_response(result)
 
 @approvals_bp.route('/requests/<request_id>/rework', methods=['POST'])
 @token_required
 @role_required(*APPROVER_ROLES)
+@transactional
 def rework_request(request_id):
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
 
     if not data.get('comments'):
         return jsonify({'error': 'Comments are required for rework'}), 400
 
-    budget_request = request_service.get_request_by_id(request_id)
-
-    if not budget_request:
-        return jsonify({'error': 'Request not found'}), 404
-
-    if budget_request['status'] != 'PENDING':
-        return jsonify({'error': 'Request is not in pending status'}), 400
+    try:
+        expected_version = _expected_version(data)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'version must be an integer'}), 400
 
     result = approval_service.rework_request(
         request_id,
         request.user_id,
         request.user_role,
-        data['comments']
+        data['comments'],
+        expected_version
     )
 
-    return jsonify(result), 200
+    return _transition_response(result)
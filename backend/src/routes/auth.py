@@ -1,17 +1,42 @@
 from flask import Blueprint, request, jsonify
+from ..config.settings import config
 from ..services.auth_service import auth_service
-from ..utils.auth_utils import token_required, role_required
+from ..utils.auth_utils import (token_required, role_required, PasswordWorkQueueFull, PasswordWorkTimeout,
+                                password_work_unavailable)
+from ..utils.rate_limit import RateLimiter
+from ..utils.db_utils import transactional
 
 auth_bp = Blueprint('auth', __name__)
 
+login_limiter_by_email = RateLimiter(config.LOGIN_RATE_LIMIT_PER_EMAIL, config.LOGIN_RATE_LIMIT_WINDOW)
+login_limiter_by_ip = RateLimiter(config.LOGIN_RATE_LIMIT_PER_IP, config.LOGIN_RATE_LIMIT_WINDOW)
+
+def _too_many_requests(retry_after: float):
+    response = jsonify({'error': 'Too many login attempts. Please try again later.'})
+    response.headers['Retry-After'] = str(int(retry_after) + 1)
+    return response, 429
+
 @auth_bp.route('/auth/login', methods=['POST'])
 def login():
-    data = request.get_json()
+    data = request.get_json(silent=True)
 
-    if not data or not data.get('email') or not data.get('password'):
+    if not isinstance(data, dict) or not data.get('email') or not data.get('password'):
         return jsonify({'error': 'Email and password are required'}), 400
 
-    result = auth_service.login(data['email'], data['password'])
+    if not isinstance(data['email'], str) or not isinstance(data['password'], str):
+        return jsonify({'error': 'Email and password must be strings'}), 400
+
+    retry_after = login_limiter_by_ip.hit(request.remote_addr or 'unknown') or \
+        login_limiter_by_email.hit(data['email'].strip().lower())
+    if retry_after:
+        return _too_many_requests(retry_after)
+
+    try:
+        result = auth_service.login(data['email'], data['password'])
+    except PasswordWorkQueueFull:
+        return _too_many_requests(1)
+    except PasswordWorkTimeout:
+        return password_work_unavailable()
 
     if 'error' in result:
         return jsonify(result), 401
@@ -21,6 +46,7 @@ def login():
 @auth_bp.route('/auth/unlock', methods=['POST'])
 @token_required
 @role_required('SUPER_ADMIN')
+@transactional
 def unlock_user():
     data = request.get_json()
 
@@ -28,6 +54,9 @@ def unlock_user():
         return jsonify({'error': 'User ID is required'}), 400
 
     result = auth_service.unlock_account(request.user_id, data['user_id'])
+    if 'error' in result:
+        return jsonify(result), 500
+
     return jsonify(result), 200
 
 @auth_bp.route('/auth/me', methods=['GET'])
@@ -35,7 +64,7 @@ def unlock_user():
 def get_current_user():
     from ..services.user_service import user_service
 
-    user = user_service.get_user_by_id(request.user_id)
+    user = user_service.get_cached_user(request.user_id)
 
     if not user:
         return jsonify({'error': 'User not found'}), 404
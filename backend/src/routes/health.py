@@ -1,5 +1,9 @@
 from flask import Blueprint, jsonify
 from ..utils.db_utils import db_client
+from ..services.audit_service import audit_writer
+from ..services.job_service import job_service
+from ..services.ai_cache_service import ai_cache
+from ..utils.auth_utils import password_hasher
 
 health_bp = Blueprint('health', __name__)
 
@@ -15,5 +19,11 @@ def health_check():
         'status': 'healthy',
         'service': 'IpruBudgetX API',
         'database': db_status,
+        'pool': db_client.pool_stats(),
+        'replicas': db_client.replica_stats(),
+        'audit_queue': audit_writer.stats(),
+        'password_hashing': password_hasher.stats(),
+        'jobs': job_service.stats(),
+        'ai_cache': ai_cache.stats(),
         'version': '1.0.0'
     }), 200
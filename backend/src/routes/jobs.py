@@ -0,0 +1,18 @@
+from flask import Blueprint, request, jsonify
+from ..services.job_service import job_service
+from ..utils.auth_utils import token_required
+
+jobs_bp = Blueprint('jobs', __name__)
+
+@jobs_bp.route('/jobs/<job_id>', methods=['GET'])
+@token_required
+def get_job(job_id):
+    job = job_service.get_job(job_id)
+
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    if job['user_id'] != request.user_id and request.user_role != 'SUPER_ADMIN':
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    return jsonify(job), 200
@@ -0,0 +1,61 @@
+from flask import Blueprint, Response, request, jsonify
+from ..config.settings import config
+from ..services.ai_cache_service import ai_cache
+from ..services.audit_service import audit_writer
+from ..services.job_service import job_service
+from ..services.stats_service import stats_service
+from ..services.user_service import user_service
+from ..utils.auth_utils import token_cache_stats
+from ..utils.db_utils import db_client
+from ..utils.metrics import metrics, MetricsRegistry
+import hmac
+
+metrics_bp = Blueprint('metrics', __name__)
+
+def _collect(registry: MetricsRegistry) -> None:
+    pool = db_client.pool_stats()
+    if pool:
+        registry.set_gauge('db_pool_connections', pool['idle'], {'state': 'idle'})
+        registry.set_gauge('db_pool_connections', pool['in_use'], {'state': 'in_use'})
+        registry.set_gauge('db_pool_waiting', pool['waiting'])
+        registry.set_counter('db_pool_checkouts_total', pool['checkouts'])
+        registry.set_counter('db_pool_timeouts_total', pool['timeouts'])
+
+    for replica in db_client.replica_stats() or []:
+        labels = {'replica': replica['name']}
+        registry.set_gauge('db_replica_up', 1 if replica['healthy'] else 0, labels)
+        registry.set_counter('db_replica_reads_total', replica['reads'], labels)
+        registry.set_counter('db_replica_ejections_total', replica['ejections'], labels)
+
+    audit = audit_writer.stats()
+    registry.set_gauge('audit_queue_depth', audit['queue_depth'])
+    registry.set_counter('audit_rows_written_total', audit['written'])
+    registry.set_counter('audit_rows_failed_total', audit['failed'])
+
+    registry.set_gauge('jobs_active', job_service.stats()['active'])
+
+    caches = {
+        'token': token_cache_stats(),
+        'user_profile': user_service._profile_cache.stats(),
+        'admin_stats': stats_service._cache.stats(),
+        'ai_response': ai_cache.stats()
+    }
+    for name, stats in caches.items():
+        hits = stats.get('hits', stats.get('memory_hits', 0) + stats.get('db_hits', 0))
+        registry.set_counter('cache_hits_total', hits, {'cache': name})
+        registry.set_counter('cache_misses_total', stats['misses'], {'cache': name})
+
+metrics.register_collector(_collect)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    # Without a token the endpoint is only served in debug, never on a public deployment.
+    if not config.METRICS_ENABLED or not (config.METRICS_TOKEN or config.FLASK_DEBUG):
+        return jsonify({'error': 'Not found'}), 404
+
+    if config.METRICS_TOKEN:
+        expected = f'Bearer {config.METRICS_TOKEN}'
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), expected):
+            return jsonify({'error': 'Unauthorized'}), 401
+
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
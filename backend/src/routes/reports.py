@@ -0,0 +1,60 @@
+from flask import Blueprint, request, jsonify
+from ..services.rollup_service import rollup_service, parse_month, ROLLUP_DIMENSIONS, SUMMARY_GROUPS
+from ..utils.auth_utils import token_required, role_required
+
+reports_bp = Blueprint('reports', __name__)
+
+REPORT_ROLES = ('FINANCE_ADMIN', 'FPNA', 'PRINCIPAL_FINANCE', 'CFO', 'SUPER_ADMIN')
+
+def _parse_rollup_filters(args) -> dict:
+    filters = {}
+
+    if args.get('status'):
+        filters['status'] = [status.strip() for status in args['status'].split(',') if status.strip()]
+    for key in ('type', 'department_id', 'category'):
+        if args.get(key):
+            filters[key] = args[key]
+    for key, arg in (('month_from', 'from'), ('month_to', 'to')):
+        if args.get(arg):
+            filters[key] = parse_month(args[arg])
+
+    return filters
+
+@reports_bp.route('/reports/rollups', methods=['GET'])
+@token_required
+@role_required(*REPORT_ROLES)
+def get_rollups():
+    group_by = [name.strip() for name in request.args.get('group_by', 'department').split(',') if name.strip()]
+    unknown = [name for name in group_by if name not in ROLLUP_DIMENSIONS]
+    if unknown or len(set(group_by)) != len(group_by):
+        return jsonify({'error': f"group_by must be distinct values of: {', '.join(ROLLUP_DIMENSIONS)}"}), 400
+
+    try:
+        filters = _parse_rollup_filters(request.args)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid query parameter: {str(e)}'}), 400
+
+    rollups = rollup_service.get_rollups(group_by, filters)
+    if rollups is None:
+        return jsonify({'error': 'Failed to load rollups'}), 500
+
+    return jsonify(rollups), 200
+
+@reports_bp.route('/reports/rollups/summary', methods=['GET'])
+@token_required
+@role_required(*REPORT_ROLES)
+def get_rollup_summary():
+    group_by = request.args.get('group_by', 'department')
+    if group_by not in SUMMARY_GROUPS:
+        return jsonify({'error': f"group_by must be one of: {', '.join(SUMMARY_GROUPS)}"}), 400
+
+    try:
+        filters = _parse_rollup_filters(request.args)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid query parameter: {str(e)}'}), 400
+
+    summary = rollup_service.get_summary(group_by, filters)
+    if summary is None:
+        return jsonify({'error': 'Failed to load rollup summary'}), 500
+
+    return jsonify(summary), 200
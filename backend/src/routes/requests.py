@@ -1,17 +1,22 @@
-from flask import Blueprint, request, jsonify
-from ..services.request_service import request_service
+from flask import Blueprint, Response, request, jsonify
+from ..config.settings import config
+from ..services.request_service import request_service, REQUEST_EXPORT_COLUMNS
 from ..services.audit_service import audit_service
 from ..utils.auth_utils import token_required, role_required
-from ..utils.gemini_utils import extract_budget_from_excel, generate_rationalization_suggestions
-import openpyxl
-import pandas as pd
-import io
+from ..utils.db_utils import transactional
+from ..utils.http_cache import conditional
+from ..services.ai_service import ai_service
+from ..services.import_service import import_service, ImportRowLimitExceeded
+from ..utils.pagination import clamp_limit
+from ..utils.export_utils import EXPORT_FORMATS, export_chunks
+from datetime import datetime
 
 requests_bp = Blueprint('requests', __name__)
 
 @requests_bp.route('/requests', methods=['POST'])
 @token_required
 @role_required('REQUESTOR', 'SUPER_ADMIN')
+@transactional
 def create_request():
     data = request.get_json()
 
@@ -33,17 +38,90 @@ def create_request():
 
     return jsonify(budget_request), 201
 
+@requests_bp.route('/requests/bulk', methods=['POST'])
+@token_required
+@role_required('REQUESTOR', 'SUPER_ADMIN')
+def create_requests_bulk():
+    data = request.get_json() or {}
+    items = data.get('requests')
+
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'requests must be a non-empty list'}), 400
+
+    if len(items) > config.BULK_CREATE_MAX_ROWS:
+        return jsonify({'error': f'At most {config.BULK_CREATE_MAX_ROWS} requests per batch'}), 413
+
+    strict = bool(data.get('strict', False))
+    result = request_service.create_requests_bulk(request.user_id, items, strict=strict)
+
+    if 'error' in result:
+        return jsonify(result), 500
+
+    if not result['created']:
+        return jsonify({'error': 'No requests created', 'created': [], 'errors': result['errors']}), 400
+
+    return jsonify(result), 201
+
+def _parse_request_filters(args) -> dict:
+    filters = {}
+
+    if args.get('status'):
+        filters['status'] = [status.strip() for status in args['status'].split(',') if status.strip()]
+    for key in ('type', 'department_id', 'category'):
+        if args.get(key):
+            filters[key] = args[key]
+    for key in ('min_amount', 'max_amount'):
+        if args.get(key):
+            filters[key] = float(args[key])
+    for key, arg in (('created_from', 'from'), ('created_to', 'to')):
+        if args.get(arg):
+            filters[key] = datetime.fromisoformat(args[arg])
+
+    return filters
+
 @requests_bp.route('/requests', methods=['GET'])
 @token_required
+@conditional('budget_requests', 'users', 'departments')
 def get_requests():
-    if request.user_role == 'SUPER_ADMIN':
-        requests = request_service.get_all_requests()
-    elif request.user_role == 'REQUESTOR':
-        requests = request_service.get_requests_by_requester(request.user_id)
-    else:
-        requests = request_service.get_all_requests()
+    try:
+        filters = _parse_request_filters(request.args)
+        limit = clamp_limit(request.args.get('limit', type=int))
+        requester_id = request.user_id if request.user_role == 'REQUESTOR' else None
+
+        page = request_service.list_requests(
+            filters,
+            limit,
+            cursor=request.args.get('cursor'),
+            requester_id=requester_id
+        )
+    except ValueError as e:
+        return jsonify({'error': f'Invalid query parameter: {str(e)}'}), 400
+
+    response = jsonify(page['items'])
+    if page['next_cursor']:
+        response.headers['X-Next-Cursor'] = page['next_cursor']
+    return response, 200
+
+@requests_bp.route('/requests/export', methods=['GET'])
+@token_required
+def export_requests():
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unsupported export format. Use one of: {', '.join(EXPORT_FORMATS)}"}), 400
 
-    return jsonify(requests), 200
+    try:
+        filters = _parse_request_filters(request.args)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid query parameter: {str(e)}'}), 400
+
+    requester_id = request.user_id if request.user_role == 'REQUESTOR' else None
+    batches = request_service.stream_requests(filters, requester_id, config.EXPORT_BATCH_SIZE)
+
+    return Response(
+        export_chunks(batches, export_format, REQUEST_EXPORT_COLUMNS),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename=budget_requests.{export_format}'}
+    )
 
 @requests_bp.route('/requests/<request_id>', methods=['GET'])
 @token_required
@@ -58,6 +136,7 @@ def get_request(request_id):
 @requests_bp.route('/requests/<request_id>', methods=['PATCH'])
 @token_required
 @role_required('REQUESTOR', 'SUPER_ADMIN')
+@transactional
 def update_request(request_id):
     data = request.get_json()
 
@@ -82,6 +161,7 @@ def update_request(request_id):
 @requests_bp.route('/requests/<request_id>/submit', methods=['POST'])
 @token_required
 @role_required('REQUESTOR', 'SUPER_ADMIN')
+@transactional
 def submit_request(request_id):
     budget_request = request_service.get_request_by_id(request_id)
 
@@ -101,6 +181,7 @@ def submit_request(request_id):
 @requests_bp.route('/requests/<request_id>', methods=['DELETE'])
 @token_required
 @role_required('REQUESTOR', 'SUPER_ADMIN')
+@transactional
 def delete_request(request_id):
     budget_request = request_service.get_request_by_id(request_id)
 
@@ -126,21 +207,22 @@ def import_excel():
     if not file.filename.endswith(('.xlsx', '.xls')):
         return jsonify({'error': 'Invalid file format. Only Excel files are supported'}), 400
 
-    try:
-        file_content = file.read()
-        df = pd.read_excel(io.BytesIO(file_content))
-        file_data = df.to_dict(orient='records')
-
-        extracted_data = extract_budget_from_excel(file.filename, file_data)
-
-        if 'error' in extracted_data:
-            return jsonify(extracted_data), 500
-
-        return jsonify(extracted_data), 200
+    default_type = request.form.get('type')
+    if default_type and default_type not in ('CAPEX', 'OPEX'):
+        return jsonify({'error': 'Invalid type. Must be CAPEX or OPEX'}), 400
 
+    try:
+        result, job = import_service.import_workbook(file.stream, file.filename, request.user_id, default_type)
+    except ImportRowLimitExceeded as e:
+        return jsonify({'error': str(e)}), 413
     except Exception as e:
         return jsonify({'error': f'Failed to process Excel file: {str(e)}'}), 500
 
+    if job is None:
+        return jsonify(result), 200
+
+    return jsonify({'job_id': job['id'], 'status': job['status'], 'partial': result}), 202
+
 @requests_bp.route('/requests/<request_id>/suggestions', methods=['GET'])
 @token_required
 def get_rationalization_suggestions(request_id):
@@ -149,10 +231,13 @@ def get_rationalization_suggestions(request_id):
     if not budget_request:
         return jsonify({'error': 'Request not found'}), 404
 
-    suggestions = generate_rationalization_suggestions(
-        budget_request['justification'],
-        float(budget_request['amount']),
-        budget_request['category']
-    )
+    suggestions = ai_service.cached_suggestions(budget_request)
+    if suggestions is not None:
+        return jsonify({'suggestions': suggestions}), 200
+
+    job = ai_service.start_suggestions(request_id, request.user_id)
+
+    if not job:
+        return jsonify({'error': 'Failed to queue suggestions'}), 500
 
-    return jsonify({'suggestions': suggestions}), 200
+    return jsonify({'job_id': job['id'], 'status': job['status']}), 202
@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
 from ..services.user_service import user_service
 from ..services.audit_service import audit_service
-from ..utils.auth_utils import token_required, role_required
+from ..utils.auth_utils import (token_required, role_required, hash_password, PasswordWorkQueueFull,
+                                PasswordWorkTimeout, password_work_unavailable)
+from ..utils.db_utils import db_client, transactional
 
 users_bp = Blueprint('users', __name__)
 
@@ -16,27 +18,39 @@ def get_all_users():
 @token_required
 @role_required('SUPER_ADMIN')
 def create_user():
-    data = request.get_json()
+    data = request.get_json(silent=True)
 
     required_fields = ['name', 'email', 'password', 'role']
-    if not all(field in data for field in required_fields):
+    if not isinstance(data, dict) or not all(field in data for field in required_fields):
         return jsonify({'error': 'Missing required fields'}), 400
 
-    user = user_service.create_user(
-        name=data['name'],
-        email=data['email'],
-        password=data['password'],
-        role=data['role'],
-        department_id=data.get('department_id')
-    )
-
-    if not user:
-        return jsonify({'error': 'Failed to create user'}), 500
-
-    audit_service.log_action(request.user_id, 'USER_CREATED', {
-        'created_user_id': user['id'],
-        'role': data['role']
-    })
+    if not all(isinstance(data[field], str) for field in required_fields):
+        return jsonify({'error': f"{', '.join(required_fields)} must be strings"}), 400
+
+    # bcrypt takes ~0.25s; do not hold a pooled connection and transaction open for it.
+    try:
+        password_hash = hash_password(data['password'])
+    except (PasswordWorkQueueFull, PasswordWorkTimeout):
+        return password_work_unavailable()
+
+    with db_client.transaction():
+        user = user_service.create_user(
+            name=data['name'],
+            email=data['email'],
+            password=data['password'],
+            role=data['role'],
+            department_id=data.get('department_id'),
+            password_hash=password_hash
+        )
+
+        if not user:
+            return jsonify({'error': 'Failed to create user'}), 500
+
+        if not audit_service.log_action(request.user_id, 'USER_CREATED', {
+            'created_user_id': user['id'],
+            'role': data['role']
+        }, sync=True):
+            return jsonify({'error': 'Failed to create user'}), 500
 
     return jsonify(user), 201
 
@@ -55,52 +69,76 @@ def get_user(user_id):
 @token_required
 @role_required('SUPER_ADMIN')
 def update_user(user_id):
-    data = request.get_json()
+    data = request.get_json(silent=True)
 
-    user = user_service.update_user(user_id, data)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
 
-    if not user:
-        return jsonify({'error': 'Failed to update user'}), 500
+    password_hash = None
+    if 'password' in data:
+        if not isinstance(data['password'], str) or not data['password']:
+            return jsonify({'error': 'password must be a non-empty string'}), 400
+        try:
+            password_hash = hash_password(data['password'])
+        except (PasswordWorkQueueFull, PasswordWorkTimeout):
+            return password_work_unavailable()
+
+    changes = {key: value for key, value in data.items() if key != 'password'}
+    if password_hash:
+        changes['password'] = 'changed'
+
+    with db_client.transaction():
+        user = user_service.update_user(user_id, data, password_hash=password_hash)
+
+        if not user:
+            return jsonify({'error': 'Failed to update user'}), 500
 
-    audit_service.log_action(request.user_id, 'USER_UPDATED', {
-        'updated_user_id': user_id,
-        'changes': data
-    })
+        if not audit_service.log_action(request.user_id, 'USER_UPDATED', {
+            'updated_user_id': user_id,
+            'changes': changes
+        }, sync=True):
+            return jsonify({'error': 'Failed to update user'}), 500
 
     return jsonify(user), 200
 
 @users_bp.route('/admin/users/<user_id>/lock', methods=['PATCH'])
 @token_required
 @role_required('SUPER_ADMIN')
+@transactional
 def lock_user(user_id):
     user_service.lock_user(user_id)
 
-    audit_service.log_action(request.user_id, 'USER_LOCKED_BY_ADMIN', {
+    if not audit_service.log_action(request.user_id, 'USER_LOCKED_BY_ADMIN', {
         'locked_user_id': user_id
-    })
+    }, sync=True):
+        return jsonify({'error': 'Failed to lock user'}), 500
 
     return jsonify({'message': 'User locked successfully'}), 200
 
 @users_bp.route('/admin/users/<user_id>/unlock', methods=['PATCH'])
 @token_required
 @role_required('SUPER_ADMIN')
+@transactional
 def unlock_user(user_id):
     user_service.unlock_user(user_id)
 
-    audit_service.log_action(request.user_id, 'USER_UNLOCKED', {
+    if not audit_service.log_action(request.user_id, 'USER_UNLOCKED', {
         'unlocked_user_id': user_id
-    })
+    }, sync=True):
+        return jsonify({'error': 'Failed to unlock user'}), 500
 
     return jsonify({'message': 'User unlocked successfully'}), 200
 
 @users_bp.route('/admin/users/<user_id>', methods=['DELETE'])
 @token_required
 @role_required('SUPER_ADMIN')
+@transactional
 def delete_user(user_id):
     user_service.delete_user(user_id)
 
-    audit_service.log_action(request.user_id, 'USER_DELETED', {
+    if not audit_service.log_action(request.user_id, 'USER_DELETED', {
         'deleted_user_id': user_id
-    })
+    }, sync=True):
+        return jsonify({'error': 'Failed to delete user'}), 500
 
     return jsonify({'message': 'User deleted successfully'}), 200
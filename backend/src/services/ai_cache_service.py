@@ -0,0 +1,131 @@
+from ..utils.db_utils import db_client
+from ..utils.cache_utils import TTLCache
+from ..config.settings import config
+from typing import Any, Callable, Dict
+import hashlib
+import json
+import threading
+import time
+
+_MISSING = object()
+
+class AIResponseCache:
+    """Content-addressed cache for model responses.
+
+    The key is a hash of (function, prompt inputs, model), so changed inputs
+    never hit a stale answer. Lookups go to an in-process LRU first and then to
+    the ``ai_response_cache`` table, which is shared by every worker and
+    survives restarts. Entries carry an optional tag (``request:<id>``) so that
+    everything derived from one request can be dropped at once.
+    """
+
+    def __init__(self, enabled: bool, maxsize: int, ttl: float):
+        self.enabled = enabled
+        self.ttl = ttl
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._last_purge = time.monotonic()
+        self._counters = {
+            'memory_hits': 0,
+            'db_hits': 0,
+            'misses': 0,
+            'stores': 0
+        }
+
+    @staticmethod
+    def make_key(function: str, inputs: Dict, model: str) -> str:
+        material = json.dumps({'function': function, 'inputs': inputs, 'model': model},
+                              sort_keys=True, default=str)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(self, key: str) -> Any:
+        entry = self._memory.get(key, _MISSING)
+        if entry is not _MISSING:
+            self._count('memory_hits')
+            return entry[1]
+
+        row = db_client.execute_one(
+            "SELECT tag, response, EXTRACT(EPOCH FROM expires_at - NOW()) AS ttl "
+            "FROM ai_response_cache WHERE key = %s AND expires_at > NOW()",
+            (key,)
+        )
+        if row:
+            self._count('db_hits')
+            self._memory.set(key, (row['tag'], row['response']), ttl=min(self.ttl, float(row['ttl'])))
+            return row['response']
+
+        self._count('misses')
+        return _MISSING
+
+    def set(self, key: str, function: str, value: Any, tag: str = None) -> None:
+        self._memory.set(key, (tag, value))
+        db_client.execute_query("""
+        INSERT INTO ai_response_cache (key, function, tag, response, created_at, expires_at)
+        VALUES (%s, %s, %s, %s, NOW(), NOW() + make_interval(secs => %s))
+        ON CONFLICT (key) DO UPDATE SET response = EXCLUDED.response, tag = EXCLUDED.tag,
+            created_at = EXCLUDED.created_at, expires_at = EXCLUDED.expires_at
+        """, (key, function, tag, json.dumps(value, default=str), self.ttl), fetch=False)
+        self._count('stores')
+        self._maybe_purge()
+
+    def lookup(self, function: str, inputs: Dict, model: str) -> Any:
+        """Return the cached response, or ``None`` when there is none."""
+        if not self.enabled:
+            return None
+        value = self.get(self.make_key(function, inputs, model))
+        return None if value is _MISSING else value
+
+    def get_or_compute(self, function: str, inputs: Dict, model: str, compute: Callable[[], Any],
+                       tag: str = None) -> Any:
+        """Return the cached response or call ``compute`` and store its result.
+
+        Exceptions from ``compute`` propagate and nothing is cached.
+        """
+        if not self.enabled:
+            return compute()
+
+        key = self.make_key(function, inputs, model)
+        value = self.get(key)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, function, value, tag)
+        return value
+
+    def invalidate_tag(self, tag: str) -> None:
+        """Drop every entry with ``tag``; joins the caller's transaction."""
+        if not self.enabled:
+            return
+        db_client.execute_query("DELETE FROM ai_response_cache WHERE tag = %s", (tag,), fetch=False)
+        self._memory.delete_where(lambda key, entry: entry[0] == tag)
+
+    def purge_expired(self) -> None:
+        db_client.execute_query("DELETE FROM ai_response_cache WHERE expires_at <= NOW()", fetch=False)
+
+    def _maybe_purge(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_purge < min(self.ttl, 3600):
+                return
+            self._last_purge = now
+        self.purge_expired()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters['memory_hits'] + counters['db_hits'] + counters['misses']
+        hits = counters['memory_hits'] + counters['db_hits']
+        return {
+            'enabled': self.enabled,
+            **counters,
+            'memory_size': len(self._memory),
+            'hit_ratio': round(hits / lookups, 4) if lookups else 0.0
+        }
+
+def request_tag(request_id: str) -> str:
+    return f'request:{request_id}'
+
+ai_cache = AIResponseCache(config.AI_CACHE_ENABLED, config.AI_CACHE_SIZE, config.AI_CACHE_TTL)
@@ -0,0 +1,62 @@
+from ..services.ai_cache_service import ai_cache, request_tag
+from ..services.job_service import job_service
+from ..services.request_service import request_service
+from ..utils.gemini_utils import (
+    MODEL_ID, SUGGESTIONS_FUNCTION, request_budget_extraction, request_rationalization_suggestions
+)
+from typing import Dict, List, Optional
+
+SUGGESTIONS_JOB = 'rationalization_suggestions'
+EXTRACTION_FUNCTION = 'budget_extraction'
+
+def _suggestion_inputs(budget_request: Dict) -> Dict:
+    return {
+        'justification': budget_request['justification'],
+        'amount': float(budget_request['amount']),
+        'category': budget_request['category']
+    }
+
+class AIService:
+    @staticmethod
+    def cached_suggestions(budget_request: Dict) -> Optional[List[str]]:
+        return ai_cache.lookup(SUGGESTIONS_FUNCTION, _suggestion_inputs(budget_request), MODEL_ID)
+
+    @staticmethod
+    def start_suggestions(request_id: str, user_id: str) -> Optional[Dict]:
+        active = job_service.find_active_job(SUGGESTIONS_JOB, 'request_id', request_id)
+        if active:
+            return active
+        return job_service.enqueue(SUGGESTIONS_JOB, {'request_id': request_id}, user_id)
+
+    @staticmethod
+    def extract_budget_items(filename: str, rows: List[Dict], chunk_size: int) -> List[Dict]:
+        """Extract items from rows the column mapper could not handle, ``chunk_size`` rows per prompt.
+
+        Each chunk's response is cached, so a retried job only re-prompts the
+        chunks that did not complete.
+        """
+        items = []
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            extracted = ai_cache.get_or_compute(EXTRACTION_FUNCTION, {'rows': chunk}, MODEL_ID,
+                                                lambda: request_budget_extraction(filename, chunk))
+            items.extend(extracted.get('items') or [])
+        return items
+
+    @staticmethod
+    def run_suggestions(payload: Dict) -> Dict:
+        budget_request = request_service.get_request_by_id(payload['request_id'])
+        if not budget_request:
+            raise ValueError('Request not found')
+
+        inputs = _suggestion_inputs(budget_request)
+        suggestions = ai_cache.get_or_compute(
+            SUGGESTIONS_FUNCTION, inputs, MODEL_ID,
+            lambda: request_rationalization_suggestions(inputs['justification'], inputs['amount'], inputs['category']),
+            tag=request_tag(payload['request_id'])
+        )
+        return {'request_id': payload['request_id'], 'suggestions': suggestions}
+
+job_service.register(SUGGESTIONS_JOB, AIService.run_suggestions)
+
+ai_service = AIService()
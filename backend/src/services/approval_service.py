@@ -1,30 +1,20 @@
-from ..utils.db_utils import db_client
+from ..utils.db_utils import db_client, read_only
 from ..services.audit_service import audit_service
+from ..services.stats_service import stats_service
+from ..services.hierarchy_service import hierarchy_service
 from typing import List, Dict, Optional
 import uuid
 import json
 
-APPROVAL_HIERARCHY = [
-    'TECH_LEAD',
-    'DEPT_HEAD',
-    'FINANCE_ADMIN',
-    'FPNA',
-    'PRINCIPAL_FINANCE',
-    'CFO'
-]
+BATCH_DECISIONS = ('APPROVED', 'REJECTED', 'REWORK')
 
 class ApprovalService:
     @staticmethod
     def get_next_approver_role(current_role: str) -> Optional[str]:
-        try:
-            current_index = APPROVAL_HIERARCHY.index(current_role)
-            if current_index < len(APPROVAL_HIERARCHY) - 1:
-                return APPROVAL_HIERARCHY[current_index + 1]
-            return None
-        except ValueError:
-            return APPROVAL_HIERARCHY[0] if APPROVAL_HIERARCHY else None
+        return hierarchy_service.next_role(current_role)
 
     @staticmethod
+    @read_only
     def get_request_timeline(request_id: str) -> List[Dict]:
         query = """
         SELECT ar.*, u.name as approver_name, u.email as approver_email
@@ -36,124 +26,218 @@ class ApprovalService:
         return db_client.execute_query(query, (request_id,)) or []
 
     @staticmethod
-    def create_approval_record(request_id: str, approver_id: str, role: str,
-                              decision: str, comments: str = None) -> Optional[Dict]:
-        record_id = str(uuid.uuid4())
-
-        query = """
-        INSERT INTO approval_records (id, request_id, approver_id, role, decision, comments, timestamp)
-        VALUES (%s, %s, %s, %s, %s, %s, NOW())
-        RETURNING id, request_id, approver_id, role, decision, comments, timestamp
+    def transition(request_id: str, approver_id: str, role: str, decision: str,
+                   comments: str = None, expected_version: int = None) -> Dict:
+        """Apply one decision with a single conditional statement.
+
+        The status change only matches a PENDING request at the approver's
+        stage (any stage for SUPER_ADMIN) and, if given, at
+        ``expected_version``; the approval record is inserted from the
+        updated row in the same statement. When nothing matched, the request
+        is read once to report why: ``reason`` is ``not_found``,
+        ``not_pending`` or ``conflict``.
         """
+        conditions = ["id = %s", "status = 'PENDING'"]
+        params = []
+        if decision == 'APPROVED':
+            # Next stage computed in SQL from the hierarchy; a stage missing from
+            # the hierarchy restarts at the first role, as in next_role().
+            roles = hierarchy_service.roles()
+            next_stage = "(%s::text[])[COALESCE(array_position(%s::text[], current_stage), 0) + 1]"
+            set_clause = f"""current_stage = {next_stage},
+                status = CASE WHEN {next_stage} IS NULL THEN 'FINAL_APPROVED' ELSE 'PENDING' END"""
+            params.extend([roles, roles, roles, roles])
+        else:
+            set_clause = "current_stage = NULL, status = %s"
+            params.append(decision)
+        params.append(request_id)
+
+        if role != 'SUPER_ADMIN':
+            conditions.append("current_stage = %s")
+            params.append(role)
+        if expected_version is not None:
+            conditions.append("version = %s")
+            params.append(expected_version)
+
+        query = f"""
+        WITH transitioned AS (
+            UPDATE budget_requests
+            SET {set_clause}, version = version + 1, updated_at = NOW()
+            WHERE {' AND '.join(conditions)}
+            RETURNING id, status, current_stage, version
+        ), recorded AS (
+            INSERT INTO approval_records (id, request_id, approver_id, role, decision, comments, timestamp)
+            SELECT %s, id, %s, %s, %s, %s, NOW() FROM transitioned
+            RETURNING id
+        )
+        SELECT t.status, t.current_stage, t.version, r.id AS record_id
+        FROM transitioned t CROSS JOIN recorded r
+        """
+        params.extend([str(uuid.uuid4()), approver_id, role, decision, comments])
+
+        with db_client.transaction() as tx:
+            result = db_client.execute_one(query, tuple(params))
+
+            if result is None:
+                if tx.failed:
+                    return {'error': 'Failed to create approval record'}
+                current = db_client.execute_one(
+                    "SELECT status, current_stage, version FROM budget_requests WHERE id = %s", (request_id,)
+                )
+                if not current:
+                    return {'error': 'Request not found', 'reason': 'not_found'}
+                if expected_version is not None and current['version'] != expected_version:
+                    return {'error': 'Request was modified by someone else', 'reason': 'conflict',
+                            'version': current['version']}
+                if current['status'] != 'PENDING':
+                    return {'error': 'Request is not in pending status', 'reason': 'not_pending'}
+                return {'error': 'Request is not at your approval stage', 'reason': 'conflict',
+                        'version': current['version']}
 
-        result = db_client.execute_one(query, (record_id, request_id, approver_id, role, decision, comments))
-
-        if result:
             audit_service.log_action(approver_id, 'APPROVAL_ACTION', {
                 'request_id': request_id,
                 'decision': decision,
                 'role': role
-            })
+            }, sync=True)
+            if tx.failed:
+                return {'error': 'Failed to create approval record'}
+            stats_service.invalidate()
 
         return result
 
     @staticmethod
-    def approve_request(request_id: str, approver_id: str, role: str, comments: str = None) -> Dict:
-        approval_record = ApprovalService.create_approval_record(
-            request_id, approver_id, role, 'APPROVED', comments
-        )
-
-        if not approval_record:
-            return {'error': 'Failed to create approval record'}
+    def approve_request(request_id: str, approver_id: str, role: str, comments: str = None,
+                        expected_version: int = None) -> Dict:
+        result = ApprovalService.transition(request_id, approver_id, role, 'APPROVED', comments, expected_version)
+        if 'error' in result:
+            return result
 
-        next_role = ApprovalService.get_next_approver_role(role)
-
-        if next_role:
-            query = "UPDATE budget_requests SET status = 'PENDING', updated_at = NOW() WHERE id = %s"
-            db_client.execute_query(query, (request_id,), fetch=False)
+        if result['status'] == 'PENDING':
             return {
                 'message': 'Request approved and forwarded to next approver',
-                'next_role': next_role,
-                'status': 'PENDING'
-            }
-        else:
-            query = "UPDATE budget_requests SET status = 'FINAL_APPROVED', updated_at = NOW() WHERE id = %s"
-            db_client.execute_query(query, (request_id,), fetch=False)
-            return {
-                'message': 'Request has been fully approved',
-                'status': 'FINAL_APPROVED'
+                'next_role': result['current_stage'],
+                'status': 'PENDING',
+                'version': result['version']
             }
+        return {
+            'message': 'Request has been fully approved',
+            'status': 'FINAL_APPROVED',
+            'version': result['version']
+        }
 
     @staticmethod
-    def reject_request(request_id: str, approver_id: str, role: str, comments: str) -> Dict:
-        approval_record = ApprovalService.create_approval_record(
-            request_id, approver_id, role, 'REJECTED', comments
-        )
-
-        if not approval_record:
-            return {'error': 'Failed to create approval record'}
-
-        query = "UPDATE budget_requests SET status = 'REJECTED', updated_at = NOW() WHERE id = %s"
-        db_client.execute_query(query, (request_id,), fetch=False)
+    def reject_request(request_id: str, approver_id: str, role: str, comments: str,
+                       expected_version: int = None) -> Dict:
+        result = ApprovalService.transition(request_id, approver_id, role, 'REJECTED', comments, expected_version)
+        if 'error' in result:
+            return result
 
-        return {'message': 'Request has been rejected', 'status': 'REJECTED'}
+        return {'message': 'Request has been rejected', 'status': 'REJECTED', 'version': result['version']}
 
     @staticmethod
-    def rework_request(request_id: str, approver_id: str, role: str, comments: str) -> Dict:
-        approval_record = ApprovalService.create_approval_record(
-            request_id, approver_id, role, 'REWORK', comments
-        )
-
-        if not approval_record:
-            return {'error': 'Failed to create approval record'}
+    def rework_request(request_id: str, approver_id: str, role: str, comments: str,
+                       expected_version: int = None) -> Dict:
+        result = ApprovalService.transition(request_id, approver_id, role, 'REWORK', comments, expected_version)
+        if 'error' in result:
+            return result
 
-        query = "UPDATE budget_requests SET status = 'REWORK', updated_at = NOW() WHERE id = %s"
-        db_client.execute_query(query, (request_id,), fetch=False)
-
-        return {'message': 'Request sent back for rework', 'status': 'REWORK'}
+        return {'message': 'Request sent back for rework', 'status': 'REWORK', 'version': result['version']}
 
     @staticmethod
-    def get_pending_approvals_for_user(user_id: str, role: str) -> List[Dict]:
-        timeline_query = """
-        SELECT DISTINCT ar.request_id, ar.role
-        FROM approval_records ar
-        WHERE ar.request_id IN (
-            SELECT id FROM budget_requests WHERE status = 'PENDING'
-        )
-        ORDER BY ar.timestamp DESC
+    def decide_batch(items: List[Dict], approver_id: str, role: str) -> Dict:
+        """Apply many approve/reject/rework decisions in one transaction.
+
+        The requests are locked and validated with one ``FOR UPDATE`` query;
+        approval records and status changes are then written set-based.
+        Returns one outcome per item, in input order; items that fail
+        validation are reported and skipped. SUPER_ADMIN may act on any
+        pending request and advances it from its current stage.
         """
+        request_ids = list({item['request_id'] for item in items})
+        outcomes = []
+        records = []
+        updates = []
+
+        with db_client.transaction() as tx:
+            rows = db_client.execute_query(
+                "SELECT id, status, current_stage FROM budget_requests WHERE id = ANY(%s) ORDER BY id FOR UPDATE",
+                (request_ids,)
+            )
+            if rows is None:
+                return {'error': 'Failed to load requests'}
+            state = {row['id']: row for row in rows}
+
+            seen = set()
+            for item in items:
+                request_id = item['request_id']
+                current = state.get(request_id)
+                error = None
+                if request_id in seen:
+                    error = 'Duplicate request in batch'
+                elif current is None:
+                    error = 'Request not found'
+                elif current['status'] != 'PENDING':
+                    error = 'Request is not in pending status'
+                elif role != 'SUPER_ADMIN' and current['current_stage'] != role:
+                    error = 'Request is not at your approval stage'
+                seen.add(request_id)
+
+                if error:
+                    outcomes.append({'request_id': request_id, 'error': error})
+                    continue
+
+                decision = item['decision']
+                if decision == 'APPROVED':
+                    next_role = ApprovalService.get_next_approver_role(current['current_stage'] or role)
+                    status = 'PENDING' if next_role else 'FINAL_APPROVED'
+                else:
+                    next_role = None
+                    status = decision
+
+                records.append((str(uuid.uuid4()), request_id, approver_id, role, decision, item.get('comments')))
+                updates.append((request_id, status, next_role))
+                outcome = {'request_id': request_id, 'decision': decision, 'status': status}
+                if next_role:
+                    outcome['next_role'] = next_role
+                outcomes.append(outcome)
+
+            if not records:
+                return {'results': outcomes, 'applied': 0, 'failed': len(outcomes)}
+
+            db_client.execute_values("""
+            INSERT INTO approval_records (id, request_id, approver_id, role, decision, comments, timestamp)
+            VALUES %s
+            """, records, template="(%s, %s, %s, %s, %s, %s, NOW())", page_size=len(records), fetch=False)
+            db_client.execute_values("""
+            UPDATE budget_requests AS br
+            SET status = v.status, current_stage = v.current_stage, version = br.version + 1, updated_at = NOW()
+            FROM (VALUES %s) AS v(id, status, current_stage)
+            WHERE br.id = v.id
+            """, updates, template="(%s, %s, %s::text)", page_size=len(updates), fetch=False)
+            audit_service.log_actions(approver_id, 'APPROVAL_ACTION', [
+                {'request_id': record[1], 'decision': record[4], 'role': role} for record in records
+            ])
+            if tx.failed:
+                return {'error': 'Failed to apply approval decisions'}
+
+            stats_service.invalidate()
+
+        return {'results': outcomes, 'applied': len(records), 'failed': len(outcomes) - len(records)}
 
-        approved_requests_by_role = {}
-        timeline = db_client.execute_query(timeline_query) or []
-
-        for record in timeline:
-            request_id = record['request_id']
-            if request_id not in approved_requests_by_role:
-                approved_requests_by_role[request_id] = record['role']
+    @staticmethod
+    def get_first_approver_role() -> Optional[str]:
+        return hierarchy_service.first_role()
 
-        pending_requests = []
-        requests_query = """
+    @staticmethod
+    def get_pending_approvals_for_user(user_id: str, role: str) -> List[Dict]:
+        query = """
         SELECT br.*, u.name as requester_name, d.name as department_name
         FROM budget_requests br
         JOIN users u ON br.requester_id = u.id
         JOIN departments d ON br.department_id = d.id
-        WHERE br.status = 'PENDING'
+        WHERE br.status = 'PENDING' AND br.current_stage = %s
         ORDER BY br.created_at ASC
         """
-
-        all_pending = db_client.execute_query(requests_query) or []
-
-        for request in all_pending:
-            request_id = request['id']
-            last_approved_role = approved_requests_by_role.get(request_id)
-
-            if last_approved_role:
-                next_role = ApprovalService.get_next_approver_role(last_approved_role)
-                if next_role == role:
-                    pending_requests.append(request)
-            elif role == APPROVAL_HIERARCHY[0]:
-                pending_requests.append(request)
-
-        return pending_requests
+        return db_client.execute_query(query, (role,)) or []
 
 approval_service = ApprovalService()
@@ -0,0 +1,144 @@
+from ..utils.db_utils import db_client
+from ..config.settings import config
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+from psycopg2 import sql
+import gzip
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME = re.compile(r'^audit_logs_p(\d{4})(\d{2})$')
+
+ARCHIVE_QUERY = "COPY (SELECT id, user_id, action, metadata, timestamp FROM {} ORDER BY timestamp, id) TO STDOUT WITH (FORMAT csv, HEADER)"
+
+def _months_before(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+def _partition_month(name: str) -> Optional[date]:
+    match = PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+class AuditPartitionService:
+    """Monthly partitions of ``audit_logs``: creation ahead of time and the retention policy.
+
+    Partitions are created by the ``audit_logs_ensure_partitions`` SQL function
+    (see the migration). Retention exports each expired month to
+    ``<archive_dir>/audit_logs_pYYYYMM.csv.gz`` and then detaches and drops it,
+    in one transaction, so a month is never dropped without its archive.
+    """
+
+    @staticmethod
+    def ensure_partitions(months_ahead: int = None) -> Optional[List[str]]:
+        """Create missing partitions through ``months_ahead`` months from now; returns the new names."""
+        if months_ahead is None:
+            months_ahead = config.AUDIT_PARTITION_MONTHS_AHEAD
+        rows = db_client.execute_query("SELECT audit_logs_ensure_partitions(%s) AS name", (months_ahead,))
+        if rows is None:
+            return None
+        created = [row['name'] for row in rows]
+        if created:
+            logger.info("Created audit log partitions: %s", ', '.join(created))
+        return created
+
+    @staticmethod
+    def list_partitions() -> Optional[List[Dict]]:
+        query = """
+        SELECT c.relname AS name, c.reltuples::bigint AS estimated_rows,
+               pg_total_relation_size(c.oid) AS bytes
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'audit_logs'::regclass
+        ORDER BY c.relname
+        """
+        rows = db_client.execute_query(query)
+        if rows is None:
+            return None
+        for row in rows:
+            month = _partition_month(row['name'])
+            row['month'] = month.strftime('%Y-%m') if month else None
+        return rows
+
+    @staticmethod
+    def archive_partition(name: str, archive_dir: str) -> Dict:
+        """Export one partition to a gzipped CSV, then detach and drop it."""
+        if _partition_month(name) is None:
+            return {'error': f'{name} is not a monthly audit_logs partition'}
+
+        os.makedirs(archive_dir, exist_ok=True)
+        path = os.path.join(archive_dir, f'{name}.csv.gz')
+        partial = f'{path}.partial'
+        table = sql.Identifier(name)
+        try:
+            with db_client.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    # Only writes to this month wait while it is exported.
+                    cursor.execute(sql.SQL("LOCK TABLE {} IN SHARE MODE").format(table))
+                    cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(table))
+                    rows = cursor.fetchone()[0]
+                    with gzip.open(partial, 'wb') as handle:
+                        cursor.copy_expert(sql.SQL(ARCHIVE_QUERY).format(table).as_string(conn), handle)
+                    with open(partial, 'rb') as handle:
+                        os.fsync(handle.fileno())
+                    os.replace(partial, path)
+
+                    # Detaching locks the whole table; give up rather than queue
+                    # every audit write behind a long-running reader.
+                    cursor.execute("SET LOCAL lock_timeout = '5s'")
+                    cursor.execute(sql.SQL("ALTER TABLE audit_logs DETACH PARTITION {}").format(table))
+                    cursor.execute(sql.SQL("DROP TABLE {}").format(table))
+        except Exception as e:
+            logger.error("Failed to archive audit log partition %s: %s", name, e)
+            if os.path.exists(partial):
+                os.remove(partial)
+            return {'error': f'Failed to archive {name}: {e}'}
+
+        logger.info("Archived audit log partition %s (%s rows) to %s", name, rows, path)
+        return {'partition': name, 'rows': rows, 'file': path, 'bytes': os.path.getsize(path)}
+
+    @staticmethod
+    def expired_partitions(retention_months: int, today: date = None) -> Optional[List[str]]:
+        """Monthly partitions that ended more than ``retention_months`` full months ago."""
+        today = today or datetime.now(timezone.utc).date()
+        cutoff = _months_before(today.replace(day=1), retention_months)
+        partitions = AuditPartitionService.list_partitions()
+        if partitions is None:
+            return None
+        return [row['name'] for row in partitions
+                if _partition_month(row['name']) is not None and _partition_month(row['name']) < cutoff]
+
+    @staticmethod
+    def maintain(months_ahead: int = None, retention_months: int = None, archive_dir: str = None,
+                 dry_run: bool = False) -> Dict:
+        """Create upcoming partitions and apply the retention policy (``retention_months`` 0 keeps everything)."""
+        if retention_months is None:
+            retention_months = config.AUDIT_RETENTION_MONTHS
+        archive_dir = archive_dir or config.AUDIT_ARCHIVE_DIR
+
+        created = [] if dry_run else AuditPartitionService.ensure_partitions(months_ahead)
+        if created is None:
+            return {'error': 'Failed to create audit log partitions'}
+
+        result = {'created': created, 'expired': [], 'archived': [], 'errors': []}
+        if retention_months <= 0:
+            return result
+
+        expired = AuditPartitionService.expired_partitions(retention_months)
+        if expired is None:
+            return {'error': 'Failed to list audit log partitions'}
+        result['expired'] = expired
+        if dry_run:
+            return result
+
+        for name in expired:
+            archived = AuditPartitionService.archive_partition(name, archive_dir)
+            if 'error' in archived:
+                result['errors'].append(archived['error'])
+            else:
+                result['archived'].append(archived)
+        return result
+
+audit_partition_service = AuditPartitionService()
@@ -1,55 +1,282 @@
-from ..utils.db_utils import db_client
-from typing import Dict, List, Optional
+from ..utils.db_utils import db_client, read_only
+from ..config.settings import config
+from ..utils.pagination import encode_cursor, decode_cursor
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+import atexit
+import logging
+import os
+import queue
+import threading
 import uuid
 import json
+import psycopg2.extras
+
+logger = logging.getLogger(__name__)
+
+AUDIT_EXPORT_COLUMNS = ['id', 'user_id', 'user_name', 'user_email', 'action', 'metadata', 'timestamp']
+
+class AuditWriter:
+    """Buffers audit rows in a bounded queue and writes them in multi-row INSERTs.
+
+    A daemon thread flushes whenever ``batch_size`` rows are waiting or
+    ``flush_interval`` seconds have passed. When the queue is full, or the
+    writer has been shut down, ``submit`` refuses the row and the caller
+    writes it synchronously instead of dropping it.
+    """
+
+    def __init__(self, queue_size: int, batch_size: int, flush_interval: float):
+        self.queue_size = queue_size
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+        # Created per process: a lock held by another thread at fork time stays held in the child.
+        self._counters_lock = threading.Lock()
+        self._counters = {'enqueued': 0, 'written': 0, 'failed': 0, 'overflow': 0, 'after_shutdown': 0,
+                          'flushes': 0}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._counters_lock:
+            self._counters[name] += amount
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: the parent's queue and thread are not ours.
+                self._reset()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, entry: tuple) -> bool:
+        """Queue ``entry``; ``False`` if it was refused and must be written by the caller."""
+        if self._stopping and self._pid == os.getpid():
+            # Nothing would flush it any more.
+            self._count('after_shutdown')
+            return False
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._count('overflow')
+            return False
+
+        self._count('enqueued')
+        if self._stopping:
+            # shutdown() started after the check above; its final flush may be done.
+            self.flush()
+            return True
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _drain(self) -> List[tuple]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def write(self, batch: List[tuple]) -> None:
+        query = "INSERT INTO audit_logs (id, user_id, action, metadata, timestamp) VALUES %s"
+        try:
+            with db_client.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    psycopg2.extras.execute_values(cursor, query, batch, page_size=self.batch_size)
+            self._count('written', len(batch))
+            return
+        except Exception as e:
+            logger.error("Audit batch write error: %s", e)
+
+        # Retry row by row so one bad row (e.g. a deleted user) does not lose the batch.
+        for entry in batch:
+            try:
+                with db_client.get_connection() as conn:
+                    with conn.cursor() as cursor:
+                        psycopg2.extras.execute_values(cursor, query, [entry])
+                self._count('written')
+            except Exception as e:
+                self._count('failed')
+                logger.error("Audit log write error: %s", e)
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            while True:
+                batch = self._drain()
+                if not batch:
+                    return
+                self._count('flushes')
+                self.write(batch)
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        if self._pid != os.getpid():
+            return
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> Dict:
+        with self._counters_lock:
+            counters = dict(self._counters)
+        return {
+            'queue_depth': self._queue.qsize(),
+            'queue_size': self.queue_size,
+            **counters
+        }
+
+audit_writer = AuditWriter(config.AUDIT_QUEUE_SIZE, config.AUDIT_BATCH_SIZE, config.AUDIT_FLUSH_INTERVAL)
+atexit.register(audit_writer.shutdown)
 
 class AuditService:
     @staticmethod
-    def log_action(user_id: str, action: str, metadata: Dict = None) -> Optional[Dict]:
-        audit_id = str(uuid.uuid4())
+    def log_action(user_id: str, action: str, metadata: Dict = None, sync: bool = False) -> Optional[Dict]:
+        """Record an audit entry.
 
-        query = """
-        INSERT INTO audit_logs (id, user_id, action, metadata, timestamp)
-        VALUES (%s, %s, %s, %s, NOW())
-        RETURNING id, user_id, action, metadata, timestamp
+        By default the row is queued for the background writer; inside a
+        ``db_client.transaction()`` it is queued only once that transaction
+        commits. Pass ``sync=True`` (or set ``AUDIT_ASYNC=False``) when the
+        entry must be durable before the caller responds.
         """
-
+        audit_id = str(uuid.uuid4())
         metadata_json = json.dumps(metadata) if metadata else None
-        return db_client.execute_one(query, (audit_id, user_id, action, metadata_json))
+
+        if sync or not config.AUDIT_ASYNC:
+            query = """
+            INSERT INTO audit_logs (id, user_id, action, metadata, timestamp)
+            VALUES (%s, %s, %s, %s, NOW())
+            RETURNING id, user_id, action, metadata, timestamp
+            """
+            return db_client.execute_one(query, (audit_id, user_id, action, metadata_json))
+
+        timestamp = datetime.now(timezone.utc)
+        entry = (audit_id, user_id, action, metadata_json, timestamp)
+
+        def enqueue():
+            if not audit_writer.submit(entry):
+                audit_writer.write([entry])
+
+        tx = db_client.current_transaction
+        if tx is not None:
+            tx.after_commit(enqueue)
+        else:
+            enqueue()
+
+        return {
+            'id': audit_id,
+            'user_id': user_id,
+            'action': action,
+            'metadata': metadata,
+            'timestamp': timestamp
+        }
 
     @staticmethod
-    def get_user_logs(user_id: str, limit: int = 100) -> List[Dict]:
-        query = """
-        SELECT al.*, u.name as user_name, u.email as user_email
-        FROM audit_logs al
-        JOIN users u ON al.user_id = u.id
-        WHERE al.user_id = %s
-        ORDER BY al.timestamp DESC
-        LIMIT %s
+    def log_actions(user_id: str, action: str, metadata_list: List[Dict]) -> bool:
+        """Record one ``action`` entry per metadata dict with a single synchronous INSERT.
+
+        Joins the caller's transaction, so the entries commit or roll back
+        with the change they describe.
         """
-        return db_client.execute_query(query, (user_id, limit)) or []
+        if not metadata_list:
+            return True
+        rows = [(str(uuid.uuid4()), user_id, action, json.dumps(metadata) if metadata else None)
+                for metadata in metadata_list]
+        result = db_client.execute_values(
+            "INSERT INTO audit_logs (id, user_id, action, metadata, timestamp) VALUES %s RETURNING id",
+            rows, template="(%s, %s, %s, %s, NOW())", page_size=len(rows)
+        )
+        return result is not None
+
+    @staticmethod
+    def _filter_conditions(filters: Dict) -> Tuple[List[str], List]:
+        conditions = []
+        params = []
+
+        if filters.get('user_id'):
+            conditions.append("al.user_id = %s")
+            params.append(filters['user_id'])
+        if filters.get('action'):
+            conditions.append("al.action = ANY(%s)")
+            params.append(list(filters['action']))
+        if filters.get('start'):
+            conditions.append("al.timestamp >= %s")
+            params.append(filters['start'])
+        if filters.get('end'):
+            conditions.append("al.timestamp < %s")
+            params.append(filters['end'])
+        if filters.get('metadata'):
+            # Containment, so the GIN index on metadata answers it.
+            conditions.append("al.metadata @> %s::jsonb")
+            params.append(json.dumps(filters['metadata']))
+
+        return conditions, params
 
     @staticmethod
-    def get_all_logs(limit: int = 100) -> List[Dict]:
-        query = """
+    @read_only
+    def list_logs(filters: Dict, limit: int, cursor: str = None) -> Dict:
+        """One page of audit logs, newest first; pass the returned ``next_cursor`` for the next page."""
+        conditions, params = AuditService._filter_conditions(filters)
+
+        if cursor:
+            cursor_timestamp, cursor_id = decode_cursor(cursor)
+            conditions.append("(al.timestamp, al.id) < (%s, %s)")
+            params.extend([cursor_timestamp, cursor_id])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit + 1)
+
+        query = f"""
         SELECT al.*, u.name as user_name, u.email as user_email
         FROM audit_logs al
         JOIN users u ON al.user_id = u.id
-        ORDER BY al.timestamp DESC
+        {where}
+        ORDER BY al.timestamp DESC, al.id DESC
         LIMIT %s
         """
-        return db_client.execute_query(query, (limit,)) or []
+        rows = db_client.execute_query(query, tuple(params)) or []
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]['timestamp'], rows[-1]['id'])
+
+        return {'items': rows, 'next_cursor': next_cursor}
 
     @staticmethod
-    def get_logs_by_action(action: str, limit: int = 100) -> List[Dict]:
-        query = """
-        SELECT al.*, u.name as user_name, u.email as user_email
+    @read_only
+    def stream_logs(filters: Dict, batch_size: int = 1000) -> Iterator[List[Dict]]:
+        conditions, params = AuditService._filter_conditions(filters)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        query = f"""
+        SELECT al.id, al.user_id, u.name as user_name, u.email as user_email,
+               al.action, al.metadata, al.timestamp
         FROM audit_logs al
         JOIN users u ON al.user_id = u.id
-        WHERE al.action = %s
-        ORDER BY al.timestamp DESC
-        LIMIT %s
+        {where}
+        ORDER BY al.timestamp ASC, al.id ASC
         """
-        return db_client.execute_query(query, (action, limit)) or []
+        return db_client.stream_query(query, tuple(params), batch_size)
 
 audit_service = AuditService()
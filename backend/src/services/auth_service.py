@@ -1,5 +1,5 @@
 from ..utils.db_utils import db_client
-from ..utils.auth_utils import verify_password, generate_token
+from ..utils.auth_utils import verify_password, generate_token, hash_password, password_needs_rehash
 from ..services.user_service import user_service
 from ..services.audit_service import audit_service
 from ..config.settings import config
@@ -17,24 +17,31 @@ class AuthService:
             return {'error': 'Account is locked. Please contact administrator.'}
 
         if not verify_password(password, user['password_hash']):
-            failed_attempts = user_service.increment_failed_attempts(user['id'])
+            with db_client.transaction():
+                failed_attempts = user_service.increment_failed_attempts(user['id'])
 
-            if failed_attempts >= config.MAX_LOGIN_ATTEMPTS:
-                user_service.lock_user(user['id'])
-                audit_service.log_action(
-                    user['id'],
-                    'USER_LOCKED',
-                    {'reason': 'Max failed login attempts exceeded'}
-                )
-                return {'error': f'Account locked after {config.MAX_LOGIN_ATTEMPTS} failed attempts'}
+                if failed_attempts >= config.MAX_LOGIN_ATTEMPTS:
+                    user_service.lock_user(user['id'])
+                    audit_service.log_action(
+                        user['id'],
+                        'USER_LOCKED',
+                        {'reason': 'Max failed login attempts exceeded'},
+                        sync=True
+                    )
+                    return {'error': f'Account locked after {config.MAX_LOGIN_ATTEMPTS} failed attempts'}
 
             return {'error': f'Invalid credentials. {config.MAX_LOGIN_ATTEMPTS - failed_attempts} attempts remaining.'}
 
-        user_service.reset_failed_attempts(user['id'])
-
         token = generate_token(user['id'], user['role'])
 
-        audit_service.log_action(user['id'], 'LOGIN', {'email': email})
+        # Upgrade hashes made with an older BCRYPT_ROUNDS while we have the plaintext.
+        new_hash = hash_password(password) if password_needs_rehash(user['password_hash']) else None
+
+        with db_client.transaction():
+            user_service.reset_failed_attempts(user['id'])
+            if new_hash:
+                user_service.set_password_hash(user['id'], new_hash)
+            audit_service.log_action(user['id'], 'LOGIN', {'email': email})
 
         return {
             'token': token,
@@ -49,13 +56,16 @@ class AuthService:
 
     @staticmethod
     def unlock_account(admin_user_id: str, target_user_id: str) -> Dict:
-        user_service.unlock_user(target_user_id)
+        with db_client.transaction():
+            user_service.unlock_user(target_user_id)
 
-        audit_service.log_action(
-            admin_user_id,
-            'USER_UNLOCKED',
-            {'target_user_id': target_user_id}
-        )
+            if not audit_service.log_action(
+                admin_user_id,
+                'USER_UNLOCKED',
+                {'target_user_id': target_user_id},
+                sync=True
+            ):
+                return {'error': 'Failed to unlock user account'}
 
         return {'message': 'User account unlocked successfully'}
 
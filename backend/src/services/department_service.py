@@ -1,4 +1,5 @@
 from ..utils.db_utils import db_client
+from ..services.stats_service import stats_service
 from typing import List, Dict, Optional
 import uuid
 
@@ -13,7 +14,12 @@ class DepartmentService:
         RETURNING id, name, created_at
         """
 
-        return db_client.execute_one(query, (dept_id, name))
+        result = db_client.execute_one(query, (dept_id, name))
+
+        if result:
+            stats_service.invalidate()
+
+        return result
 
     @staticmethod
     def get_department_by_id(dept_id: str) -> Optional[Dict]:
@@ -34,6 +40,7 @@ class DepartmentService:
     def delete_department(dept_id: str) -> bool:
         query = "DELETE FROM departments WHERE id = %s"
         db_client.execute_query(query, (dept_id,), fetch=False)
+        stats_service.invalidate()
         return True
 
 department_service = DepartmentService()
@@ -0,0 +1,130 @@
+from ..utils.db_utils import db_client
+from ..utils.notify_utils import notification_listener, publish
+from ..config.settings import config
+from typing import Dict, List, Optional
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_APPROVAL_HIERARCHY = [
+    'TECH_LEAD',
+    'DEPT_HEAD',
+    'FINANCE_ADMIN',
+    'FPNA',
+    'PRINCIPAL_FINANCE',
+    'CFO'
+]
+
+# Roles that may appear in a hierarchy: the approver roles other than SUPER_ADMIN.
+HIERARCHY_ROLES = frozenset(DEFAULT_APPROVAL_HIERARCHY)
+
+HIERARCHY_CONFIG_KEY = 'approval_hierarchy'
+HIERARCHY_CHANNEL = 'approval_hierarchy_changed'
+# After a failed load the current copy is served for this long before retrying.
+RELOAD_RETRY_SECONDS = 5
+
+class _HierarchySnapshot:
+    def __init__(self, roles: List[str]):
+        self.roles = tuple(roles)
+        self.stage_of = {role: index for index, role in enumerate(self.roles)}
+        self.next_role = {role: self.roles[index + 1] if index + 1 < len(self.roles) else None
+                          for index, role in enumerate(self.roles)}
+
+class HierarchyRegistry:
+    """In-memory approval hierarchy shared by the workflow and admin routes.
+
+    Loaded once per process from ``system_config``; every lookup afterwards is a
+    dict access. Writers publish on the ``approval_hierarchy_changed`` channel
+    and each worker's ``notification_listener`` drops the copy on notification.
+    """
+
+    def __init__(self, default: List[str]):
+        self._snapshot = _HierarchySnapshot(default)
+        self._loaded = False
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def _snapshot_for_read(self) -> _HierarchySnapshot:
+        if not self._loaded and time.monotonic() >= self._retry_at:
+            self.reload()
+        return self._snapshot
+
+    def reload(self) -> None:
+        """Load the hierarchy from ``system_config``; on a failed query keep the current copy and retry later."""
+        with self._lock:
+            rows = db_client.execute_query(
+                "SELECT value FROM system_config WHERE key = %s", (HIERARCHY_CONFIG_KEY,)
+            )
+            if rows is None:
+                self._retry_at = time.monotonic() + RELOAD_RETRY_SECONDS
+                logger.warning("Failed to load the approval hierarchy; retrying in %ss", RELOAD_RETRY_SECONDS)
+            else:
+                if rows:
+                    try:
+                        roles = json.loads(rows[0]['value'])
+                        if roles and isinstance(roles, list):
+                            self._snapshot = _HierarchySnapshot(roles)
+                    except ValueError as e:
+                        logger.error("Invalid approval hierarchy in system_config: %s", e)
+                self._loaded = True
+        notification_listener.ensure_started()
+
+    def invalidate(self) -> None:
+        self._retry_at = 0.0
+        self._loaded = False
+
+    def roles(self) -> List[str]:
+        return list(self._snapshot_for_read().roles)
+
+    def first_role(self) -> Optional[str]:
+        roles = self._snapshot_for_read().roles
+        return roles[0] if roles else None
+
+    def next_role(self, role: str) -> Optional[str]:
+        snapshot = self._snapshot_for_read()
+        if role in snapshot.next_role:
+            return snapshot.next_role[role]
+        return snapshot.roles[0] if snapshot.roles else None
+
+    def stage_of(self, role: str) -> Optional[int]:
+        return self._snapshot_for_read().stage_of.get(role)
+
+    def save(self, roles: List[str]) -> Dict:
+        """Persist a new hierarchy and notify every worker.
+
+        Joins the caller's transaction when there is one; the notification is
+        only delivered, and the local copy only reloaded, once it commits.
+        Returns ``{'error': ..., 'reason': 'invalid'}`` if ``roles`` is empty,
+        repeats a role or names one outside ``HIERARCHY_ROLES``.
+        """
+        if not roles:
+            return {'error': 'Hierarchy must contain at least one role', 'reason': 'invalid'}
+        unknown = [role for role in roles if role not in HIERARCHY_ROLES]
+        if unknown:
+            return {'error': f"Unknown roles: {', '.join(map(str, unknown))}. "
+                             f"Valid roles: {', '.join(DEFAULT_APPROVAL_HIERARCHY)}", 'reason': 'invalid'}
+        if len(set(roles)) != len(roles):
+            return {'error': 'Hierarchy roles must be unique', 'reason': 'invalid'}
+
+        with db_client.transaction() as tx:
+            db_client.execute_query("""
+            INSERT INTO system_config (key, value, updated_at)
+            VALUES (%s, %s, NOW())
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = NOW()
+            """, (HIERARCHY_CONFIG_KEY, json.dumps(roles)), fetch=False)
+            publish(HIERARCHY_CHANNEL, str(os.getpid()))
+            if tx.failed:
+                return {'error': 'Failed to save hierarchy'}
+            tx.after_commit(self.invalidate)
+
+        return {'hierarchy': list(roles)}
+
+hierarchy_service = HierarchyRegistry(DEFAULT_APPROVAL_HIERARCHY)
+
+if config.HIERARCHY_LISTEN:
+    notification_listener.subscribe(HIERARCHY_CHANNEL, lambda payload: hierarchy_service.invalidate(),
+                                    hierarchy_service.invalidate)
@@ -0,0 +1,140 @@
+from ..services.ai_service import ai_service
+from ..services.job_service import job_service
+from ..config.settings import config
+from ..utils.excel_utils import ColumnMapper, is_blank, iter_sheet_rows, parse_amount, parse_type
+from typing import Dict, List, Optional, Tuple
+import time
+
+EXCEL_IMPORT_JOB = 'excel_import'
+
+class ImportRowLimitExceeded(Exception):
+    pass
+
+def _elapsed_ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+class ImportService:
+    @staticmethod
+    def parse_workbook(stream, filename: str, default_type: str = None) -> Dict:
+        """Stream the first sheet and map rows by header; nothing is sent to the model here.
+
+        The first non-blank row is the header. Returns the mapped items, the
+        rows the mapper could not handle (as header -> value records), row
+        counts and per-stage timings.
+        """
+        started = time.perf_counter()
+        map_seconds = 0.0
+        mapper = None
+        items = []
+        unmapped_rows = []
+        counts = {'rows': 0, 'mapped': 0, 'unmapped': 0, 'skipped': 0}
+
+        for values in iter_sheet_rows(stream, filename):
+            if is_blank(values):
+                continue
+            if mapper is None:
+                mapper = ColumnMapper(list(values), default_type)
+                continue
+
+            counts['rows'] += 1
+            if counts['rows'] > config.EXCEL_IMPORT_MAX_ROWS:
+                raise ImportRowLimitExceeded(f'Workbook has more than {config.EXCEL_IMPORT_MAX_ROWS} rows')
+
+            mapped_at = time.perf_counter()
+            if mapper.is_subtotal(values):
+                counts['skipped'] += 1
+            else:
+                item = mapper.map_row(values)
+                if item is not None:
+                    items.append(item)
+                    counts['mapped'] += 1
+                else:
+                    unmapped_rows.append(mapper.as_record(values))
+                    counts['unmapped'] += 1
+            map_seconds += time.perf_counter() - mapped_at
+
+        total_seconds = time.perf_counter() - started
+        return {
+            'items': items,
+            'unmapped_rows': unmapped_rows,
+            'columns': {field: str(mapper.headers[index]) for field, index in mapper.columns.items()} if mapper else {},
+            'counts': counts,
+            'timings': {
+                'read_ms': _elapsed_ms(total_seconds - map_seconds),
+                'map_ms': _elapsed_ms(map_seconds)
+            }
+        }
+
+    @staticmethod
+    def build_result(items: List[Dict], counts: Dict, timings: Dict, columns: Dict) -> Dict:
+        total = round(sum(item['amount'] for item in items), 2)
+        by_type = {}
+        for item in items:
+            by_type[item['type']] = by_type.get(item['type'], 0) + item['amount']
+        categories = {item['category'] for item in items}
+
+        summary = f"{len(items)} items across {len(categories)} categories totalling {total:,.2f}"
+        if by_type:
+            summary += ' (' + ', '.join(f'{item_type} {amount:,.2f}' for item_type, amount in sorted(by_type.items())) + ')'
+
+        return {
+            'items': items,
+            'total': total,
+            'summary': summary,
+            'columns': columns,
+            'counts': counts,
+            'timings': timings
+        }
+
+    @staticmethod
+    def import_workbook(stream, filename: str, user_id: str, default_type: str = None) -> Tuple[Dict, Optional[Dict]]:
+        """Parse an upload; rows the mapper cannot handle go to a background LLM job.
+
+        Returns ``(result, job)``. ``job`` is ``None`` when every row was mapped
+        locally, otherwise ``result`` covers the mapped rows only and the job's
+        result will hold the complete import.
+        """
+        parsed = ImportService.parse_workbook(stream, filename, default_type)
+        result = ImportService.build_result(parsed['items'], parsed['counts'], parsed['timings'], parsed['columns'])
+
+        if not parsed['unmapped_rows']:
+            return result, None
+
+        job = job_service.enqueue(EXCEL_IMPORT_JOB, {
+            'filename': filename,
+            'items': parsed['items'],
+            'rows': parsed['unmapped_rows'],
+            'columns': parsed['columns'],
+            'counts': parsed['counts'],
+            'timings': parsed['timings'],
+            'default_type': default_type
+        }, user_id)
+        if job is None:
+            raise RuntimeError('Failed to queue rows for extraction')
+        return result, job
+
+    @staticmethod
+    def run_import(payload: Dict) -> Dict:
+        started = time.perf_counter()
+        extracted = ai_service.extract_budget_items(payload['filename'], payload['rows'],
+                                                    config.EXCEL_IMPORT_CHUNK_ROWS)
+
+        items = list(payload['items'])
+        for item in extracted:
+            amount = parse_amount(item.get('amount'))
+            if amount is None:
+                continue
+            items.append({
+                'category': str(item.get('category') or 'Uncategorized'),
+                'amount': amount,
+                'description': str(item.get('description') or ''),
+                'type': parse_type(item.get('type')) or payload.get('default_type') or 'OPEX'
+            })
+
+        counts = dict(payload['counts'], extracted=len(items) - len(payload['items']))
+        timings = dict(payload['timings'], llm_ms=_elapsed_ms(time.perf_counter() - started))
+        return ImportService.build_result(items, counts, timings, payload['columns'])
+
+job_service.register(EXCEL_IMPORT_JOB, ImportService.run_import)
+
+import_service = ImportService()
@@ -0,0 +1,174 @@
+from ..utils.db_utils import db_client
+from ..config.settings import config
+from typing import Callable, Dict, Optional
+import json
+import logging
+import os
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+JOB_COLUMNS = "id, type, status, result, error, attempts, max_attempts, user_id, created_at, updated_at, started_at, finished_at"
+
+class JobService:
+    """Postgres-backed background jobs.
+
+    Jobs are rows in ``jobs``; every API worker runs ``JOB_WORKERS`` threads that
+    claim due rows with ``FOR UPDATE SKIP LOCKED``, so concurrency is bounded
+    per process and a job is never run twice at once. Failed attempts are
+    retried with exponential backoff, and RUNNING jobs whose lease expired
+    (worker crashed or restarted) are picked up again.
+    """
+
+    def __init__(self, workers: int, poll_interval: float, lease_seconds: float, retry_backoff: float):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retry_backoff = retry_backoff
+        self._handlers = {}
+        self._lock = threading.Lock()
+        self._pid = None
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._active = 0
+
+    def register(self, job_type: str, handler: Callable[[Dict], object], max_attempts: int = 3) -> None:
+        self._handlers[job_type] = (handler, max_attempts)
+
+    def enqueue(self, job_type: str, payload: Dict, user_id: str = None) -> Optional[Dict]:
+        _, max_attempts = self._handlers[job_type]
+        query = f"""
+        INSERT INTO jobs (id, type, status, payload, attempts, max_attempts, user_id, run_after, created_at, updated_at)
+        VALUES (%s, %s, 'QUEUED', %s, 0, %s, %s, NOW(), NOW(), NOW())
+        RETURNING {JOB_COLUMNS}
+        """
+        job = db_client.execute_one(query, (str(uuid.uuid4()), job_type, json.dumps(payload, default=str),
+                                            max_attempts, user_id))
+        if job:
+            self.ensure_started()
+            tx = db_client.current_transaction
+            if tx is not None:
+                tx.after_commit(self._wakeup.set)
+            else:
+                self._wakeup.set()
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        query = f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = %s"
+        return db_client.execute_one(query, (job_id,))
+
+    def find_active_job(self, job_type: str, key: str, value: str) -> Optional[Dict]:
+        query = f"""
+        SELECT {JOB_COLUMNS} FROM jobs
+        WHERE type = %s AND status IN ('QUEUED', 'RUNNING') AND payload ->> %s = %s
+        ORDER BY created_at DESC
+        LIMIT 1
+        """
+        return db_client.execute_one(query, (job_type, key, value))
+
+    def ensure_started(self) -> None:
+        if self.workers <= 0 or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Fresh process (or a forked worker): threads from the parent do not exist here.
+            self._pid = os.getpid()
+            self._stopping = False
+            self._threads = []
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'job-worker-{index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def shutdown(self, timeout: float = 30) -> None:
+        """Stop claiming new jobs and wait for running ones to finish."""
+        if self._pid != os.getpid():
+            return
+        self._stopping = True
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _claim(self) -> Optional[Dict]:
+        query = """
+        UPDATE jobs SET status = 'RUNNING', attempts = attempts + 1,
+               locked_until = NOW() + make_interval(secs => %s),
+               started_at = NOW(), updated_at = NOW()
+        WHERE id = (
+            SELECT id FROM jobs
+            WHERE (status = 'QUEUED' AND run_after <= NOW())
+               OR (status = 'RUNNING' AND locked_until < NOW())
+            ORDER BY run_after
+            FOR UPDATE SKIP LOCKED
+            LIMIT 1
+        )
+        RETURNING id, type, payload, attempts, max_attempts, user_id
+        """
+        return db_client.execute_one(query, (self.lease_seconds,))
+
+    def _complete(self, job: Dict, result) -> None:
+        query = """
+        UPDATE jobs SET status = 'SUCCEEDED', result = %s, error = NULL, locked_until = NULL,
+               finished_at = NOW(), updated_at = NOW()
+        WHERE id = %s
+        """
+        db_client.execute_query(query, (json.dumps(result, default=str), job['id']), fetch=False)
+
+    def _fail(self, job: Dict, error: str) -> None:
+        if job['attempts'] < job['max_attempts']:
+            delay = self.retry_backoff * (2 ** (job['attempts'] - 1))
+            query = """
+            UPDATE jobs SET status = 'QUEUED', error = %s, locked_until = NULL,
+                   run_after = NOW() + make_interval(secs => %s), updated_at = NOW()
+            WHERE id = %s
+            """
+            db_client.execute_query(query, (error, delay, job['id']), fetch=False)
+        else:
+            query = """
+            UPDATE jobs SET status = 'FAILED', error = %s, locked_until = NULL,
+                   finished_at = NOW(), updated_at = NOW()
+            WHERE id = %s
+            """
+            db_client.execute_query(query, (error, job['id']), fetch=False)
+
+    def _run(self) -> None:
+        while not self._stopping:
+            try:
+                job = self._claim()
+            except Exception as e:
+                logger.error("Job claim error: %s", e)
+                job = None
+
+            if not job:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            handler, _ = self._handlers.get(job['type'], (None, 0))
+            with self._lock:
+                self._active += 1
+            try:
+                if job['attempts'] > job['max_attempts']:
+                    # Lease expired on the final attempt: the worker died mid-run.
+                    raise RuntimeError('Job lease expired')
+                if handler is None:
+                    raise ValueError(f"No handler registered for job type {job['type']}")
+                self._complete(job, handler(job['payload']))
+            except Exception as e:
+                logger.warning("Job %s (%s) attempt %s failed: %s", job['id'], job['type'], job['attempts'], e)
+                self._fail(job, str(e))
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+    def stats(self) -> Dict:
+        return {
+            'workers': self.workers if self._pid == os.getpid() else 0,
+            'active': self._active
+        }
+
+job_service = JobService(config.JOB_WORKERS, config.JOB_POLL_INTERVAL, config.JOB_LEASE_SECONDS,
+                         config.JOB_RETRY_BACKOFF)
@@ -1,8 +1,50 @@
-from ..utils.db_utils import db_client
+from ..utils.db_utils import db_client, read_only
+from ..utils.pagination import encode_cursor, decode_cursor
 from ..services.audit_service import audit_service
-from typing import List, Dict, Optional
+from ..services.stats_service import stats_service
+from ..services.approval_service import approval_service
+from ..services.ai_cache_service import ai_cache, request_tag
+from typing import List, Dict, Iterator, Optional, Tuple
+import math
 import uuid
 
+REQUEST_COLUMNS = [
+    'id', 'type', 'amount', 'category', 'justification', 'department_id', 'requester_id',
+    'status', 'current_stage', 'version', 'created_at', 'updated_at'
+]
+
+REQUEST_EXPORT_COLUMNS = REQUEST_COLUMNS + ['requester_name', 'requester_email', 'department_name']
+
+# Fields that feed AI prompts; changing any of them drops the request's cached responses.
+AI_PROMPT_FIELDS = ('type', 'amount', 'category', 'justification')
+
+REQUEST_TYPES = ('CAPEX', 'OPEX')
+
+# Bulk fields bound as text; anything else would fail the whole INSERT, not just its row.
+BULK_TEXT_FIELDS = ('type', 'category', 'justification', 'department_id')
+
+def _validate_bulk_item(item) -> Optional[str]:
+    if not isinstance(item, dict):
+        return 'Item must be an object'
+    missing = [field for field in ('type', 'amount', 'category', 'justification', 'department_id')
+               if item.get(field) in (None, '')]
+    if missing:
+        return f"Missing required fields: {', '.join(missing)}"
+    not_text = [field for field in BULK_TEXT_FIELDS if not isinstance(item[field], str) or not item[field].strip()]
+    if not_text:
+        return f"Fields must be non-empty strings: {', '.join(not_text)}"
+    if item['type'] not in REQUEST_TYPES:
+        return 'Invalid type. Must be CAPEX or OPEX'
+    if isinstance(item['amount'], bool):
+        return 'Amount must be a number'
+    try:
+        amount = float(item['amount'])
+    except (TypeError, ValueError):
+        return 'Amount must be a number'
+    if not math.isfinite(amount) or amount <= 0:
+        return 'Amount must be a finite number greater than zero'
+    return None
+
 class RequestService:
     @staticmethod
     def create_request(requester_id: str, request_type: str, amount: float, category: str,
@@ -12,20 +54,80 @@ class RequestService:
         query = """
         INSERT INTO budget_requests (id, type, amount, category, justification, department_id, requester_id, status, created_at, updated_at)
         VALUES (%s, %s, %s, %s, %s, %s, %s, 'DRAFT', NOW(), NOW())
-        RETURNING id, type, amount, category, justification, department_id, requester_id, status, created_at
+        RETURNING id, type, amount, category, justification, department_id, requester_id, status, version, created_at
         """
 
-        result = db_client.execute_one(query, (request_id, request_type, amount, category, justification, department_id, requester_id))
+        with db_client.transaction():
+            result = db_client.execute_one(query, (request_id, request_type, amount, category, justification, department_id, requester_id))
 
-        if result:
-            audit_service.log_action(requester_id, 'REQUEST_CREATED', {
-                'request_id': request_id,
-                'type': request_type,
-                'amount': amount
-            })
+            if result:
+                stats_service.invalidate()
+                audit_service.log_action(requester_id, 'REQUEST_CREATED', {
+                    'request_id': request_id,
+                    'type': request_type,
+                    'amount': amount
+                })
 
         return result
 
+    @staticmethod
+    def create_requests_bulk(requester_id: str, items: List[Dict], strict: bool = False) -> Dict:
+        """Validate and insert many DRAFT requests with one statement and one audit entry.
+
+        Invalid items are reported as ``{'index', 'error'}`` and skipped; in
+        strict mode any error means nothing is written.
+        """
+        errors = []
+        valid = []
+        for index, item in enumerate(items):
+            error = _validate_bulk_item(item)
+            if error:
+                errors.append({'index': index, 'error': error})
+            else:
+                valid.append((index, item))
+
+        department_ids = list({item['department_id'] for _, item in valid})
+        if department_ids:
+            known = db_client.execute_query("SELECT id FROM departments WHERE id = ANY(%s)", (department_ids,))
+            if known is None:
+                return {'error': 'Failed to validate departments'}
+            known_ids = {row['id'] for row in known}
+            still_valid = []
+            for index, item in valid:
+                if item['department_id'] in known_ids:
+                    still_valid.append((index, item))
+                else:
+                    errors.append({'index': index, 'error': 'Department not found'})
+            valid = still_valid
+        errors.sort(key=lambda error: error['index'])
+
+        if (strict and errors) or not valid:
+            return {'created': [], 'errors': errors}
+
+        rows = [(str(uuid.uuid4()), item['type'], float(item['amount']), item['category'], item['justification'],
+                 item['department_id'], requester_id) for _, item in valid]
+        query = """
+        INSERT INTO budget_requests (id, type, amount, category, justification, department_id, requester_id, status, created_at, updated_at)
+        VALUES %s
+        RETURNING id, type, amount, category, justification, department_id, requester_id, status, version, created_at
+        """
+        with db_client.transaction():
+            created = db_client.execute_values(query, rows, template="(%s, %s, %s, %s, %s, %s, %s, 'DRAFT', NOW(), NOW())",
+                                               page_size=len(rows))
+            if created is None:
+                return {'error': 'Failed to create requests'}
+            index_by_id = {row[0]: index for row, (index, _) in zip(rows, valid)}
+            created = [dict(row, index=index_by_id[row['id']]) for row in created]
+
+            stats_service.invalidate()
+            audit_service.log_action(requester_id, 'REQUESTS_BULK_CREATED', {
+                'request_ids': [row['id'] for row in created],
+                'count': len(created),
+                'total_amount': sum(float(row['amount']) for row in created)
+            })
+
+        return {'created': created, 'errors': errors}
+
     @staticmethod
     def get_request_by_id(request_id: str) -> Optional[Dict]:
         query = """
@@ -39,40 +141,88 @@ class RequestService:
         return db_client.execute_one(query, (request_id,))
 
     @staticmethod
-    def get_requests_by_requester(requester_id: str) -> List[Dict]:
-        query = """
-        SELECT br.*, d.name as department_name
-        FROM budget_requests br
-        JOIN departments d ON br.department_id = d.id
-        WHERE br.requester_id = %s
-        ORDER BY br.created_at DESC
-        """
-        return db_client.execute_query(query, (requester_id,)) or []
+    def _filter_conditions(filters: Dict, requester_id: str = None) -> Tuple[List[str], List]:
+        conditions = []
+        params = []
+
+        if requester_id:
+            conditions.append("br.requester_id = %s")
+            params.append(requester_id)
+        if filters.get('status'):
+            conditions.append("br.status = ANY(%s)")
+            params.append(filters['status'])
+        if filters.get('type'):
+            conditions.append("br.type = %s")
+            params.append(filters['type'])
+        if filters.get('department_id'):
+            conditions.append("br.department_id = %s")
+            params.append(filters['department_id'])
+        if filters.get('category'):
+            conditions.append("br.category = %s")
+            params.append(filters['category'])
+        if filters.get('min_amount') is not None:
+            conditions.append("br.amount >= %s")
+            params.append(filters['min_amount'])
+        if filters.get('max_amount') is not None:
+            conditions.append("br.amount <= %s")
+            params.append(filters['max_amount'])
+        if filters.get('created_from'):
+            conditions.append("br.created_at >= %s")
+            params.append(filters['created_from'])
+        if filters.get('created_to'):
+            conditions.append("br.created_at < %s")
+            params.append(filters['created_to'])
+
+        return conditions, params
 
     @staticmethod
-    def get_all_requests() -> List[Dict]:
-        query = """
+    @read_only
+    def list_requests(filters: Dict, limit: int, cursor: str = None, requester_id: str = None) -> Dict:
+        conditions, params = RequestService._filter_conditions(filters, requester_id)
+
+        if cursor:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            conditions.append("(br.created_at, br.id) < (%s, %s)")
+            params.extend([cursor_created_at, cursor_id])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit + 1)
+
+        query = f"""
         SELECT br.*, u.name as requester_name, u.email as requester_email,
                d.name as department_name
         FROM budget_requests br
         JOIN users u ON br.requester_id = u.id
         JOIN departments d ON br.department_id = d.id
-        ORDER BY br.created_at DESC
+        {where}
+        ORDER BY br.created_at DESC, br.id DESC
+        LIMIT %s
         """
-        return db_client.execute_query(query) or []
+        rows = db_client.execute_query(query, tuple(params)) or []
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]['created_at'], rows[-1]['id'])
+
+        return {'items': rows, 'next_cursor': next_cursor}
 
     @staticmethod
-    def get_pending_requests_for_role(role: str) -> List[Dict]:
-        query = """
-        SELECT br.*, u.name as requester_name, u.email as requester_email,
-               d.name as department_name
+    @read_only
+    def stream_requests(filters: Dict, requester_id: str = None, batch_size: int = 1000) -> Iterator[List[Dict]]:
+        conditions, params = RequestService._filter_conditions(filters, requester_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        query = f"""
+        SELECT {', '.join(f'br.{column}' for column in REQUEST_COLUMNS)},
+               u.name as requester_name, u.email as requester_email, d.name as department_name
         FROM budget_requests br
         JOIN users u ON br.requester_id = u.id
         JOIN departments d ON br.department_id = d.id
-        WHERE br.status = 'PENDING'
-        ORDER BY br.created_at ASC
+        {where}
+        ORDER BY br.created_at ASC, br.id ASC
         """
-        return db_client.execute_query(query) or []
+        return db_client.stream_query(query, tuple(params), batch_size)
 
     @staticmethod
     def update_request(request_id: str, data: Dict, user_id: str) -> Optional[Dict]:
@@ -94,44 +244,59 @@ class RequestService:
         if 'status' in data:
             updates.append("status = %s")
             params.append(data['status'])
+            updates.append("current_stage = %s")
+            params.append(approval_service.get_first_approver_role() if data['status'] == 'PENDING' else None)
 
         if not updates:
             return None
 
+        updates.append("version = version + 1")
         updates.append("updated_at = NOW()")
         params.append(request_id)
 
         query = f"UPDATE budget_requests SET {', '.join(updates)} WHERE id = %s RETURNING *"
-        result = db_client.execute_one(query, tuple(params))
+        with db_client.transaction():
+            result = db_client.execute_one(query, tuple(params))
 
-        if result:
-            audit_service.log_action(user_id, 'REQUEST_UPDATED', {
-                'request_id': request_id,
-                'changes': data
-            })
+            if result:
+                stats_service.invalidate()
+                if any(field in data for field in AI_PROMPT_FIELDS):
+                    ai_cache.invalidate_tag(request_tag(request_id))
+                audit_service.log_action(user_id, 'REQUEST_UPDATED', {
+                    'request_id': request_id,
+                    'changes': data
+                })
 
         return result
 
     @staticmethod
     def submit_request(request_id: str, user_id: str) -> Optional[Dict]:
-        query = "UPDATE budget_requests SET status = 'PENDING', updated_at = NOW() WHERE id = %s AND status = 'DRAFT' RETURNING *"
-        result = db_client.execute_one(query, (request_id,))
+        query = """
+        UPDATE budget_requests SET status = 'PENDING', current_stage = %s, version = version + 1, updated_at = NOW()
+        WHERE id = %s AND status = 'DRAFT'
+        RETURNING *
+        """
+        with db_client.transaction():
+            result = db_client.execute_one(query, (approval_service.get_first_approver_role(), request_id))
 
-        if result:
-            audit_service.log_action(user_id, 'REQUEST_SUBMITTED', {
-                'request_id': request_id
-            })
+            if result:
+                stats_service.invalidate()
+                audit_service.log_action(user_id, 'REQUEST_SUBMITTED', {
+                    'request_id': request_id
+                })
 
         return result
 
     @staticmethod
     def delete_request(request_id: str, user_id: str) -> bool:
         query = "DELETE FROM budget_requests WHERE id = %s AND status = 'DRAFT'"
-        db_client.execute_query(query, (request_id,), fetch=False)
+        with db_client.transaction():
+            db_client.execute_query(query, (request_id,), fetch=False)
+            stats_service.invalidate()
 
-        audit_service.log_action(user_id, 'REQUEST_DELETED', {
-            'request_id': request_id
-        })
+            audit_service.log_action(user_id, 'REQUEST_DELETED', {
+                'request_id': request_id
+            })
 
         return True
 
@@ -0,0 +1,190 @@
+from ..utils.db_utils import db_client, read_only
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# group_by name -> (select expressions, group by expressions, result fields)
+ROLLUP_DIMENSIONS = {
+    'department': (['r.department_id', 'd.name AS department_name'], ['r.department_id', 'd.name'],
+                   ['department_id', 'department_name']),
+    'category': (['r.category'], ['r.category'], ['category']),
+    'type': (['r.type'], ['r.type'], ['type']),
+    'status': (['r.status'], ['r.status'], ['status']),
+    'month': (['r.month'], ['r.month'], ['month'])
+}
+
+SUMMARY_GROUPS = ('department', 'category')
+
+# Statuses reported as committed and pending spend.
+COMMITTED_STATUSES = ('FINAL_APPROVED',)
+PENDING_STATUSES = ('PENDING',)
+
+# Same grouping as the budget_rollups triggers (see the migration).
+ROLLUP_SOURCE_QUERY = """
+SELECT department_id, category, type, COALESCE(status, 'UNKNOWN') AS status,
+       date_trunc('month', COALESCE(created_at, now()) AT TIME ZONE 'UTC')::date AS month,
+       COUNT(*) AS request_count, SUM(amount) AS total_amount
+FROM budget_requests
+GROUP BY 1, 2, 3, 4, 5
+"""
+
+ROLLUP_KEY = "department_id, category, type, status, month"
+
+def parse_month(value: str) -> date:
+    """``YYYY-MM`` (or a full ISO date) to the first day of that month."""
+    parts = value.strip().split('-')
+    if len(parts) not in (2, 3):
+        raise ValueError(f'expected YYYY-MM, got {value!r}')
+    return date(int(parts[0]), int(parts[1]), 1)
+
+def _format_row(row: Dict) -> Dict:
+    row = dict(row)
+    if row.get('month') is not None:
+        row['month'] = row['month'].strftime('%Y-%m')
+    for key, value in row.items():
+        if key.endswith('_amount'):
+            row[key] = float(value or 0)
+        elif key.endswith('_count'):
+            row[key] = int(value or 0)
+    return row
+
+class RollupService:
+    """Reports over ``budget_rollups``: cost is proportional to the number of groups, not requests.
+
+    The table is kept current by triggers on ``budget_requests`` in the same
+    transaction as every write; ``rebuild`` recomputes it from scratch.
+    """
+
+    @staticmethod
+    def _filter_conditions(filters: Dict) -> Tuple[List[str], List]:
+        conditions = []
+        params = []
+        for key in ('department_id', 'category', 'type'):
+            if filters.get(key):
+                conditions.append(f"r.{key} = %s")
+                params.append(filters[key])
+        if filters.get('status'):
+            conditions.append("r.status = ANY(%s)")
+            params.append(list(filters['status']))
+        if filters.get('month_from'):
+            conditions.append("r.month >= %s")
+            params.append(filters['month_from'])
+        if filters.get('month_to'):
+            conditions.append("r.month <= %s")
+            params.append(filters['month_to'])
+        return conditions, params
+
+    @staticmethod
+    @read_only
+    def get_rollups(group_by: List[str], filters: Dict) -> Optional[List[Dict]]:
+        """Counts and amounts per combination of the ``group_by`` dimensions."""
+        select = []
+        group = []
+        for dimension in group_by:
+            columns, keys, _ = ROLLUP_DIMENSIONS[dimension]
+            select.extend(columns)
+            group.extend(keys)
+
+        conditions, params = RollupService._filter_conditions(filters)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        group_clause = f"GROUP BY {', '.join(group)}" if group else ''
+        order_clause = f"ORDER BY {', '.join(group)}" if group else ''
+        query = f"""
+        SELECT {''.join(column + ', ' for column in select)}
+               SUM(r.request_count) AS request_count,
+               SUM(r.total_amount) AS total_amount
+        FROM budget_rollups r
+        LEFT JOIN departments d ON d.id = r.department_id
+        {where}
+        {group_clause}
+        HAVING SUM(r.request_count) > 0
+        {order_clause}
+        """
+        rows = db_client.execute_query(query, tuple(params))
+        if rows is None:
+            return None
+        return [_format_row(row) for row in rows]
+
+    @staticmethod
+    @read_only
+    def get_summary(group_by: str, filters: Dict) -> Optional[List[Dict]]:
+        """Committed versus pending CAPEX/OPEX per department or category."""
+        columns, keys, fields = ROLLUP_DIMENSIONS[group_by]
+        conditions, params = RollupService._filter_conditions(filters)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        query = f"""
+        SELECT {', '.join(columns)}, r.type,
+               SUM(r.request_count) FILTER (WHERE r.status = ANY(%s)) AS committed_count,
+               SUM(r.total_amount) FILTER (WHERE r.status = ANY(%s)) AS committed_amount,
+               SUM(r.request_count) FILTER (WHERE r.status = ANY(%s)) AS pending_count,
+               SUM(r.total_amount) FILTER (WHERE r.status = ANY(%s)) AS pending_amount
+        FROM budget_rollups r
+        LEFT JOIN departments d ON d.id = r.department_id
+        {where}
+        GROUP BY {', '.join(keys)}, r.type
+        HAVING SUM(r.request_count) > 0
+        ORDER BY {', '.join(keys)}, r.type
+        """
+        statuses = [list(COMMITTED_STATUSES), list(COMMITTED_STATUSES), list(PENDING_STATUSES), list(PENDING_STATUSES)]
+        rows = db_client.execute_query(query, tuple(statuses + params))
+        if rows is None:
+            return None
+
+        summary = {}
+        for row in rows:
+            row = _format_row(row)
+            key = tuple(row[field] for field in fields)
+            entry = summary.get(key)
+            if entry is None:
+                entry = summary[key] = {field: row[field] for field in fields}
+                entry['types'] = {}
+            entry['types'][row['type']] = {
+                'committed': {'count': row['committed_count'], 'amount': row['committed_amount']},
+                'pending': {'count': row['pending_count'], 'amount': row['pending_amount']}
+            }
+        return list(summary.values())
+
+    @staticmethod
+    def rebuild(dry_run: bool = False) -> Dict:
+        """Recompute ``budget_rollups`` from ``budget_requests`` and report how many groups had drifted.
+
+        Writers to ``budget_requests`` are blocked for the duration, so no
+        trigger delta can interleave with the recount.
+        """
+        with db_client.transaction() as tx:
+            db_client.execute_query("LOCK TABLE budget_requests IN SHARE MODE", fetch=False)
+            db_client.execute_query(f"CREATE TEMP TABLE fresh_rollups ON COMMIT DROP AS {ROLLUP_SOURCE_QUERY}",
+                                    fetch=False)
+            drift = db_client.execute_one(f"""
+            SELECT COUNT(*) FILTER (WHERE f.request_count IS NULL) AS stale,
+                   COUNT(*) FILTER (WHERE r.request_count IS NULL) AS missing,
+                   COUNT(*) FILTER (WHERE f.request_count IS NOT NULL AND r.request_count IS NOT NULL) AS different,
+                   (SELECT COUNT(*) FROM fresh_rollups) AS groups
+            FROM fresh_rollups f
+            FULL JOIN (SELECT * FROM budget_rollups WHERE request_count <> 0 OR total_amount <> 0) r
+              USING ({ROLLUP_KEY})
+            WHERE f.request_count IS DISTINCT FROM r.request_count
+               OR f.total_amount IS DISTINCT FROM r.total_amount
+            """)
+
+            if drift is not None and not dry_run:
+                db_client.execute_query("DELETE FROM budget_rollups", fetch=False)
+                db_client.execute_query(f"""
+                INSERT INTO budget_rollups ({ROLLUP_KEY}, request_count, total_amount, updated_at)
+                SELECT {ROLLUP_KEY}, request_count, total_amount, now() FROM fresh_rollups
+                """, fetch=False)
+            else:
+                tx.set_rollback_only()
+
+        if drift is None or tx.failed:
+            return {'error': 'Failed to rebuild budget rollups'}
+
+        result = {key: int(value) for key, value in drift.items()}
+        result['rebuilt'] = not dry_run
+        if result['stale'] or result['missing'] or result['different']:
+            logger.warning("Budget rollups had drifted: %s", result)
+        return result
+
+rollup_service = RollupService()
@@ -0,0 +1,84 @@
+from ..utils.db_utils import db_client, read_only
+from ..utils.cache_utils import TTLCache
+from ..config.settings import config
+from typing import Dict, Optional
+
+STATS_CACHE_KEY = 'admin_stats'
+
+class StatsService:
+    _cache = TTLCache(maxsize=1, ttl=config.STATS_CACHE_TTL)
+
+    @staticmethod
+    @read_only
+    def _compute() -> Optional[Dict]:
+        # Reads budget_rollups (one row per group) rather than every request;
+        # the grand total row is kept even when there are no requests.
+        query = """
+        SELECT GROUPING(r.status) AS by_status,
+               GROUPING(r.department_id) AS by_department,
+               GROUPING(r.type) AS by_type,
+               r.status, r.department_id, d.name AS department_name, r.type,
+               COALESCE(SUM(r.request_count), 0) AS count,
+               COALESCE(SUM(r.total_amount) FILTER (WHERE r.type = 'CAPEX'), 0) AS capex_amount,
+               COALESCE(SUM(r.total_amount) FILTER (WHERE r.type = 'OPEX'), 0) AS opex_amount,
+               (SELECT COUNT(*) FROM users) AS total_users,
+               (SELECT COUNT(*) FROM departments) AS total_departments
+        FROM budget_rollups r
+        LEFT JOIN departments d ON r.department_id = d.id
+        GROUP BY GROUPING SETS ((), (r.status), (r.department_id, d.name), (r.type))
+        HAVING SUM(r.request_count) > 0
+            OR (GROUPING(r.status) = 1 AND GROUPING(r.department_id) = 1 AND GROUPING(r.type) = 1)
+        """
+        rows = db_client.execute_query(query)
+        if not rows:
+            return None
+
+        stats = {
+            'by_status': {},
+            'by_department': [],
+            'by_type': {}
+        }
+
+        for row in rows:
+            amounts = {
+                'capex_amount': float(row['capex_amount']),
+                'opex_amount': float(row['opex_amount'])
+            }
+            if not row['by_status']:
+                stats['by_status'][row['status'] or 'UNKNOWN'] = {'count': int(row['count']), **amounts}
+            elif not row['by_department']:
+                stats['by_department'].append({
+                    'department_id': row['department_id'],
+                    'department_name': row['department_name'],
+                    'count': int(row['count']),
+                    **amounts
+                })
+            elif not row['by_type']:
+                stats['by_type'][row['type']] = {'count': int(row['count']), **amounts}
+            else:
+                stats['total_users'] = row['total_users']
+                stats['total_departments'] = row['total_departments']
+                stats['total_requests'] = int(row['count'])
+                stats['amounts'] = amounts
+
+        stats['by_department'].sort(key=lambda item: item['department_name'] or '')
+        stats['pending_requests'] = stats['by_status'].get('PENDING', {}).get('count', 0)
+        stats['approved_requests'] = stats['by_status'].get('FINAL_APPROVED', {}).get('count', 0)
+        stats['rejected_requests'] = stats['by_status'].get('REJECTED', {}).get('count', 0)
+
+        return stats
+
+    @staticmethod
+    def get_stats() -> Optional[Dict]:
+        return StatsService._cache.get_or_set(STATS_CACHE_KEY, StatsService._compute)
+
+    @staticmethod
+    def invalidate() -> None:
+        """Drop the cached stats, after the current transaction commits if there is one."""
+        tx = db_client.current_transaction
+        if tx is not None:
+            tx.after_commit(StatsService._cache.clear)
+        else:
+            StatsService._cache.clear()
+
+stats_service = StatsService()
@@ -1,13 +1,23 @@
 from ..utils.db_utils import db_client
-from ..utils.auth_utils import hash_password
+from ..utils.auth_utils import hash_password, invalidate_user_tokens, clear_token_cache
+from ..utils.cache_utils import TTLCache
+from ..utils.notify_utils import notification_listener, publish
+from ..config.settings import config
+from ..services.stats_service import stats_service
 from typing import List, Dict, Optional
 import uuid
 
+USER_CHANNEL = 'user_changed'
+
 class UserService:
+    _profile_cache = TTLCache(maxsize=config.USER_CACHE_SIZE, ttl=config.USER_CACHE_TTL)
+
     @staticmethod
-    def create_user(name: str, email: str, password: str, role: str, department_id: str = None) -> Optional[Dict]:
+    def create_user(name: str, email: str, password: str, role: str, department_id: str = None,
+                    password_hash: str = None) -> Optional[Dict]:
+        """Insert a user; pass ``password_hash`` (from ``hash_password``) to keep bcrypt out of the caller's transaction."""
         user_id = str(uuid.uuid4())
-        password_hash = hash_password(password)
+        password_hash = password_hash or hash_password(password)
 
         query = """
         INSERT INTO users (id, name, email, password_hash, role, department_id, is_locked, failed_attempts, created_at, updated_at)
@@ -15,13 +25,48 @@ class UserService:
         RETURNING id, name, email, role, department_id, is_locked, created_at
         """
 
-        return db_client.execute_one(query, (user_id, name, email, password_hash, role, department_id))
+        result = db_client.execute_one(query, (user_id, name, email, password_hash, role, department_id))
+
+        if result:
+            stats_service.invalidate()
+
+        return result
 
     @staticmethod
     def get_user_by_id(user_id: str) -> Optional[Dict]:
         query = "SELECT id, name, email, role, department_id, is_locked, failed_attempts, created_at FROM users WHERE id = %s"
         return db_client.execute_one(query, (user_id,))
 
+    @staticmethod
+    def get_cached_user(user_id: str) -> Optional[Dict]:
+        return UserService._profile_cache.get_or_set(user_id, lambda: UserService.get_user_by_id(user_id))
+
+    @staticmethod
+    def forget_user(user_id: str) -> None:
+        """Drop this process's cached profile and verified tokens of ``user_id``."""
+        UserService._profile_cache.delete(user_id)
+        invalidate_user_tokens(user_id)
+
+    @staticmethod
+    def forget_all_users() -> None:
+        UserService._profile_cache.clear()
+        clear_token_cache()
+
+    @staticmethod
+    def invalidate_user(user_id: str) -> None:
+        """Drop ``user_id`` from the caches of every worker.
+
+        Other workers are told on ``user_changed``, delivered when the caller's
+        transaction commits. A concurrent reader may re-cache the old row before
+        then, so this worker drops it again after the commit as well.
+        """
+        UserService.forget_user(user_id)
+        publish(USER_CHANNEL, user_id)
+
+        tx = db_client.current_transaction
+        if tx is not None:
+            tx.after_commit(lambda: UserService.forget_user(user_id))
+
     @staticmethod
     def get_user_by_email(email: str) -> Optional[Dict]:
         query = "SELECT * FROM users WHERE email = %s"
@@ -33,7 +78,8 @@ class UserService:
         return db_client.execute_query(query) or []
 
     @staticmethod
-    def update_user(user_id: str, data: Dict) -> Optional[Dict]:
+    def update_user(user_id: str, data: Dict, password_hash: str = None) -> Optional[Dict]:
+        """Update the given fields; ``password_hash``, if passed, is the precomputed hash of ``data['password']``."""
         updates = []
         params = []
 
@@ -51,7 +97,7 @@ class UserService:
             params.append(data['department_id'])
         if 'password' in data:
             updates.append("password_hash = %s")
-            params.append(hash_password(data['password']))
+            params.append(password_hash or hash_password(data['password']))
 
         if not updates:
             return None
@@ -60,18 +106,28 @@ class UserService:
         params.append(user_id)
 
         query = f"UPDATE users SET {', '.join(updates)} WHERE id = %s RETURNING id, name, email, role, department_id, is_locked"
-        return db_client.execute_one(query, tuple(params))
+        result = db_client.execute_one(query, tuple(params))
+        UserService.invalidate_user(user_id)
+        return result
+
+    @staticmethod
+    def set_password_hash(user_id: str, password_hash: str) -> bool:
+        query = "UPDATE users SET password_hash = %s, updated_at = NOW() WHERE id = %s"
+        db_client.execute_query(query, (password_hash, user_id), fetch=False)
+        return True
 
     @staticmethod
     def lock_user(user_id: str) -> bool:
         query = "UPDATE users SET is_locked = true, updated_at = NOW() WHERE id = %s"
         db_client.execute_query(query, (user_id,), fetch=False)
+        UserService.invalidate_user(user_id)
         return True
 
     @staticmethod
     def unlock_user(user_id: str) -> bool:
         query = "UPDATE users SET is_locked = false, failed_attempts = 0, updated_at = NOW() WHERE id = %s"
         db_client.execute_query(query, (user_id,), fetch=False)
+        UserService.invalidate_user(user_id)
         return True
 
     @staticmethod
@@ -90,6 +146,11 @@ class UserService:
     def delete_user(user_id: str) -> bool:
         query = "DELETE FROM users WHERE id = %s"
         db_client.execute_query(query, (user_id,), fetch=False)
+        UserService.invalidate_user(user_id)
+        stats_service.invalidate()
         return True
 
 user_service = UserService()
+
+if config.USER_CACHE_LISTEN:
+    notification_listener.subscribe(USER_CHANNEL, user_service.forget_user, user_service.forget_all_users)
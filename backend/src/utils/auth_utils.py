@@ -1,16 +1,117 @@
 import jwt
 import bcrypt
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import datetime, timedelta
 from functools import wraps
 from flask import request, jsonify
 from ..config.settings import config
+from .cache_utils import TTLCache
+
+# Verified claims keyed by token digest, each held until the token's own exp.
+_token_cache = TTLCache(maxsize=config.TOKEN_CACHE_SIZE, ttl=config.JWT_EXPIRATION_MINUTES * 60)
+
+class PasswordWorkQueueFull(Exception):
+    pass
+
+class PasswordWorkTimeout(Exception):
+    pass
+
+class PasswordHasher:
+    """Runs bcrypt on a small dedicated thread pool.
+
+    bcrypt releases the GIL, so the pool bounds how many cores hashing can use
+    while request threads only wait on the result. At most ``max_pending`` jobs
+    may be queued or running; beyond that callers get ``PasswordWorkQueueFull``.
+    A job that takes longer than ``timeout`` raises ``PasswordWorkTimeout``.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self.timeout = timeout
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._counters = {'completed': 0, 'rejected': 0, 'busy_time': 0.0}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bcrypt')
+        return self._executor
+
+    def _timed(self, fn, *args):
+        started = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._counters['completed'] += 1
+                self._counters['busy_time'] += time.monotonic() - started
+            self._slots.release()
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counters['rejected'] += 1
+            raise PasswordWorkQueueFull('Too many password operations in progress')
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(self._timed, fn, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+            raise
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise PasswordWorkTimeout('Password operation timed out') from None
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self._counters['completed']
+            return {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'queue_depth': self._pending,
+                'completed': completed,
+                'rejected': self._counters['rejected'],
+                'avg_ms': round(self._counters['busy_time'] * 1000 / completed, 3) if completed else 0.0
+            }
+
+password_hasher = PasswordHasher(config.BCRYPT_WORKERS, config.BCRYPT_MAX_PENDING, config.BCRYPT_TIMEOUT)
 
 def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    salt = bcrypt.gensalt(rounds=config.BCRYPT_ROUNDS)
+    return password_hasher.run(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
 
 def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    return password_hasher.run(bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+def password_work_unavailable():
+    """503 response for a ``PasswordWorkQueueFull`` or ``PasswordWorkTimeout`` outside login."""
+    response = jsonify({'error': 'Password service is busy. Please try again shortly.'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+def password_needs_rehash(hashed: str) -> bool:
+    try:
+        return int(hashed.split('$')[2]) != config.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
 
 def generate_token(user_id: str, role: str) -> str:
     payload = {
@@ -21,13 +122,32 @@ def generate_token(user_id: str, role: str) -> str:
     return jwt.encode(payload, config.JWT_SECRET_KEY, algorithm='HS256')
 
 def decode_token(token: str) -> dict:
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    payload = _token_cache.get(digest)
+    if payload is not None:
+        return payload
+
     try:
-        return jwt.decode(token, config.JWT_SECRET_KEY, algorithms=['HS256'])
+        payload = jwt.decode(token, config.JWT_SECRET_KEY, algorithms=['HS256'])
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+    ttl = payload['exp'] - time.time() if 'exp' in payload else None
+    if ttl is None or ttl > 0:
+        _token_cache.set(digest, payload, ttl)
+    return payload
+
+def invalidate_user_tokens(user_id: str) -> None:
+    _token_cache.delete_where(lambda digest, payload: payload.get('user_id') == user_id)
+
+def clear_token_cache() -> None:
+    _token_cache.clear()
+
+def token_cache_stats() -> dict:
+    return _token_cache.stats()
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -50,6 +170,14 @@ def token_required(f):
         request.user_id = payload['user_id']
         request.user_role = payload['role']
 
+        if config.AUTH_CHECK_USER_STATUS:
+            from ..services.user_service import user_service
+
+            user = user_service.get_cached_user(payload['user_id'])
+            if not user or user['is_locked']:
+                return jsonify({'error': 'Token is invalid or expired'}), 401
+            request.user_role = user['role']
+
         return f(*args, **kwargs)
 
     return decorated
@@ -1,55 +1,720 @@
 import psycopg2
 import psycopg2.extras
+import logging
 import os
-from typing import Dict, List, Any, Optional
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from functools import wraps
+from typing import Dict, List, Any, Callable, Iterator, Optional
 from contextlib import contextmanager
+from ..config.settings import config
+from . import instrumentation
+
+logger = logging.getLogger(__name__)
+
+class PoolTimeout(Exception):
+    pass
+
+class ConnectionPool:
+    """Thread-safe psycopg2 connection pool.
+
+    Connections are health-checked on checkout, recycled once they exceed
+    ``max_lifetime`` and reaped by a background thread after ``max_idle``
+    seconds unused (never below ``min_size``).
+    """
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10, timeout: float = 10,
+                 max_idle: float = 300, max_lifetime: float = 1800, check_after: float = 30):
+        self.dsn = dsn
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = deque()
+        self._created_at = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._reaper = None
+        self._counters = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'connects': 0,
+            'discarded': 0,
+            'failed_checks': 0,
+            'wait_time': 0.0
+        }
+
+    def _connect(self):
+        conn = psycopg2.connect(self.dsn)
+        self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    def _close(self, conn) -> None:
+        self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _expired(self, conn, now: float) -> bool:
+        created_at = self._created_at.get(id(conn), now)
+        return self.max_lifetime > 0 and now - created_at > self.max_lifetime
+
+    def _is_healthy(self, conn, idle_since: float, now: float) -> bool:
+        if conn.closed:
+            return False
+        if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if now - idle_since < self.check_after:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _start_reaper(self) -> None:
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        if self.max_idle <= 0 and self.max_lifetime <= 0:
+            return
+        self._reaper = threading.Thread(target=self._reap_loop, name='db-pool-reaper', daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        intervals = [value for value in (self.max_idle, self.max_lifetime) if value > 0]
+        interval = max(1.0, min(intervals) / 2)
+        while not self._closed:
+            time.sleep(interval)
+            self.reap()
+
+    def getconn(self):
+        started = time.monotonic()
+        deadline = started + self.timeout
+
+        while True:
+            conn = None
+            idle_since = None
+            with self._cond:
+                if self._closed:
+                    raise PoolTimeout('Connection pool is closed')
+                self._start_reaper()
+
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters['timeouts'] += 1
+                        raise PoolTimeout(f'Timed out after {self.timeout}s waiting for a database connection')
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                    if self._closed:
+                        raise PoolTimeout('Connection pool is closed')
+
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                else:
+                    self._size += 1
+
+            # Connecting and health checks run outside the lock so that a slow
+            # handshake never blocks other threads returning connections.
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._counters['connects'] += 1
+                    self._counters['checkouts'] += 1
+                    self._counters['wait_time'] += time.monotonic() - started
+                    warm = self._size < self.min_size
+                if warm:
+                    self._fill_to_min()
+                return conn
+
+            now = time.monotonic()
+            if self._expired(conn, now) or not self._is_healthy(conn, idle_since, now):
+                with self._cond:
+                    self._counters['failed_checks'] += 1
+                    self._counters['discarded'] += 1
+                    self._size -= 1
+                    self._close(conn)
+                    self._cond.notify()
+                continue
+
+            with self._cond:
+                self._counters['checkouts'] += 1
+                self._counters['wait_time'] += time.monotonic() - started
+            return conn
+
+    def _fill_to_min(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                return
+            with self._cond:
+                self._counters['connects'] += 1
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        if not discard and not conn.closed:
+            try:
+                if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            if discard or conn.closed or self._closed or self._expired(conn, time.monotonic()):
+                self._counters['discarded'] += 1
+                self._size -= 1
+                self._close(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def reap(self) -> None:
+        with self._cond:
+            now = time.monotonic()
+            keep = deque()
+            while self._idle:
+                conn, idle_since = self._idle.popleft()
+                idle_too_long = self.max_idle > 0 and now - idle_since > self.max_idle
+                if self._expired(conn, now) or conn.closed or (idle_too_long and self._size > self.min_size):
+                    self._counters['discarded'] += 1
+                    self._size -= 1
+                    self._close(conn)
+                else:
+                    keep.append((conn, idle_since))
+            self._idle = keep
+            self._cond.notify_all()
+
+    def closeall(self) -> None:
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._size -= 1
+                self._close(conn)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'waiting': self._waiting,
+                'checkouts': self._counters['checkouts'],
+                'timeouts': self._counters['timeouts'],
+                'connects': self._counters['connects'],
+                'discarded': self._counters['discarded'],
+                'failed_checks': self._counters['failed_checks'],
+                'avg_wait_ms': round(self._counters['wait_time'] * 1000 / self._counters['checkouts'], 3)
+                    if self._counters['checkouts'] else 0.0
+            }
+
+class Transaction:
+    """Unit of work bound to one connection; see ``DatabaseClient.transaction``."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.failed = False
+        self.rollback_only = False
+        self._after_commit = []
+
+    def set_rollback_only(self) -> None:
+        self.rollback_only = True
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        self._after_commit.append(callback)
+
+    @property
+    def committed(self) -> bool:
+        return not (self.failed or self.rollback_only)
+
+# Statements that may run on a replica: a plain SELECT (or read-only CTE)
+# that neither writes nor takes row locks.
+_READ_STATEMENT = re.compile(r'^\s*(SELECT|WITH)\b', re.IGNORECASE)
+_WRITE_KEYWORD = re.compile(r'\b(INSERT|UPDATE|DELETE|MERGE|LOCK|NOTIFY|PG_NOTIFY|NEXTVAL|SETVAL)\b|\bFOR\s+(SHARE|KEY\s+SHARE)\b',
+                            re.IGNORECASE)
+
+def is_read_statement(query) -> bool:
+    return isinstance(query, str) and bool(_READ_STATEMENT.match(query)) and not _WRITE_KEYWORD.search(query)
+
+class Replica:
+    """One read replica: its lazily created pool and health state."""
+
+    def __init__(self, name: str, dsn: str):
+        self.name = name
+        self.dsn = dsn
+        self.pool = None
+        self.ejected_until = 0.0
+        self.checked_at = 0.0
+        self.reads = 0
+        self.ejections = 0
+        self.last_error = None
+
+class ReplicaSet:
+    """Round-robin read replicas with health-based ejection.
+
+    A replica whose connection fails, or whose replay lag is above
+    ``max_lag`` seconds (checked at most every ``check_interval`` seconds), is
+    skipped for ``eject_seconds`` and then tried again. When no replica is
+    usable, reads fall back to the primary.
+    """
+
+    LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+
+    def __init__(self, dsns: List[str], eject_seconds: float = 30, max_lag: float = 10, check_interval: float = 5):
+        self.replicas = [Replica(f'replica-{index}', dsn) for index, dsn in enumerate(dsns)]
+        self.eject_seconds = eject_seconds
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def candidates(self) -> List[Replica]:
+        """Replicas that are not ejected, starting from the next one in turn."""
+        now = time.monotonic()
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if replica.ejected_until <= now]
+
+    def eject(self, replica: Replica, reason: str) -> None:
+        with self._lock:
+            replica.ejected_until = time.monotonic() + self.eject_seconds
+            replica.ejections += 1
+            replica.last_error = reason
+        logger.warning("Read replica %s ejected for %ss: %s", replica.name, self.eject_seconds, reason)
+
+    def check_lag(self, replica: Replica, conn) -> Optional[str]:
+        """Return why ``replica`` is unusable, or ``None``; only queries when a check is due."""
+        now = time.monotonic()
+        if self.max_lag <= 0 or now - replica.checked_at < self.check_interval:
+            return None
+        replica.checked_at = now
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(self.LAG_QUERY)
+                lag = float(cursor.fetchone()[0] or 0)
+            conn.rollback()
+        except psycopg2.Error as e:
+            return f'lag check failed: {e}'
+        if lag > self.max_lag:
+            return f'replication lag {lag:.1f}s exceeds {self.max_lag}s'
+        return None
+
+    def record_read(self, replica: Replica) -> None:
+        with self._lock:
+            replica.reads += 1
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [{
+            'name': replica.name,
+            'healthy': replica.ejected_until <= now,
+            'ejected_for': round(max(replica.ejected_until - now, 0), 1),
+            'reads': replica.reads,
+            'ejections': replica.ejections,
+            'last_error': replica.last_error,
+            'pool': replica.pool.stats() if replica.pool is not None else None
+        } for replica in self.replicas]
+
+def _replica_failover(method):
+    """Run a read once more (on another replica or the primary) if its replica dropped the connection."""
+    @wraps(method)
+    def decorated(self, query, *args, **kwargs):
+        self._local.replica_failed = False
+        result = method(self, query, *args, **kwargs)
+        if self._local.replica_failed:
+            self._local.replica_failed = False
+            result = method(self, query, *args, **kwargs)
+        return result
+
+    return decorated
 
 class DatabaseClient:
-    def __init__(self):
+    """Primary connection pool, thread-bound transactions and read-replica routing.
+
+    Reads run on a replica only inside ``read_only()`` (or ``@read_only``
+    service methods), outside a transaction, and only until the current
+    request has written: after any transaction or write statement the
+    thread sticks to the primary until ``begin_request`` is called, so a
+    request always reads its own writes. Within a request, reads stay on the
+    replica used first, so a later read never sees an older snapshot.
+    """
+
+    def __init__(self, pooled: bool = None, replica_urls: List[str] = None):
         self.connection_string = os.getenv('DATABASE_URL')
+        self.pooled = config.DB_POOL_ENABLED if pooled is None else pooled
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        replica_urls = config.DATABASE_REPLICA_URLS if replica_urls is None else replica_urls
+        self.replicas = ReplicaSet(replica_urls, config.DB_REPLICA_EJECT_SECONDS, config.DB_REPLICA_MAX_LAG,
+                                   config.DB_REPLICA_CHECK_INTERVAL) if replica_urls else None
+
+    def _new_pool(self, dsn: str) -> ConnectionPool:
+        return ConnectionPool(
+            dsn,
+            min_size=config.DB_POOL_MIN_SIZE,
+            max_size=config.DB_POOL_MAX_SIZE,
+            timeout=config.DB_POOL_TIMEOUT,
+            max_idle=config.DB_POOL_MAX_IDLE,
+            max_lifetime=config.DB_POOL_MAX_LIFETIME,
+            check_after=config.DB_POOL_CHECK_AFTER
+        )
+
+    @property
+    def pool(self) -> Optional[ConnectionPool]:
+        if not self.pooled:
+            return None
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = self._new_pool(self.connection_string)
+        return self._pool
+
+    def _replica_pool(self, replica: Replica) -> Optional[ConnectionPool]:
+        if not self.pooled:
+            return None
+        if replica.pool is None:
+            with self._pool_lock:
+                if replica.pool is None:
+                    replica.pool = self._new_pool(replica.dsn)
+        return replica.pool
+
+    @staticmethod
+    def _release(pool: Optional[ConnectionPool], conn, discard: bool = False) -> None:
+        if pool is not None:
+            pool.putconn(conn, discard=discard)
+        else:
+            conn.close()
+
+    def _acquire_replica(self):
+        candidates = self.replicas.candidates()
+        pinned = getattr(self._local, 'replica', None)
+        if pinned in candidates:
+            candidates.remove(pinned)
+            candidates.insert(0, pinned)
+        for replica in candidates:
+            pool = self._replica_pool(replica)
+            try:
+                conn = pool.getconn() if pool is not None else psycopg2.connect(replica.dsn)
+            except psycopg2.Error as e:
+                self.replicas.eject(replica, str(e).strip())
+                continue
+            except PoolTimeout:
+                # Busy, not broken: try the next replica without ejecting this one.
+                continue
+
+            reason = self.replicas.check_lag(replica, conn)
+            if reason is None:
+                self._local.replica = replica
+                return replica, pool, conn
+            self._release(pool, conn, discard=True)
+            self.replicas.eject(replica, reason)
+        return None, None, None
+
+    @contextmanager
+    def replica_connection(self):
+        """Connection to a healthy replica, or to the primary when none is usable."""
+        acquire_started = time.perf_counter()
+        replica, pool, conn = self._acquire_replica() if self.replicas else (None, None, None)
+        if conn is None:
+            with self.get_connection() as conn:
+                yield conn
+            return
+
+        instrumentation.record_acquire(acquire_started)
+        self.replicas.record_read(replica)
+        discard = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception as e:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+            if isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+                discard = True
+                self.replicas.eject(replica, str(e).strip())
+                self._local.replica_failed = True
+            raise e
+        finally:
+            self._release(pool, conn, discard=discard)
 
     @contextmanager
     def get_connection(self):
-        conn = psycopg2.connect(self.connection_string)
+        pool = self.pool
+        acquire_started = time.perf_counter()
+        if pool is None:
+            conn = psycopg2.connect(self.connection_string)
+            instrumentation.record_acquire(acquire_started)
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                conn.close()
+            return
+
+        conn = pool.getconn()
+        instrumentation.record_acquire(acquire_started)
+        discard = False
         try:
             yield conn
             conn.commit()
         except Exception as e:
-            conn.rollback()
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+            if isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+                discard = True
             raise e
         finally:
-            conn.close()
+            pool.putconn(conn, discard=discard)
 
-    def execute_query(self, query: str, params: tuple = None, fetch: bool = True) -> Optional[List[Dict[str, Any]]]:
+    @property
+    def current_transaction(self) -> Optional[Transaction]:
+        return getattr(self._local, 'transaction', None)
+
+    @contextmanager
+    def read_only(self):
+        """Allow the reads issued on this thread inside the block to go to a replica."""
+        previous = getattr(self._local, 'read_only', False)
+        self._local.read_only = True
         try:
+            yield
+        finally:
+            self._local.read_only = previous
+
+    def begin_request(self) -> None:
+        """Forget earlier writes and the replica used on this thread; call at the start of each request."""
+        self._local.sticky = False
+        self._local.replica = None
+
+    def _stick_to_primary(self) -> None:
+        self._local.sticky = True
+
+    def _routes_to_replica(self, query) -> bool:
+        return (self.replicas is not None
+                and getattr(self._local, 'read_only', False)
+                and not getattr(self._local, 'sticky', False)
+                and is_read_statement(query))
+
+    @contextmanager
+    def transaction(self):
+        """Run every query issued on this thread inside one connection and one commit.
+
+        Nested calls join the outer unit of work. The transaction is rolled back
+        if the block raises, if any statement inside it failed, or if
+        ``set_rollback_only`` was called.
+        """
+        current = self.current_transaction
+        if current is not None:
+            yield current
+            return
+
+        self._stick_to_primary()
+        with self.get_connection() as conn:
+            tx = Transaction(conn)
+            self._local.transaction = tx
+            try:
+                yield tx
+                if not tx.committed:
+                    conn.rollback()
+            finally:
+                self._local.transaction = None
+
+        if tx.committed:
+            for callback in tx._after_commit:
+                callback()
+
+    @contextmanager
+    def _session(self, query=None):
+        tx = self.current_transaction
+        if tx is None:
+            if self._routes_to_replica(query):
+                with self.replica_connection() as conn:
+                    yield conn
+                return
+            if not is_read_statement(query):
+                self._stick_to_primary()
             with self.get_connection() as conn:
+                yield conn
+            return
+
+        try:
+            yield tx.connection
+        except Exception:
+            tx.failed = True
+            raise
+
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        return self._pool.stats() if self._pool is not None else None
+
+    def replica_stats(self) -> Optional[List[Dict[str, Any]]]:
+        return self.replicas.stats() if self.replicas is not None else None
+
+    def reset_after_fork(self) -> None:
+        """Forget connections inherited from the parent process.
+
+        They are dropped without being closed: closing would terminate the
+        parent's sessions over the shared sockets. The child builds its own
+        pool on first use.
+        """
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        for replica in self.replicas.replicas if self.replicas else ():
+            replica.pool = None
+
+    def close(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+            for replica in self.replicas.replicas if self.replicas else ():
+                if replica.pool is not None:
+                    replica.pool.closeall()
+                    replica.pool = None
+
+    @_replica_failover
+    def execute_query(self, query: str, params: tuple = None, fetch: bool = True) -> Optional[List[Dict[str, Any]]]:
+        try:
+            with self._session(query) as conn:
                 with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    started = time.perf_counter()
                     cursor.execute(query, params or ())
                     if fetch:
-                        return [dict(row) for row in cursor.fetchall()]
+                        rows = [dict(row) for row in cursor.fetchall()]
+                        instrumentation.record_query(query, params, started, len(rows))
+                        return rows
+                    instrumentation.record_query(query, params, started, cursor.rowcount)
                     return None
         except Exception as e:
-            print(f"Database query error: {e}")
+            logger.error("Database query error: %s", e)
             return None
 
+    @_replica_failover
     def execute_one(self, query: str, params: tuple = None) -> Optional[Dict[str, Any]]:
         try:
-            with self.get_connection() as conn:
+            with self._session(query) as conn:
                 with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    started = time.perf_counter()
                     cursor.execute(query, params or ())
                     result = cursor.fetchone()
+                    instrumentation.record_query(query, params, started, 1 if result else 0)
                     return dict(result) if result else None
         except Exception as e:
-            print(f"Database query error: {e}")
+            logger.error("Database query error: %s", e)
             return None
 
+    def execute_values(self, query: str, rows: List[tuple], template: str = None, page_size: int = 1000,
+                       fetch: bool = True) -> Optional[List[Dict[str, Any]]]:
+        """Multi-row statement (``VALUES %s``) via ``psycopg2.extras.execute_values``."""
+        try:
+            with self._session(query) as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    started = time.perf_counter()
+                    result = psycopg2.extras.execute_values(cursor, query, rows, template=template,
+                                                            page_size=page_size, fetch=fetch)
+                    instrumentation.record_query(query, None, started, len(result) if fetch else len(rows))
+                    return [dict(row) for row in result] if fetch else None
+        except Exception as e:
+            logger.error("Database query error: %s", e)
+            return None
+
+    def stream_query(self, query: str, params: tuple = None, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """Yield result rows in batches from a server-side (named) cursor.
+
+        Uses a dedicated connection that is held until the generator is
+        exhausted or closed, so memory stays bounded by ``batch_size``. The
+        replica decision is made here, when the stream is created, because
+        the rows are usually consumed after the calling method has returned.
+        """
+        connection = self.replica_connection if self._routes_to_replica(query) else self.get_connection
+        return self._stream(connection, query, params, batch_size)
+
+    @staticmethod
+    def _stream(connection, query: str, params: tuple, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        with connection() as conn:
+            with conn.cursor(name=f'stream_{uuid.uuid4().hex}',
+                             cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                cursor.itersize = batch_size
+                started = time.perf_counter()
+                cursor.execute(query, params or ())
+                instrumentation.record_query(query, params, started, 0)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield [dict(row) for row in rows]
+
     def set_rls_context(self, user_id: str, user_role: str) -> None:
         try:
-            with self.get_connection() as conn:
+            with self._session() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(f"SET app.current_user_id = '{user_id}'")
-                    cursor.execute(f"SET app.current_user_role = '{user_role}'")
+                    # Transaction-local so the settings never leak to the next
+                    # borrower of a pooled connection.
+                    cursor.execute("SELECT set_config('app.current_user_id', %s, true)", (user_id,))
+                    cursor.execute("SELECT set_config('app.current_user_role', %s, true)", (user_role,))
         except Exception as e:
-            print(f"Failed to set RLS context: {e}")
+            logger.error("Failed to set RLS context: %s", e)
 
 db_client = DatabaseClient()
+
+def transactional(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        with db_client.transaction():
+            return f(*args, **kwargs)
+
+    return decorated
+
+def read_only(f):
+    """Let a service method's reads go to a read replica (see ``DatabaseClient``)."""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        with db_client.read_only():
+            return f(*args, **kwargs)
+
+    return decorated
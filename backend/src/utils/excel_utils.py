@@ -0,0 +1,138 @@
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterator, List, Optional
+import re
+import openpyxl
+import pandas as pd
+
+# Header spellings accepted for each budget field, compared after normalisation
+# (lower case, alphanumerics only).
+COLUMN_SYNONYMS = {
+    'category': ['category', 'costcategory', 'expensecategory', 'budgetcategory', 'budgethead', 'costhead',
+                 'head', 'account', 'glaccount', 'costcentre', 'costcenter'],
+    'amount': ['amount', 'totalamount', 'cost', 'totalcost', 'estimatedcost', 'value', 'budget',
+               'budgetamount', 'price', 'totalprice', 'spend'],
+    'type': ['type', 'budgettype', 'expensetype', 'capexopex', 'opexcapex', 'nature', 'classification'],
+    'description': ['description', 'item', 'itemdescription', 'details', 'particulars', 'name',
+                    'lineitem', 'remarks', 'purpose']
+}
+
+TYPE_VALUES = {
+    'capex': 'CAPEX', 'capital': 'CAPEX', 'capitalexpenditure': 'CAPEX',
+    'opex': 'OPEX', 'operating': 'OPEX', 'operational': 'OPEX', 'operatingexpenditure': 'OPEX',
+    'revenue': 'OPEX'
+}
+
+def _normalise(value: Any) -> str:
+    return re.sub(r'[^a-z0-9]', '', str(value).lower()) if value is not None else ''
+
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+def parse_amount(value: Any) -> Optional[float]:
+    """Parse numbers such as ``1,250.50``, ``$ 300`` or ``(45)``; ``None`` if not a number."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float, Decimal)):
+        return None if value != value else float(value)
+
+    text = str(value).strip()
+    negative = text.startswith('(') and text.endswith(')')
+    text = re.sub(r'[^0-9.\-]', '', text)
+    if not text:
+        return None
+    try:
+        amount = float(Decimal(text))
+    except InvalidOperation:
+        return None
+    return -amount if negative else amount
+
+def parse_type(value: Any) -> Optional[str]:
+    return TYPE_VALUES.get(_normalise(value))
+
+class ColumnMapper:
+    """Maps spreadsheet rows to budget items using header names alone.
+
+    Rows it cannot map (no recognisable amount, category or type) are left for
+    the LLM fallback; rows that are blank or look like subtotal lines are skipped.
+    """
+
+    def __init__(self, headers: List[Any], default_type: str = None):
+        self.headers = headers
+        self.default_type = default_type
+        self.columns = {}
+        normalised = [_normalise(header) for header in headers]
+        # Exact header matches win over prefix matches ("Amount (INR)") for every field.
+        for matches in (lambda name, synonyms: name in synonyms,
+                        lambda name, synonyms: any(name.startswith(synonym) for synonym in synonyms)):
+            for field, synonyms in COLUMN_SYNONYMS.items():
+                if field in self.columns:
+                    continue
+                for index, name in enumerate(normalised):
+                    if name and index not in self.columns.values() and matches(name, synonyms):
+                        self.columns[field] = index
+                        break
+
+    @property
+    def can_map(self) -> bool:
+        return 'amount' in self.columns and 'category' in self.columns
+
+    def _cell(self, values: tuple, field: str) -> Any:
+        index = self.columns.get(field)
+        return values[index] if index is not None and index < len(values) else None
+
+    def is_subtotal(self, values: tuple) -> bool:
+        for field in ('category', 'description'):
+            if _normalise(self._cell(values, field)) in ('total', 'subtotal', 'grandtotal'):
+                return True
+        return False
+
+    def map_row(self, values: tuple) -> Optional[Dict]:
+        if not self.can_map:
+            return None
+
+        amount = parse_amount(self._cell(values, 'amount'))
+        category = self._cell(values, 'category')
+        item_type = parse_type(self._cell(values, 'type')) or self.default_type
+        if amount is None or category in (None, '') or item_type is None:
+            return None
+
+        description = self._cell(values, 'description')
+        return {
+            'category': str(category).strip(),
+            'amount': amount,
+            'description': str(description).strip() if description not in (None, '') else '',
+            'type': item_type
+        }
+
+    def as_record(self, values: tuple) -> Dict:
+        return {str(header) if header is not None else f'column_{index + 1}': _json_safe(values[index])
+                for index, header in enumerate(self.headers) if index < len(values)}
+
+def iter_sheet_rows(stream, filename: str) -> Iterator[tuple]:
+    """Yield the first worksheet's rows as tuples without loading the whole workbook.
+
+    ``.xlsx`` files are read with openpyxl in read-only mode; legacy ``.xls``
+    files fall back to pandas.
+    """
+    if filename.lower().endswith('.xls'):
+        df = pd.read_excel(stream, header=None)
+        for values in df.itertuples(index=False, name=None):
+            yield tuple(_json_safe(value) for value in values)
+        return
+
+    workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+    try:
+        for values in workbook.worksheets[0].iter_rows(values_only=True):
+            yield values
+    finally:
+        workbook.close()
+
+def is_blank(values: tuple) -> bool:
+    return all(value is None or (isinstance(value, str) and not value.strip()) for value in values)
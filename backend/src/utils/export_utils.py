@@ -0,0 +1,43 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+def _export_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+def ndjson_chunks(batches: Iterable[List[Dict]]) -> Iterator[str]:
+    for batch in batches:
+        yield ''.join(json.dumps(row, default=_export_value) + '\n' for row in batch)
+
+def csv_chunks(batches: Iterable[List[Dict]], columns: List[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    yield buffer.getvalue()
+
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        for row in batch:
+            writer.writerow(['' if row.get(column) is None else _export_value(row.get(column)) for column in columns])
+        yield buffer.getvalue()
+
+def export_chunks(batches: Iterable[List[Dict]], export_format: str, columns: List[str]) -> Iterator[str]:
+    if export_format == 'csv':
+        return csv_chunks(batches, columns)
+    return ndjson_chunks(batches)
@@ -1,19 +1,94 @@
 import google.generativeai as genai
 from ..config.settings import config
+from .metrics import metrics, MODEL_BUCKETS
+from ..services.ai_cache_service import ai_cache, request_tag
+import hashlib
 import json
+import time
+
+class GeminiError(Exception):
+    pass
+
+class _FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGenerativeModel:
+    """Offline stand-in for ``genai.GenerativeModel`` (GEMINI_BACKEND=fake).
+
+    Replies are deterministic for a given prompt so tests and benchmarks can
+    run without network access or an API key.
+    """
+
+    def __init__(self, model_name: str, latency: float = 0):
+        self.model_name = model_name
+        self.latency = latency
+
+    def generate_content(self, prompt: str) -> _FakeResponse:
+        if self.latency:
+            time.sleep(self.latency)
+
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8]
+
+        if '"items"' in prompt:
+            return _FakeResponse(json.dumps({
+                'items': [],
+                'total': 0,
+                'summary': f'Offline extraction {digest}'
+            }))
+        if 'rationalization suggestions' in prompt:
+            return _FakeResponse(json.dumps([
+                f'Quantify the expected return of this request ({digest}).',
+                'Link the spend to a current business objective.',
+                'Compare the cost against at least one alternative.'
+            ]))
+        return _FakeResponse(f'Offline summary {digest}.')
+
+def _build_model():
+    if config.GEMINI_BACKEND == 'fake':
+        return FakeGenerativeModel(config.GEMINI_MODEL, config.FAKE_GEMINI_LATENCY_MS / 1000)
+    if config.GEMINI_API_KEY:
+        genai.configure(api_key=config.GEMINI_API_KEY)
+        return genai.GenerativeModel(config.GEMINI_MODEL)
+    return None
+
+model = _build_model()
+
+# Identifies the model behind cached responses.
+MODEL_ID = f'{config.GEMINI_BACKEND}:{config.GEMINI_MODEL}'
+
+# Cache function names; the suggestions job shares its entries with the wrapper below.
+SUGGESTIONS_FUNCTION = 'rationalization_suggestions'
+SUMMARY_FUNCTION = 'budget_summary'
+
+def _generate(function: str, prompt: str):
+    started = time.perf_counter()
+    try:
+        return model.generate_content(prompt)
+    except Exception:
+        metrics.inc('gemini_errors_total', {'function': function})
+        raise
+    finally:
+        metrics.observe('gemini_request_duration_seconds', time.perf_counter() - started,
+                        {'function': function}, MODEL_BUCKETS)
+
+def _parse_json_response(response) -> object:
+    result_text = response.text.strip()
+
+    if result_text.startswith('```json'):
+        result_text = result_text[7:]
+    if result_text.endswith('```'):
+        result_text = result_text[:-3]
+    result_text = result_text.strip()
 
-if config.GEMINI_API_KEY:
-    genai.configure(api_key=config.GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-pro')
-else:
-    model = None
+    return json.loads(result_text)
 
-def extract_budget_from_excel(file_content: str, file_data: dict) -> dict:
+def request_budget_extraction(file_content: str, file_data) -> dict:
+    """Ask the model to extract budget items; raises ``GeminiError`` on any failure."""
     if not model:
-        return {'error': 'Gemini API key not configured'}
+        raise GeminiError('Gemini API key not configured')
 
-    try:
-        prompt = f"""
+    prompt = f"""
         You are a financial data extraction assistant. Extract budget information from the following Excel data.
 
         Excel Data:
@@ -36,25 +111,17 @@ def extract_budget_from_excel(file_content: str, file_data: dict) -> dict:
         Return only valid JSON, no additional text.
         """
 
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-
-        if result_text.startswith('```json'):
-            result_text = result_text[7:]
-        if result_text.endswith('```'):
-            result_text = result_text[:-3]
-        result_text = result_text.strip()
-
-        return json.loads(result_text)
+    try:
+        return _parse_json_response(_generate('budget_extraction', prompt))
     except Exception as e:
-        return {'error': f'Failed to extract budget data: {str(e)}'}
+        raise GeminiError(f'Failed to extract budget data: {str(e)}')
 
-def generate_rationalization_suggestions(justification: str, amount: float, category: str) -> list:
+def request_rationalization_suggestions(justification: str, amount: float, category: str) -> list:
+    """Ask the model for suggestions; raises ``GeminiError`` on any failure."""
     if not model:
-        return []
+        raise GeminiError('Gemini API key not configured')
 
-    try:
-        prompt = f"""
+    prompt = f"""
         Generate 3 professional rationalization suggestions for a budget request with the following details:
 
         Category: {category}
@@ -65,25 +132,29 @@ def generate_rationalization_suggestions(justification: str, amount: float, cate
         Return only valid JSON, no additional text.
         """
 
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-
-        if result_text.startswith('```json'):
-            result_text = result_text[7:]
-        if result_text.endswith('```'):
-            result_text = result_text[:-3]
-        result_text = result_text.strip()
+    try:
+        return _parse_json_response(_generate('rationalization_suggestions', prompt))
+    except Exception as e:
+        raise GeminiError(f'Failed to generate suggestions: {str(e)}')
 
-        return json.loads(result_text)
-    except Exception:
+def generate_rationalization_suggestions(justification: str, amount: float, category: str,
+                                         request_id: str = None) -> list:
+    inputs = {'justification': justification, 'amount': float(amount), 'category': category}
+    try:
+        return ai_cache.get_or_compute(
+            SUGGESTIONS_FUNCTION, inputs, MODEL_ID,
+            lambda: request_rationalization_suggestions(justification, inputs['amount'], category),
+            tag=request_tag(request_id) if request_id else None
+        )
+    except GeminiError:
         return []
 
-def summarize_budget_request(request_data: dict) -> str:
+def request_budget_summary(request_data: dict) -> str:
+    """Ask the model for an executive summary; raises ``GeminiError`` on any failure."""
     if not model:
-        return "Summary generation unavailable"
+        raise GeminiError('Gemini API key not configured')
 
-    try:
-        prompt = f"""
+    prompt = f"""
         Create a brief executive summary (2-3 sentences) for this budget request:
 
         Type: {request_data.get('type')}
@@ -94,7 +165,23 @@ def summarize_budget_request(request_data: dict) -> str:
         Focus on business value and impact. Be concise and professional.
         """
 
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    except Exception:
+    try:
+        return _generate(SUMMARY_FUNCTION, prompt).text.strip()
+    except Exception as e:
+        raise GeminiError(f'Failed to generate summary: {str(e)}')
+
+def summarize_budget_request(request_data: dict) -> str:
+    if not model:
+        return "Summary generation unavailable"
+
+    inputs = {
+        'type': request_data.get('type'),
+        'category': request_data.get('category'),
+        'amount': float(request_data.get('amount') or 0),
+        'justification': request_data.get('justification')
+    }
+    try:
+        return ai_cache.get_or_compute(SUMMARY_FUNCTION, inputs, MODEL_ID, lambda: request_budget_summary(inputs),
+                                       tag=request_tag(request_data['id']) if request_data.get('id') else None)
+    except GeminiError:
         return "Summary generation failed"
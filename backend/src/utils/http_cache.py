@@ -0,0 +1,84 @@
+import hashlib
+from functools import wraps
+from typing import Optional, Sequence
+from flask import Blueprint, Response, make_response, request
+from ..config.settings import config
+from .db_utils import db_client
+
+# Cache-Control policies, applied per blueprint with ``cache_policy``.
+NO_STORE = 'no-store'
+PRIVATE_REVALIDATE = 'private, no-cache'
+
+def table_versions(tables: Sequence[str]) -> Optional[str]:
+    """Current versions of ``tables``, e.g. ``'12.3.7'``; ``None`` if they cannot be read.
+
+    A table's version is the sum of its per-backend counters in
+    ``table_versions``. Read with the same replica routing as the endpoint's
+    own reads, so the versions are never newer than the rows they are paired with.
+    """
+    with db_client.read_only():
+        rows = db_client.execute_query(
+            "SELECT table_name, SUM(version)::bigint AS version FROM table_versions "
+            "WHERE table_name = ANY(%s) GROUP BY table_name", (list(tables),)
+        )
+    if rows is None:
+        return None
+    versions = {row['table_name']: row['version'] for row in rows}
+    return '.'.join(str(versions.get(table, 0)) for table in tables)
+
+def compact_versions() -> Optional[int]:
+    """Fold the per-backend ``table_versions`` counters into one row per table; returns the rows folded.
+
+    Versions are unchanged. Each backend that ever wrote leaves a counter, so
+    this keeps the sums in ``table_versions()`` short.
+    """
+    row = db_client.execute_one("SELECT compact_table_versions() AS folded")
+    return row['folded'] if row else None
+
+def _etag(versions: str) -> str:
+    # The body also depends on the caller (row visibility, role) and the URL;
+    # hash those, never the body itself.
+    scope = '|'.join([config.HTTP_CACHE_SALT, getattr(request, 'user_id', '') or '',
+                      getattr(request, 'user_role', '') or '', request.full_path])
+    return f"{versions}-{hashlib.sha1(scope.encode('utf-8')).hexdigest()[:16]}"
+
+def conditional(*tables: str):
+    """Weak ETag / ``If-None-Match`` support for a GET endpoint whose body depends only on ``tables``.
+
+    A matching ``If-None-Match`` is answered with 304 before the view runs.
+    Apply below ``token_required`` so the caller is known.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if not config.HTTP_ETAGS_ENABLED:
+                return f(*args, **kwargs)
+
+            versions = table_versions(tables)
+            if versions is None:
+                return f(*args, **kwargs)
+
+            etag = _etag(versions)
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+                response.set_etag(etag, weak=True)
+                return response
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag, weak=True)
+            return response
+
+        return decorated
+    return decorator
+
+def cache_policy(blueprint: Blueprint, value: str) -> None:
+    """Send ``Cache-Control: value`` on the blueprint's responses unless a view set its own.
+
+    Call before the blueprint is registered.
+    """
+    @blueprint.after_request
+    def set_cache_control(response):
+        response.headers.setdefault('Cache-Control', value)
+        response.vary.add('Authorization')
+        return response
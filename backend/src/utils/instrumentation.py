@@ -0,0 +1,120 @@
+from ..config.settings import config
+from .metrics import metrics, QUERY_BUCKETS
+from typing import Dict, Optional
+import json
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger('budgetx.sql')
+request_logger = logging.getLogger('budgetx.request')
+
+_local = threading.local()
+
+def _normalise_statement(query: str) -> str:
+    return re.sub(r'\s+', ' ', query).strip()
+
+def _redact(params) -> str:
+    """Describe parameters by type only so values never reach the logs."""
+    if params is None:
+        return '()'
+    if isinstance(params, dict):
+        return '{' + ', '.join(f'{key}: {type(value).__name__}' for key, value in params.items()) + '}'
+    return '(' + ', '.join(type(value).__name__ for value in params) + ')'
+
+class RequestStats:
+    """SQL activity of one HTTP request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.acquire_time = 0.0
+        self.rows = 0
+        self.statements = {}
+        self.flagged = set()
+
+    def record_query(self, query: str, params, duration: float, rows: int) -> None:
+        self.queries += 1
+        self.db_time += duration
+        self.rows += max(rows, 0)
+
+        statement = _normalise_statement(query)
+        count = self.statements.get(statement, 0) + 1
+        self.statements[statement] = count
+        if count > config.N_PLUS_ONE_THRESHOLD and statement not in self.flagged:
+            self.flagged.add(statement)
+            logger.warning(json.dumps({
+                'event': 'n_plus_one',
+                'statement': statement[:500],
+                'executions': count,
+                'threshold': config.N_PLUS_ONE_THRESHOLD
+            }))
+
+    def summary(self) -> Dict:
+        return {
+            'db_queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 2),
+            'db_acquire_ms': round(self.acquire_time * 1000, 2),
+            'db_rows': self.rows,
+            'n_plus_one': len(self.flagged)
+        }
+
+def begin_request() -> None:
+    _local.stats = RequestStats() if config.SQL_INSTRUMENTATION else None
+
+def end_request() -> Optional[RequestStats]:
+    stats = getattr(_local, 'stats', None)
+    _local.stats = None
+    return stats
+
+def current() -> Optional[RequestStats]:
+    return getattr(_local, 'stats', None)
+
+def record_query(query, params, started: float, rows: int) -> None:
+    """Called by ``DatabaseClient`` after each statement; ``started`` is a ``perf_counter`` value."""
+    duration = time.perf_counter() - started
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', 'replace')
+
+    if duration * 1000 >= config.SLOW_QUERY_MS:
+        logger.warning(json.dumps({
+            'event': 'slow_query',
+            'duration_ms': round(duration * 1000, 2),
+            'statement': _normalise_statement(query)[:2000],
+            'params': _redact(params),
+            'rows': rows
+        }))
+
+    metrics.inc('db_queries_total')
+    metrics.observe('db_query_duration_seconds', duration, buckets=QUERY_BUCKETS)
+
+    stats = current()
+    if stats is not None:
+        stats.record_query(query, params, duration, rows)
+
+def record_acquire(started: float) -> None:
+    stats = current()
+    if stats is not None:
+        stats.acquire_time += time.perf_counter() - started
+
+def server_timing(stats: RequestStats, total: float) -> str:
+    summary = stats.summary()
+    return ', '.join([
+        f'db;dur={summary["db_ms"]};desc="{summary["db_queries"]} queries, {summary["db_rows"]} rows"',
+        f'db-acquire;dur={summary["db_acquire_ms"]}',
+        f'app;dur={round(total * 1000, 2)}'
+    ])
+
+def log_request(method: str, path: str, status: int, stats: RequestStats, total: float) -> None:
+    if not config.REQUEST_LOG:
+        return
+    request_logger.info(json.dumps({
+        'event': 'request',
+        'method': method,
+        'path': path,
+        'status': status,
+        'duration_ms': round(total * 1000, 2),
+        **stats.summary()
+    }))
@@ -0,0 +1,269 @@
+from ..config.settings import config
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+MODEL_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# name -> (type, help). Only metrics listed here are exported.
+METRICS = {
+    'http_requests_total': ('counter', 'HTTP requests by endpoint, method and status code'),
+    'http_request_duration_seconds': ('histogram', 'HTTP request latency by endpoint and method'),
+    'http_requests_in_flight': ('gauge', 'HTTP requests currently being served'),
+    'db_queries_total': ('counter', 'SQL statements executed'),
+    'db_query_duration_seconds': ('histogram', 'SQL statement execution time'),
+    'db_pool_connections': ('gauge', 'Pooled database connections by state'),
+    'db_pool_waiting': ('gauge', 'Threads waiting for a pooled connection'),
+    'db_pool_checkouts_total': ('counter', 'Connections checked out of the pool'),
+    'db_pool_timeouts_total': ('counter', 'Checkouts that timed out waiting for a connection'),
+    'db_replica_up': ('gauge', 'Read replicas currently in rotation (1) or ejected (0)'),
+    'db_replica_reads_total': ('counter', 'Connections checked out for reads by replica'),
+    'db_replica_ejections_total': ('counter', 'Times a replica was taken out of rotation'),
+    'gemini_request_duration_seconds': ('histogram', 'Gemini call latency by function'),
+    'gemini_errors_total': ('counter', 'Failed Gemini calls by function'),
+    'audit_queue_depth': ('gauge', 'Audit rows waiting to be written'),
+    'audit_rows_written_total': ('counter', 'Audit rows written by the background writer'),
+    'audit_rows_failed_total': ('counter', 'Audit rows that could not be written'),
+    'jobs_active': ('gauge', 'Background jobs currently running'),
+    'cache_hits_total': ('counter', 'Cache hits by cache'),
+    'cache_misses_total': ('counter', 'Cache misses by cache'),
+    'cache_hit_ratio': ('gauge', 'Cache hits / lookups by cache, across all processes'),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _labels(labels: Optional[Dict[str, str]]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in (labels or {}).items()))
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    pairs = []
+    for key, value in labels:
+        escaped = value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        pairs.append(f'{key}="{escaped}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class MetricsRegistry:
+    """In-process counters, gauges and histograms.
+
+    Hot-path updates are a dict operation under one lock. Values that other
+    components already track (pool, audit queue, caches) are read by
+    collectors only when a snapshot is taken. With ``METRICS_DIR`` set, every
+    process writes its snapshot to ``<dir>/<pid>.json`` and ``/metrics``
+    merges all of them, so any gunicorn worker can answer a scrape.
+    """
+
+    def __init__(self, directory: str = None, flush_interval: float = 5):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._collectors = []
+        self._flusher_pid = None
+
+    def inc(self, name: str, labels: Dict[str, str] = None, value: float = 1) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_counter(self, name: str, value: float, labels: Dict[str, str] = None) -> None:
+        """Set a cumulative count tracked elsewhere (e.g. pool checkouts) from a collector."""
+        with self._lock:
+            self._counters[(name, _labels(labels))] = value
+
+    def set_gauge(self, name: str, value: float, labels: Dict[str, str] = None) -> None:
+        with self._lock:
+            self._gauges[(name, _labels(labels))] = value
+
+    def add_gauge(self, name: str, value: float, labels: Dict[str, str] = None) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Dict[str, str] = None,
+                buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': list(buckets), 'counts': [0] * len(buckets),
+                                                     'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(histogram['buckets']):
+                if value <= bound:
+                    histogram['counts'][index] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def register_collector(self, collector: Callable[['MetricsRegistry'], None]) -> None:
+        """``collector(registry)`` runs before each snapshot and should only set values."""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> Dict:
+        for collector in self._collectors:
+            try:
+                collector(self)
+            except Exception as e:
+                logger.warning("Metrics collector failed: %s", e)
+
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'gauges': [[name, list(labels), value] for (name, labels), value in self._gauges.items()],
+                'histograms': [[name, list(labels), dict(h, counts=list(h['counts']))]
+                               for (name, labels), h in self._histograms.items()]
+            }
+
+    def maybe_flush(self) -> None:
+        """Make sure this process publishes snapshots; cheap after the first call.
+
+        A daemon thread rewrites the snapshot every ``flush_interval`` seconds,
+        so idle workers stay current too.
+        """
+        if not self.directory or self._flusher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name='metrics-flusher', daemon=True).start()
+        self.flush()
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f'{os.getpid()}.json')
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w') as handle:
+                json.dump(self.snapshot(), handle)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write metrics snapshot: %s", e)
+
+    def _snapshots(self) -> List[Dict]:
+        own = self.snapshot()
+        if not self.directory:
+            return [own]
+
+        snapshots = [own]
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return snapshots
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            try:
+                pid = int(name[:-5])
+            except ValueError:
+                continue
+            if pid == own['pid']:
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as handle:
+                    snapshot = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            # Counters of exited workers still count; their gauges do not.
+            if not _pid_alive(pid):
+                snapshot['gauges'] = []
+            snapshots.append(snapshot)
+        return snapshots
+
+    def render(self) -> str:
+        counters = {}
+        gauges = {}
+        histograms = {}
+        for snapshot in self._snapshots():
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, value in snapshot['gauges']:
+                key = (name, tuple(map(tuple, labels)))
+                gauges[key] = gauges.get(key, 0) + value
+            for name, labels, histogram in snapshot['histograms']:
+                key = (name, tuple(map(tuple, labels)))
+                merged = histograms.get(key)
+                if merged is None or merged['buckets'] != histogram['buckets']:
+                    histograms[key] = dict(histogram, counts=list(histogram['counts']))
+                    continue
+                merged['counts'] = [a + b for a, b in zip(merged['counts'], histogram['counts'])]
+                merged['sum'] += histogram['sum']
+                merged['count'] += histogram['count']
+
+        for (name, labels), hits in list(counters.items()):
+            if name == 'cache_hits_total':
+                misses = counters.get(('cache_misses_total', labels), 0)
+                gauges[('cache_hit_ratio', labels)] = hits / (hits + misses) if hits + misses else 0.0
+
+        lines = []
+        for name, (metric_type, help_text) in METRICS.items():
+            source = {'counter': counters, 'gauge': gauges, 'histogram': histograms}[metric_type]
+            series = sorted((labels, value) for (metric, labels), value in source.items() if metric == name)
+            if not series:
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            for labels, value in series:
+                if metric_type != 'histogram':
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(value['buckets'], value['counts']):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", _format_value(bound)),))} {cumulative}')
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {value["count"]}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(value["sum"])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {value["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """Drop values inherited from a parent process (call after fork)."""
+        with self._lock:
+            self._counters = {}
+            self._gauges = {}
+            self._histograms = {}
+
+    def clear_directory(self) -> None:
+        """Remove all snapshot files; call once in the master before workers start."""
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith('.json') or name.endswith('.json.tmp'):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+metrics = MetricsRegistry(config.METRICS_DIR, config.METRICS_FLUSH_INTERVAL)
@@ -0,0 +1,101 @@
+from .db_utils import db_client
+from typing import Callable, Dict, Optional, Tuple
+import logging
+import os
+import select
+import threading
+import time
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+# How often the listener wakes up to LISTEN on channels subscribed since it connected.
+POLL_SECONDS = 5
+
+def publish(channel: str, payload: str = '') -> None:
+    """``pg_notify`` on ``channel``; inside a transaction it is only delivered once that commits."""
+    db_client.execute_query("SELECT pg_notify(%s, %s)", (channel, payload), fetch=False)
+
+class NotificationListener:
+    """One Postgres ``LISTEN`` connection per worker process, shared by every in-process cache.
+
+    ``subscribe`` registers ``on_notify(payload)``, run on the listener thread
+    for each notification on the channel, and ``on_reconnect()``, run after
+    every (re)connect because notifications sent while disconnected are lost.
+    ``ensure_started`` starts the thread in the current process; call it from
+    the worker, not from a master that forks afterwards.
+    """
+
+    def __init__(self):
+        self._subscriptions: Dict[str, Tuple[Callable[[str], None], Optional[Callable[[], None]]]] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def subscribe(self, channel: str, on_notify: Callable[[str], None],
+                  on_reconnect: Callable[[], None] = None) -> None:
+        with self._lock:
+            self._subscriptions[channel] = (on_notify, on_reconnect)
+
+    def ensure_started(self) -> None:
+        if not self._subscriptions or not db_client.connection_string:
+            return
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='notification-listener', daemon=True)
+                self._thread.start()
+
+    def _dispatch(self, callback, *args) -> None:
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error("Notification handler error: %s", e)
+
+    def _listen_new(self, conn, listening: set) -> None:
+        with self._lock:
+            subscriptions = dict(self._subscriptions)
+        for channel, (_, on_reconnect) in subscriptions.items():
+            if channel in listening:
+                continue
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {channel}")
+            listening.add(channel)
+            # Anything published before we listened is unknown to us.
+            if on_reconnect:
+                self._dispatch(on_reconnect)
+
+    def _run(self) -> None:
+        backoff = 1
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(db_client.connection_string)
+                conn.autocommit = True
+                listening = set()
+                self._listen_new(conn, listening)
+                backoff = 1
+                while True:
+                    if select.select([conn], [], [], POLL_SECONDS) == ([], [], []):
+                        self._listen_new(conn, listening)
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        subscription = self._subscriptions.get(notify.channel)
+                        if subscription:
+                            self._dispatch(subscription[0], notify.payload)
+            except Exception as e:
+                logger.warning("Notification listener error: %s", e)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+
+notification_listener = NotificationListener()
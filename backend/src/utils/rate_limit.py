@@ -0,0 +1,54 @@
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+class RateLimiter:
+    """In-process sliding-window limiter: at most ``limit`` hits per key per ``window`` seconds."""
+
+    def __init__(self, limit: int, window: float, max_keys: int = 100000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._hits = {}
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def hit(self, key: str) -> float:
+        """Record a hit; return 0 if allowed, otherwise seconds until the key may retry."""
+        if self.limit <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                if len(self._hits) >= self.max_keys:
+                    self._prune(now)
+                hits = self._hits[key] = deque()
+
+            while hits and hits[0] <= now - self.window:
+                hits.popleft()
+
+            if len(hits) >= self.limit:
+                self.rejected += 1
+                return max(hits[0] + self.window - now, 0.001)
+
+            hits.append(now)
+            return 0.0
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._hits.pop(key, None)
+
+    def _prune(self, now: float) -> None:
+        stale = [key for key, hits in self._hits.items() if not hits or hits[-1] <= now - self.window]
+        for key in stale:
+            del self._hits[key]
+        # Still full of active keys: forget the oldest half rather than grow without bound.
+        if len(self._hits) >= self.max_keys:
+            for key in list(self._hits)[:len(self._hits) // 2]:
+                del self._hits[key]
+
+    def stats(self) -> Dict:
+        return {'tracked_keys': len(self._hits), 'rejected': self.rejected}
@@ -34,8 +34,8 @@ export default function DashboardPage() {
       }
 
       if (user?.role === 'REQUESTOR' || user?.role === 'SUPER_ADMIN') {
-        const requestsRes = await requestsAPI.getAll();
-        setRecentRequests(requestsRes.data.slice(0, 5));
+        const requestsPage = await requestsAPI.list({ limit: 5 });
+        setRecentRequests(requestsPage.items);
       }
 
       if (['TECH_LEAD', 'DEPT_HEAD', 'FINANCE_ADMIN', 'FPNA', 'PRINCIPAL_FINANCE', 'CFO', 'SUPER_ADMIN'].includes(user?.role || '')) {
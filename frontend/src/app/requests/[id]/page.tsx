@@ -12,6 +12,9 @@ export default function RequestDetailPage() {
   const [request, setRequest] = useState<any>(null);
   const [timeline, setTimeline] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
+  const [suggestions, setSuggestions] = useState<string[] | null>(null);
+  const [suggestionsLoading, setSuggestionsLoading] = useState(false);
+  const [suggestionsError, setSuggestionsError] = useState('');
 
   useEffect(() => {
     loadRequestDetails();
@@ -32,6 +35,18 @@ export default function RequestDetailPage() {
     }
   };
 
+  const loadSuggestions = async () => {
+    setSuggestionsError('');
+    setSuggestionsLoading(true);
+    try {
+      setSuggestions(await requestsAPI.getSuggestions(requestId));
+    } catch (err: any) {
+      setSuggestionsError(err.response?.data?.error || err.message || 'Failed to load suggestions');
+    } finally {
+      setSuggestionsLoading(false);
+    }
+  };
+
   const getStatusBadge = (status: string) => {
     const badges: any = {
       DRAFT: 'badge-info',
@@ -110,6 +125,34 @@ export default function RequestDetailPage() {
         </div>
       </div>
 
+      <div className="card mb-6">
+        <div className="flex justify-between items-center mb-4">
+          <h2 className="text-2xl font-bold text-gray-900">AI Suggestions</h2>
+          <button
+            onClick={loadSuggestions}
+            disabled={suggestionsLoading}
+            className="btn-secondary"
+          >
+            {suggestionsLoading ? 'Generating...' : suggestions ? 'Refresh' : 'Get Suggestions'}
+          </button>
+        </div>
+        {suggestionsError && (
+          <div className="bg-red-50 border border-red-200 text-red-700 px-4 py-3 rounded-lg">
+            {suggestionsError}
+          </div>
+        )}
+        {suggestions && suggestions.length === 0 && (
+          <p className="text-gray-500">No suggestions available</p>
+        )}
+        {suggestions && suggestions.length > 0 && (
+          <ul className="list-disc pl-5 space-y-2 text-gray-700">
+            {suggestions.map((suggestion, index) => (
+              <li key={index}>{suggestion}</li>
+            ))}
+          </ul>
+        )}
+      </div>
+
       <div className="card">
         <h2 className="text-2xl font-bold text-gray-900 mb-6">Approval Timeline</h2>
         {timeline.length === 0 ? (
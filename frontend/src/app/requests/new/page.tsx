@@ -18,6 +18,8 @@ export default function NewRequestPage() {
   });
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
+  const [importedItems, setImportedItems] = useState<any[]>([]);
+  const [importing, setImporting] = useState(false);
 
   useEffect(() => {
     if (isAuthenticated) {
@@ -37,6 +39,37 @@ export default function NewRequestPage() {
     }
   };
 
+  const handleImport = async (e: React.ChangeEvent<HTMLInputElement>) => {
+    const file = e.target.files?.[0];
+    e.target.value = '';
+    if (!file) {
+      return;
+    }
+    setError('');
+    setImporting(true);
+    try {
+      const result = await requestsAPI.importExcel(file, formData.type as 'CAPEX' | 'OPEX');
+      setImportedItems(result.items || []);
+      if (!result.items?.length) {
+        setError('No budget items found in the file');
+      }
+    } catch (err: any) {
+      setError(err.response?.data?.error || err.message || 'Failed to import file');
+    } finally {
+      setImporting(false);
+    }
+  };
+
+  const applyImportedItem = (item: any) => {
+    setFormData({
+      ...formData,
+      type: item.type || formData.type,
+      amount: String(item.amount ?? ''),
+      category: item.category || '',
+      justification: item.description || formData.justification,
+    });
+  };
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     setError('');
@@ -59,6 +92,38 @@ export default function NewRequestPage() {
     <div className="container mx-auto px-4 py-8 max-w-2xl">
       <h1 className="text-3xl font-bold text-gray-900 mb-8">Create New Budget Request</h1>
 
+      <div className="card mb-6">
+        <label className="block text-sm font-medium text-gray-700 mb-2">
+          Import from Excel
+        </label>
+        <input
+          type="file"
+          accept=".xlsx,.xls"
+          onChange={handleImport}
+          disabled={importing}
+          className="input-field"
+        />
+        {importing && (
+          <p className="text-sm text-gray-500 mt-2">Reading the file...</p>
+        )}
+        {importedItems.length > 0 && (
+          <div className="mt-4 space-y-2">
+            <p className="text-sm text-gray-600">Select an item to fill in the form:</p>
+            {importedItems.map((item, index) => (
+              <button
+                key={index}
+                type="button"
+                onClick={() => applyImportedItem(item)}
+                className="w-full text-left p-3 rounded-lg border hover:bg-gray-50 flex justify-between"
+              >
+                <span>{item.category}{item.description ? ` - ${item.description}` : ''}</span>
+                <span className="font-semibold">{item.type} ${Number(item.amount).toLocaleString()}</span>
+              </button>
+            ))}
+          </div>
+        )}
+      </div>
+
       <form onSubmit={handleSubmit} className="card space-y-6">
         {error && (
           <div className="bg-red-50 border border-red-200 text-red-700 px-4 py-3 rounded-lg">
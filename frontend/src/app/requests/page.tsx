@@ -11,18 +11,24 @@ export default function RequestsPage() {
   const router = useRouter();
   const [requests, setRequests] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [filter, setFilter] = useState('ALL');
 
   useEffect(() => {
     if (isAuthenticated) {
       loadRequests();
     }
-  }, [isAuthenticated]);
+  }, [isAuthenticated, filter]);
+
+  const statusParam = () => (filter === 'ALL' ? undefined : filter);
 
   const loadRequests = async () => {
+    setLoading(true);
     try {
-      const response = await requestsAPI.getAll();
-      setRequests(response.data);
+      const page = await requestsAPI.list({ status: statusParam() });
+      setRequests(page.items);
+      setNextCursor(page.nextCursor);
     } catch (error) {
       console.error('Error loading requests:', error);
     } finally {
@@ -30,6 +36,20 @@ export default function RequestsPage() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await requestsAPI.list({ status: statusParam(), cursor: nextCursor });
+      setRequests((current) => [...current, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error loading more requests:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const getStatusBadge = (status: string) => {
     const badges: any = {
       DRAFT: 'badge-info',
@@ -42,11 +62,6 @@ export default function RequestsPage() {
     return badges[status] || 'badge-info';
   };
 
-  const filteredRequests = requests.filter((req) => {
-    if (filter === 'ALL') return true;
-    return req.status === filter;
-  });
-
   if (loading) {
     return (
       <div className="container mx-auto px-4 py-8">
@@ -87,12 +102,12 @@ export default function RequestsPage() {
       </div>
 
       <div className="space-y-4">
-        {filteredRequests.length === 0 ? (
+        {requests.length === 0 ? (
           <div className="card text-center py-12">
             <p className="text-gray-500">No requests found</p>
           </div>
         ) : (
-          filteredRequests.map((request) => (
+          requests.map((request) => (
             <div key={request.id} className="card hover:shadow-lg transition-shadow">
               <div className="flex justify-between items-start mb-4">
                 <div className="flex-1">
@@ -126,6 +141,14 @@ export default function RequestsPage() {
           ))
         )}
       </div>
+
+      {nextCursor && (
+        <div className="flex justify-center mt-6">
+          <button onClick={loadMore} disabled={loadingMore} className="btn-primary">
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
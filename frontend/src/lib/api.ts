@@ -50,31 +50,61 @@ export const usersAPI = {
 };
 
 export const requestsAPI = {
-  getAll: () => api.get('/requests'),
+  // One page, newest first; pass the returned nextCursor to get the next one.
+  list: async (params?: {
+    status?: string;
+    type?: string;
+    department_id?: string;
+    category?: string;
+    limit?: number;
+    cursor?: string;
+  }) => {
+    const response = await api.get('/requests', { params });
+    return {
+      items: response.data as any[],
+      nextCursor: (response.headers['x-next-cursor'] as string | undefined) || null,
+    };
+  },
   getById: (id: string) => api.get(`/requests/${id}`),
   create: (data: any) => api.post('/requests', data),
+  createBulk: (requests: any[], strict = false) =>
+    api.post('/requests/bulk', { requests, strict }),
   update: (id: string, data: any) => api.patch(`/requests/${id}`, data),
   submit: (id: string) => api.post(`/requests/${id}/submit`),
   delete: (id: string) => api.delete(`/requests/${id}`),
-  importExcel: (file: File) => {
+  // Resolves with the import result; rows sent to the model are awaited
+  // through their background job.
+  importExcel: async (file: File, type?: 'CAPEX' | 'OPEX') => {
     const formData = new FormData();
     formData.append('file', file);
-    return api.post('/requests/import/excel', formData, {
+    if (type) {
+      formData.append('type', type);
+    }
+    const response = await api.post('/requests/import/excel', formData, {
       headers: { 'Content-Type': 'multipart/form-data' },
     });
+    return response.status === 202 ? jobsAPI.wait(response.data.job_id) : response.data;
+  },
+  // Cached suggestions come back at once; otherwise the queued job is awaited.
+  getSuggestions: async (id: string): Promise<string[]> => {
+    const response = await api.get(`/requests/${id}/suggestions`);
+    const result = response.status === 202 ? await jobsAPI.wait(response.data.job_id) : response.data;
+    return result.suggestions || [];
   },
-  getSuggestions: (id: string) => api.get(`/requests/${id}/suggestions`),
 };
 
 export const approvalsAPI = {
   getPending: () => api.get('/approvals/pending'),
   getTimeline: (requestId: string) => api.get(`/timeline/${requestId}`),
-  approve: (requestId: string, comments?: string) =>
-    api.post(`/requests/${requestId}/approve`, { comments }),
-  reject: (requestId: string, comments: string) =>
-    api.post(`/requests/${requestId}/reject`, { comments }),
-  rework: (requestId: string, comments: string) =>
-    api.post(`/requests/${requestId}/rework`, { comments }),
+  approve: (requestId: string, comments?: string, version?: number) =>
+    api.post(`/requests/${requestId}/approve`, { comments, version }),
+  reject: (requestId: string, comments: string, version?: number) =>
+    api.post(`/requests/${requestId}/reject`, { comments, version }),
+  rework: (requestId: string, comments: string, version?: number) =>
+    api.post(`/requests/${requestId}/rework`, { comments, version }),
+  decideBatch: (
+    items: { request_id: string; decision: 'APPROVED' | 'REJECTED' | 'REWORK'; comments?: string }[]
+  ) => api.post('/approvals/batch', { items }),
 };
 
 export const adminAPI = {
@@ -86,11 +116,57 @@ export const adminAPI = {
   getHierarchy: () => api.get('/admin/hierarchy'),
   updateHierarchy: (hierarchy: string[]) =>
     api.patch('/admin/hierarchy', { hierarchy }),
-  getAuditLogs: (limit?: number) =>
-    api.get('/admin/audit-logs', { params: { limit } }),
+  getAuditLogs: (params?: {
+    limit?: number;
+    cursor?: string;
+    user_id?: string;
+    action?: string;
+    from?: string;
+    to?: string;
+    [metadataKey: `metadata.${string}`]: string;
+  }) => api.get('/admin/audit-logs', { params }),
   getStats: () => api.get('/admin/stats'),
 };
 
+export const reportsAPI = {
+  getRollups: (params?: {
+    group_by?: string;
+    department_id?: string;
+    category?: string;
+    type?: string;
+    status?: string;
+    from?: string;
+    to?: string;
+  }) => api.get('/reports/rollups', { params }),
+  getSummary: (params?: {
+    group_by?: 'department' | 'category';
+    department_id?: string;
+    category?: string;
+    type?: string;
+    from?: string;
+    to?: string;
+  }) => api.get('/reports/rollups/summary', { params }),
+};
+
+export const jobsAPI = {
+  get: (id: string) => api.get(`/jobs/${id}`),
+  // Polls until the job succeeds (resolving with its result) or fails.
+  wait: async (id: string, { intervalMs = 1000, timeoutMs = 120000 } = {}) => {
+    const deadline = Date.now() + timeoutMs;
+    while (Date.now() < deadline) {
+      const { data: job } = await api.get(`/jobs/${id}`);
+      if (job.status === 'SUCCEEDED') {
+        return job.result;
+      }
+      if (job.status === 'FAILED') {
+        throw new Error(job.error || 'Background job failed');
+      }
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+    throw new Error('Timed out waiting for the background job');
+  },
+};
+
 export const healthAPI = {
   check: () => api.get('/health'),
 };
@@ -0,0 +1,65 @@
+/*
+  # Track the Current Approval Stage on Budget Requests
+
+  Stores the role expected to act next on a PENDING request so approver inboxes
+  can be served by an indexed lookup instead of replaying approval history.
+
+  ## Changes
+
+  1. Add `current_stage` column to `budget_requests`
+     - `current_stage` (text, nullable): Role of the next approver while the request is PENDING,
+       NULL in every other status
+
+  2. Backfill `current_stage` for existing PENDING requests
+     - Next role after the most recent approval record, following `system_config.approval_hierarchy`
+     - First role of the hierarchy when there is no approval record (or the last role is not in the hierarchy)
+
+  3. Add partial index `idx_budget_requests_pending_stage` on (current_stage, created_at) for PENDING requests
+
+  ## Notes
+  - The application keeps `current_stage` up to date on submit, approve, reject and rework
+*/
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'budget_requests' AND column_name = 'current_stage'
+  ) THEN
+    ALTER TABLE budget_requests ADD COLUMN current_stage TEXT;
+  END IF;
+END $$;
+
+WITH hierarchy AS (
+  SELECT h.role, h.position
+  FROM system_config sc,
+       jsonb_array_elements_text(sc.value::jsonb) WITH ORDINALITY AS h(role, position)
+  WHERE sc.key = 'approval_hierarchy'
+),
+last_approval AS (
+  SELECT DISTINCT ON (ar.request_id) ar.request_id, ar.role
+  FROM approval_records ar
+  JOIN budget_requests br ON br.id = ar.request_id
+  WHERE br.status = 'PENDING'
+  ORDER BY ar.request_id, ar.timestamp DESC
+)
+UPDATE budget_requests br
+SET current_stage = stage.next_role
+FROM (
+  SELECT p.id,
+         CASE
+           WHEN cur.position IS NULL THEN (SELECT role FROM hierarchy WHERE position = 1)
+           ELSE nxt.role
+         END AS next_role
+  FROM budget_requests p
+  LEFT JOIN last_approval la ON la.request_id = p.id
+  LEFT JOIN hierarchy cur ON cur.role = la.role
+  LEFT JOIN hierarchy nxt ON nxt.position = cur.position + 1
+  WHERE p.status = 'PENDING'
+) stage
+WHERE br.id = stage.id
+  AND br.current_stage IS DISTINCT FROM stage.next_role;
+
+CREATE INDEX IF NOT EXISTS idx_budget_requests_pending_stage
+  ON budget_requests(current_stage, created_at)
+  WHERE status = 'PENDING';
@@ -0,0 +1,40 @@
+/*
+  # Indexes for Keyset Pagination of Budget Requests
+
+  Supports `GET /requests`, which pages on (created_at, id) newest first and
+  pushes its status, type, department, category, amount and date filters into SQL.
+
+  ## Changes
+
+  1. Make `budget_requests.created_at` NOT NULL
+     - Existing NULLs are backfilled from `updated_at` (or now()) so the keyset
+       comparison `(created_at, id) < (...)` never skips rows
+
+  2. Add composite indexes ending in (created_at DESC, id DESC)
+     - `idx_budget_requests_created_id`: unfiltered listing and date/amount/category filters
+     - `idx_budget_requests_requester_created`: REQUESTOR listing of own requests
+     - `idx_budget_requests_status_created`: status filter
+     - `idx_budget_requests_department_created`: department filter
+     - `idx_budget_requests_type_created`: CAPEX/OPEX filter
+*/
+
+UPDATE budget_requests
+SET created_at = COALESCE(updated_at, now())
+WHERE created_at IS NULL;
+
+ALTER TABLE budget_requests ALTER COLUMN created_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_budget_requests_created_id
+  ON budget_requests(created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_budget_requests_requester_created
+  ON budget_requests(requester_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_budget_requests_status_created
+  ON budget_requests(status, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_budget_requests_department_created
+  ON budget_requests(department_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_budget_requests_type_created
+  ON budget_requests(type, created_at DESC, id DESC);
@@ -0,0 +1,66 @@
+/*
+  # Background Jobs
+
+  Persists asynchronous work (Excel import extraction, AI suggestions) so it is
+  processed off the request thread and survives API restarts.
+
+  ## New Tables
+
+  ### `jobs`
+  - `id` (text, primary key): Job identifier returned to the client
+  - `type` (text): Handler name, e.g. `excel_import`, `rationalization_suggestions`
+  - `status` (text): QUEUED, RUNNING, SUCCEEDED or FAILED
+  - `payload` (jsonb): Handler input
+  - `result` (jsonb, nullable): Handler output once SUCCEEDED
+  - `error` (text, nullable): Last error message
+  - `attempts` (integer): Number of times the job has been started
+  - `max_attempts` (integer): Attempts allowed before the job is marked FAILED
+  - `user_id` (text, nullable, foreign key): User who created the job
+  - `run_after` (timestamptz): Earliest time the job may (re)run; pushed back on retry
+  - `locked_until` (timestamptz, nullable): Lease of the worker running the job; expired leases are requeued
+  - `created_at`, `updated_at`, `started_at`, `finished_at` (timestamptz)
+
+  ## Indexes
+  - `idx_jobs_runnable` on (run_after) for QUEUED jobs: worker claim query
+  - `idx_jobs_running_lease` on (locked_until) for RUNNING jobs: lease expiry sweep
+  - `idx_jobs_user` on (user_id, created_at)
+
+  ## Security
+  - RLS enabled; users can read their own jobs, SUPER_ADMIN can read all
+*/
+
+CREATE TABLE IF NOT EXISTS jobs (
+  id TEXT PRIMARY KEY,
+  type TEXT NOT NULL,
+  status TEXT NOT NULL DEFAULT 'QUEUED',
+  payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+  result JSONB,
+  error TEXT,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  max_attempts INTEGER NOT NULL DEFAULT 3,
+  user_id TEXT REFERENCES users(id) ON DELETE SET NULL,
+  run_after TIMESTAMPTZ NOT NULL DEFAULT now(),
+  locked_until TIMESTAMPTZ,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  started_at TIMESTAMPTZ,
+  finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_runnable ON jobs(run_after) WHERE status = 'QUEUED';
+CREATE INDEX IF NOT EXISTS idx_jobs_running_lease ON jobs(locked_until) WHERE status = 'RUNNING';
+CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs(user_id, created_at);
+
+ALTER TABLE jobs ENABLE ROW LEVEL SECURITY;
+
+DO $$ BEGIN
+  DROP POLICY IF EXISTS "Users can view own jobs, admins view all" ON jobs;
+  CREATE POLICY "Users can view own jobs, admins view all"
+    ON jobs FOR SELECT
+    USING (
+      user_id = current_setting('app.current_user_id', true)::text
+      OR current_setting('app.current_user_role', true) = 'SUPER_ADMIN'
+    );
+EXCEPTION
+  WHEN undefined_object THEN NULL;
+END $$;
@@ -0,0 +1,36 @@
+/*
+  # AI Response Cache
+
+  Persistent tier of the Gemini response cache. Entries are content-addressed:
+  the key is a hash of the function, its prompt inputs and the model, so a
+  changed request simply misses and the stale entry ages out.
+
+  ## New Tables
+
+  ### `ai_response_cache`
+  - `key` (text, primary key): sha256 of (function, inputs, model)
+  - `function` (text): Cached function, e.g. `rationalization_suggestions`
+  - `tag` (text, nullable): Invalidation tag, e.g. `request:<id>`
+  - `response` (jsonb): Model output
+  - `created_at` (timestamptz)
+  - `expires_at` (timestamptz): Entry is ignored and purged after this time
+
+  ## Indexes
+  - `idx_ai_response_cache_tag` on (tag): invalidation on request update
+  - `idx_ai_response_cache_expires` on (expires_at): expiry purge
+
+  ## Security
+  - Internal table, only read and written by the API
+*/
+
+CREATE TABLE IF NOT EXISTS ai_response_cache (
+  key TEXT PRIMARY KEY,
+  function TEXT NOT NULL,
+  tag TEXT,
+  response JSONB NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_ai_response_cache_tag ON ai_response_cache(tag) WHERE tag IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ai_response_cache_expires ON ai_response_cache(expires_at);
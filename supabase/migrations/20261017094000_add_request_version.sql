@@ -0,0 +1,23 @@
+/*
+  # Optimistic Concurrency for Budget Requests
+
+  Approval transitions are applied as one conditional UPDATE that only matches
+  a PENDING request at the expected stage (and, when the client sends one, the
+  expected version). A concurrent decision therefore changes zero rows and is
+  reported as a conflict instead of writing a second approval record.
+
+  ## Changes
+
+  1. Add `version` column to `budget_requests`
+     - `version` (integer, not null, default 1): Incremented on every update, submit and approval transition
+*/
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'budget_requests' AND column_name = 'version'
+  ) THEN
+    ALTER TABLE budget_requests ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
+  END IF;
+END $$;
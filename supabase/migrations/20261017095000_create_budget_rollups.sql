@@ -0,0 +1,124 @@
+/*
+  # Department Budget Rollups
+
+  Request counts and amounts pre-aggregated by department, category, type,
+  status and month, so finance reports and the admin dashboard read one row
+  per group instead of scanning `budget_requests`.
+
+  ## New Tables
+
+  ### `budget_rollups`
+  - `department_id` (text): Department of the requests
+  - `category` (text): Budget category
+  - `type` (text): CAPEX or OPEX
+  - `status` (text): Request status ('UNKNOWN' when NULL)
+  - `month` (date): First day of the month the requests were created (UTC)
+  - `request_count` (integer): Number of requests in the group
+  - `total_amount` (numeric): Sum of their amounts
+  - `updated_at` (timestamptz): Last change to the group
+  - Primary key (department_id, category, type, status, month)
+
+  ## Changes
+
+  1. `budget_rollups_merge(added, removed)` adds one request per row of `added`
+     and subtracts one per row of `removed`, grouped and in key order
+  2. Statement-level AFTER INSERT / UPDATE / DELETE triggers on `budget_requests`
+     pass their transition tables to `budget_rollups_merge`, so every write
+     (single, bulk or batch) updates the rollups in its own transaction.
+     Updates that change no rolled-up column net out to nothing.
+  3. Backfill from the existing requests
+
+  ## Notes
+  - Groups whose count drops to zero are kept (readers skip them); the
+    `flask rollups rebuild` command recomputes the table from scratch and
+    removes them
+  - Internal table, read by the API only
+*/
+
+CREATE TABLE IF NOT EXISTS budget_rollups (
+  department_id TEXT NOT NULL,
+  category TEXT NOT NULL,
+  type TEXT NOT NULL,
+  status TEXT NOT NULL,
+  month DATE NOT NULL,
+  request_count INTEGER NOT NULL DEFAULT 0,
+  total_amount NUMERIC NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (department_id, category, type, status, month)
+);
+
+CREATE INDEX IF NOT EXISTS idx_budget_rollups_month ON budget_rollups(month);
+
+CREATE OR REPLACE FUNCTION budget_rollups_merge(added budget_requests[], removed budget_requests[])
+RETURNS void
+LANGUAGE sql
+AS $$
+  INSERT INTO budget_rollups AS r (department_id, category, type, status, month, request_count, total_amount, updated_at)
+  SELECT department_id, category, type, status, month, SUM(delta_count), SUM(delta_amount), now()
+  FROM (
+    SELECT a.department_id, a.category, a.type, COALESCE(a.status, 'UNKNOWN') AS status,
+           date_trunc('month', COALESCE(a.created_at, now()) AT TIME ZONE 'UTC')::date AS month,
+           1 AS delta_count, a.amount AS delta_amount
+    FROM unnest(added) a
+    UNION ALL
+    SELECT o.department_id, o.category, o.type, COALESCE(o.status, 'UNKNOWN'),
+           date_trunc('month', COALESCE(o.created_at, now()) AT TIME ZONE 'UTC')::date,
+           -1, -o.amount
+    FROM unnest(removed) o
+  ) delta
+  GROUP BY department_id, category, type, status, month
+  HAVING SUM(delta_count) <> 0 OR SUM(delta_amount) <> 0
+  -- Key order keeps concurrent writers from locking groups in opposite orders.
+  ORDER BY department_id, category, type, status, month
+  ON CONFLICT (department_id, category, type, status, month) DO UPDATE
+  SET request_count = r.request_count + EXCLUDED.request_count,
+      total_amount = r.total_amount + EXCLUDED.total_amount,
+      updated_at = EXCLUDED.updated_at;
+$$;
+
+CREATE OR REPLACE FUNCTION budget_rollups_after_write()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM budget_rollups_merge(ARRAY(SELECT ROW(n.*)::budget_requests FROM new_rows n), '{}');
+  ELSIF TG_OP = 'UPDATE' THEN
+    PERFORM budget_rollups_merge(ARRAY(SELECT ROW(n.*)::budget_requests FROM new_rows n),
+                                 ARRAY(SELECT ROW(o.*)::budget_requests FROM old_rows o));
+  ELSE
+    PERFORM budget_rollups_merge('{}', ARRAY(SELECT ROW(o.*)::budget_requests FROM old_rows o));
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS budget_rollups_insert ON budget_requests;
+CREATE TRIGGER budget_rollups_insert
+  AFTER INSERT ON budget_requests
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION budget_rollups_after_write();
+
+DROP TRIGGER IF EXISTS budget_rollups_update ON budget_requests;
+CREATE TRIGGER budget_rollups_update
+  AFTER UPDATE ON budget_requests
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION budget_rollups_after_write();
+
+DROP TRIGGER IF EXISTS budget_rollups_delete ON budget_requests;
+CREATE TRIGGER budget_rollups_delete
+  AFTER DELETE ON budget_requests
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION budget_rollups_after_write();
+
+-- Backfill with writers blocked so no delta is applied twice or missed.
+LOCK TABLE budget_requests IN SHARE MODE;
+
+DELETE FROM budget_rollups;
+
+INSERT INTO budget_rollups (department_id, category, type, status, month, request_count, total_amount, updated_at)
+SELECT department_id, category, type, COALESCE(status, 'UNKNOWN'),
+       date_trunc('month', COALESCE(created_at, now()) AT TIME ZONE 'UTC')::date,
+       COUNT(*), SUM(amount), now()
+FROM budget_requests
+GROUP BY 1, 2, 3, 4, 5;
@@ -0,0 +1,137 @@
+/*
+  # Partition Audit Logs by Month
+
+  `audit_logs` becomes a table range-partitioned on `timestamp`, one
+  partition per calendar month (UTC), so recent-log queries only touch the
+  newest partitions and old months can be archived and dropped as a whole.
+
+  ## Changes
+
+  1. `audit_logs` is recreated as a partitioned table with the same columns;
+     `timestamp` is now NOT NULL and the primary key is (`id`, `timestamp`),
+     as Postgres requires the partition key in unique constraints
+  2. `audit_logs_pYYYYMM` partitions for every month with existing rows
+     through three months ahead, plus `audit_logs_default` for rows outside
+     them; existing rows are copied over and the old table is dropped
+  3. `audit_logs_create_partition(month)` creates one month's partition,
+     moving any rows already routed to the default partition into it
+  4. `audit_logs_ensure_partitions(months_ahead, since)` creates every missing
+     partition from the oldest row in the default partition (or `since`, or
+     the current month) through `months_ahead` months ahead, and returns the
+     names it created
+
+  ## Indexes
+  - `idx_audit_logs_user_timestamp` on (user_id, timestamp DESC): per-user log
+  - `idx_audit_logs_action_timestamp` on (action, timestamp DESC): logs by action
+  - `idx_audit_logs_timestamp` on (timestamp): full log and exports
+  - The old single-column `idx_audit_logs_user` is replaced by the first
+
+  ## Notes
+  - The API runs `audit_logs_ensure_partitions` when the server starts and
+    `flask audit-logs maintain` runs it together with the retention policy
+  - The existing rows are rewritten once; run during a quiet period
+  - RLS policies are recreated unchanged on the new table
+*/
+
+ALTER TABLE audit_logs RENAME TO audit_logs_legacy;
+
+CREATE TABLE audit_logs (
+  id TEXT NOT NULL,
+  user_id TEXT NOT NULL REFERENCES users(id),
+  action TEXT NOT NULL,
+  metadata JSONB,
+  timestamp TIMESTAMPTZ NOT NULL DEFAULT now()
+) PARTITION BY RANGE (timestamp);
+
+CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;
+
+CREATE OR REPLACE FUNCTION audit_logs_create_partition(month_start date)
+RETURNS text
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  partition_name text := format('audit_logs_p%s', to_char(month_start, 'YYYYMM'));
+  range_start timestamptz := date_trunc('month', month_start::timestamp) AT TIME ZONE 'UTC';
+  range_end timestamptz := (date_trunc('month', month_start::timestamp) + interval '1 month') AT TIME ZONE 'UTC';
+BEGIN
+  IF to_regclass(partition_name) IS NOT NULL THEN
+    RETURN NULL;
+  END IF;
+
+  EXECUTE format('CREATE TABLE %I (LIKE audit_logs INCLUDING DEFAULTS)', partition_name);
+  -- Rows written before the partition existed were routed to the default
+  -- partition; attaching fails while it still holds rows of this range.
+  EXECUTE format(
+    'WITH moved AS (DELETE FROM audit_logs_default WHERE timestamp >= %L AND timestamp < %L RETURNING *)
+     INSERT INTO %I SELECT * FROM moved',
+    range_start, range_end, partition_name);
+  EXECUTE format('ALTER TABLE audit_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                 partition_name, range_start, range_end);
+  RETURN partition_name;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION audit_logs_ensure_partitions(months_ahead integer DEFAULT 3, since timestamptz DEFAULT NULL)
+RETURNS SETOF text
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  current_month date := date_trunc('month', now() AT TIME ZONE 'UTC')::date;
+  month_start date;
+  created text;
+BEGIN
+  -- Serialize concurrent callers (several API instances starting at once).
+  PERFORM pg_advisory_xact_lock(hashtext('audit_logs_ensure_partitions'));
+
+  SELECT LEAST(current_month,
+               date_trunc('month', since AT TIME ZONE 'UTC')::date,
+               date_trunc('month', MIN(timestamp) AT TIME ZONE 'UTC')::date)
+  INTO month_start
+  FROM audit_logs_default;
+
+  WHILE month_start <= current_month + make_interval(months => months_ahead) LOOP
+    created := audit_logs_create_partition(month_start);
+    IF created IS NOT NULL THEN
+      RETURN NEXT created;
+    END IF;
+    month_start := (month_start + interval '1 month')::date;
+  END LOOP;
+END;
+$$;
+
+SELECT audit_logs_ensure_partitions(3, (SELECT MIN(timestamp) FROM audit_logs_legacy));
+
+INSERT INTO audit_logs (id, user_id, action, metadata, timestamp)
+SELECT id, user_id, action, metadata, COALESCE(timestamp, now())
+FROM audit_logs_legacy;
+
+DROP TABLE audit_logs_legacy;
+
+ALTER TABLE audit_logs ADD PRIMARY KEY (id, timestamp);
+
+CREATE INDEX IF NOT EXISTS idx_audit_logs_user_timestamp ON audit_logs(user_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_action_timestamp ON audit_logs(action, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_timestamp ON audit_logs(timestamp);
+
+ALTER TABLE audit_logs ENABLE ROW LEVEL SECURITY;
+
+DO $$ BEGIN
+  DROP POLICY IF EXISTS "Users can view own audit logs, admins view all" ON audit_logs;
+  CREATE POLICY "Users can view own audit logs, admins view all"
+    ON audit_logs FOR SELECT
+    USING (
+      user_id = current_setting('app.current_user_id', true)::text
+      OR current_setting('app.current_user_role', true) = 'SUPER_ADMIN'
+    );
+EXCEPTION
+  WHEN undefined_object THEN NULL;
+END $$;
+
+DO $$ BEGIN
+  DROP POLICY IF EXISTS "System can insert audit logs" ON audit_logs;
+  CREATE POLICY "System can insert audit logs"
+    ON audit_logs FOR INSERT
+    WITH CHECK (true);
+EXCEPTION
+  WHEN undefined_object THEN NULL;
+END $$;
@@ -0,0 +1,33 @@
+/*
+  # Audit Log Query Indexes
+
+  Supports the filterable, cursor-paginated audit log API: filters on user,
+  action, time range and metadata keys, paged on (`timestamp`, `id`).
+
+  ## Changes
+
+  1. `audit_logs.metadata` is converted to JSONB if an older deployment
+     still stores it as text or json (no-op otherwise)
+  2. `idx_audit_logs_metadata`: GIN (jsonb_path_ops) on `metadata`, for
+     containment filters such as `metadata @> '{"request_id": "req-001"}'`,
+     so one request's history is an index lookup
+  3. `idx_audit_logs_timestamp` on (timestamp) is replaced by
+     `idx_audit_logs_timestamp_id` on (timestamp, id), matching the page
+     order and the `(timestamp, id) < (...)` cursor condition
+
+  ## Notes
+  - Indexes on the partitioned `audit_logs` are created on every partition,
+    including ones created later
+*/
+
+DO $$ BEGIN
+  IF (SELECT data_type FROM information_schema.columns
+      WHERE table_schema = current_schema() AND table_name = 'audit_logs' AND column_name = 'metadata') <> 'jsonb' THEN
+    ALTER TABLE audit_logs ALTER COLUMN metadata TYPE JSONB USING metadata::jsonb;
+  END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_audit_logs_metadata ON audit_logs USING GIN (metadata jsonb_path_ops);
+
+CREATE INDEX IF NOT EXISTS idx_audit_logs_timestamp_id ON audit_logs(timestamp, id);
+DROP INDEX IF EXISTS idx_audit_logs_timestamp;
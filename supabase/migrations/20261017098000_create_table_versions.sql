@@ -0,0 +1,78 @@
+/*
+  # Table Version Counters
+
+  A version number per table, bumped in the same transaction as every write,
+  from which the API derives ETags for conditional GETs without running the
+  endpoint's query.
+
+  ## New Tables
+
+  ### `table_versions`
+  - `table_name` (text, primary key): Table the counter belongs to
+  - `version` (bigint): Incremented on every write statement to that table
+  - `updated_at` (timestamptz): Time of the last bump
+
+  ## Changes
+
+  1. `bump_table_version()` trigger function
+  2. Statement-level INSERT / UPDATE / DELETE / TRUNCATE triggers on
+     `budget_requests`, `approval_records` and `departments`
+  3. On `users`, INSERT / DELETE / TRUNCATE plus a row-level UPDATE trigger
+     that fires only when `name` or `email` change: logins update the row
+     (failed attempts) but not what the cached endpoints show
+
+  ## Notes
+  - The counter row is updated inside the writing transaction, so a version
+    is never visible before the data it stands for
+  - Internal table, read by the API only
+*/
+
+CREATE TABLE IF NOT EXISTS table_versions (
+  table_name TEXT PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION bump_table_version()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  INSERT INTO table_versions AS v (table_name, version, updated_at)
+  VALUES (TG_TABLE_NAME, 1, now())
+  ON CONFLICT (table_name) DO UPDATE
+  SET version = v.version + 1, updated_at = EXCLUDED.updated_at;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS budget_requests_bump_version ON budget_requests;
+CREATE TRIGGER budget_requests_bump_version
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON budget_requests
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS approval_records_bump_version ON approval_records;
+CREATE TRIGGER approval_records_bump_version
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON approval_records
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS departments_bump_version ON departments;
+CREATE TRIGGER departments_bump_version
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON departments
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS users_bump_version ON users;
+CREATE TRIGGER users_bump_version
+  AFTER INSERT OR DELETE OR TRUNCATE ON users
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS users_bump_version_on_update ON users;
+CREATE TRIGGER users_bump_version_on_update
+  AFTER UPDATE OF name, email ON users
+  FOR EACH ROW
+  WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.email IS DISTINCT FROM NEW.email)
+  EXECUTE FUNCTION bump_table_version();
+
+INSERT INTO table_versions (table_name, version)
+VALUES ('budget_requests', 1), ('approval_records', 1), ('departments', 1), ('users', 1)
+ON CONFLICT (table_name) DO NOTHING;
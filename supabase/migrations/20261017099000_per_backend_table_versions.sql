@@ -0,0 +1,80 @@
+/*
+  # Per-Backend Table Version Counters
+
+  `table_versions` held one row per table, so every write to
+  `budget_requests` or `approval_records` updated the same row and held its
+  lock until commit: writers to a table were serialized, and transactions
+  bumping two tables in opposite orders (a batch approval versus a single
+  one) could deadlock.
+
+  A table's version is now the sum of one counter per database backend. A
+  backend runs one transaction at a time, so no two open transactions ever
+  update the same counter row: writers never wait on each other here and
+  there is no lock order to get wrong. The counters stay transactional, so a
+  version is still never visible before the data it stands for.
+
+  ## Changes
+
+  1. `table_versions.backend_pid` (integer): backend that owns the counter;
+     0 is the folded base row. Primary key is now (`table_name`, `backend_pid`)
+  2. `bump_table_version()` increments the calling backend's counter
+  3. `compact_table_versions()` folds the per-backend counters into the base
+     rows without changing any table's total; returns the rows folded
+
+  ## Notes
+  - Existing counters become the base rows
+  - Counters of backends in the middle of a write are skipped by compaction
+    and folded the next time
+*/
+
+ALTER TABLE table_versions ADD COLUMN IF NOT EXISTS backend_pid INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE table_versions DROP CONSTRAINT IF EXISTS table_versions_pkey;
+ALTER TABLE table_versions ADD CONSTRAINT table_versions_pkey PRIMARY KEY (table_name, backend_pid);
+
+CREATE OR REPLACE FUNCTION bump_table_version()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  INSERT INTO table_versions AS v (table_name, backend_pid, version, updated_at)
+  VALUES (TG_TABLE_NAME, pg_backend_pid(), 1, now())
+  ON CONFLICT (table_name, backend_pid) DO UPDATE
+  SET version = v.version + 1, updated_at = EXCLUDED.updated_at;
+  RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION compact_table_versions()
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  folded integer;
+BEGIN
+  -- Only compaction writes the base rows; one run at a time.
+  PERFORM pg_advisory_xact_lock(hashtext('compact_table_versions'));
+
+  WITH claimed AS (
+    SELECT table_name, backend_pid FROM table_versions
+    WHERE backend_pid <> 0
+    FOR UPDATE SKIP LOCKED
+  ), removed AS (
+    DELETE FROM table_versions v
+    USING claimed c
+    WHERE v.table_name = c.table_name AND v.backend_pid = c.backend_pid
+    RETURNING v.table_name, v.version, v.updated_at
+  ), totals AS (
+    SELECT table_name, SUM(version)::bigint AS version, MAX(updated_at) AS updated_at, COUNT(*) AS counters
+    FROM removed
+    GROUP BY table_name
+  ), merged AS (
+    INSERT INTO table_versions AS v (table_name, backend_pid, version, updated_at)
+    SELECT table_name, 0, version, updated_at FROM totals
+    ON CONFLICT (table_name, backend_pid) DO UPDATE
+    SET version = v.version + EXCLUDED.version, updated_at = GREATEST(v.updated_at, EXCLUDED.updated_at)
+  )
+  SELECT COALESCE(SUM(counters), 0) INTO folded FROM totals;
+
+  RETURN folded;
+END;
+$$;